@@ -0,0 +1,91 @@
+"""Benchmark recall@k and latency of the IVF-flat index against exact search.
+
+Vectors are drawn from a mixture of random clusters (real skill embeddings
+are clustered by domain), L2-normalized like the engine's embeddings matrix.
+Queries are perturbed corpus vectors. Exact search is the single
+matrix-vector product plus top-k used by ``SkillSearchEngine.search``.
+
+Usage::
+
+    uv run python benchmarks/bench_ann.py
+    uv run python benchmarks/bench_ann.py --sizes 50000 --n-probe 4 8 16 32
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from claude_skills_mcp_backend.ann_index import IVFFlatIndex
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+
+def _clustered_vectors(
+    rng: np.random.Generator, n: int, dim: int, n_clusters: int
+) -> np.ndarray:
+    """Sample normalized vectors around random cluster centers."""
+    centers = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, n)
+    vectors = centers[labels] + 1.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    return SkillSearchEngine._normalize_rows(vectors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'skills':>8}  {'method':>12}  {'recall@k':>9}  "
+        f"{'ms/query':>9}  {'candidates':>10}"
+    )
+    for n in args.sizes:
+        embeddings = _clustered_vectors(rng, n, args.dim, n_clusters=max(8, n // 200))
+        picks = rng.integers(0, n, args.queries)
+        queries = SkillSearchEngine._normalize_rows(
+            embeddings[picks]
+            + 0.08 * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+        )
+
+        start = time.perf_counter()
+        exact = [
+            set(SkillSearchEngine._top_k_indices(embeddings @ q, args.k).tolist())
+            for q in queries
+        ]
+        exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"{n:>8}  {'exact':>12}  {1.0:>9.3f}  {exact_ms:>9.3f}  {n:>10}")
+
+        index = IVFFlatIndex(min_train_size=0)
+        start = time.perf_counter()
+        index.extend(embeddings)
+        build_s = time.perf_counter() - start
+
+        for n_probe in args.n_probe:
+            index.n_probe = n_probe
+            hits = 0
+            num_candidates = 0
+            start = time.perf_counter()
+            for q, truth in zip(queries, exact):
+                candidates = index.search(q, n)
+                scores = embeddings[candidates] @ q
+                top = candidates[SkillSearchEngine._top_k_indices(scores, args.k)]
+                hits += len(truth.intersection(top.tolist()))
+                num_candidates += len(candidates)
+            ivf_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+            print(
+                f"{n:>8}  {f'ivf p={n_probe}':>12}  "
+                f"{hits / (args.k * len(queries)):>9.3f}  {ivf_ms:>9.3f}  "
+                f"{num_candidates // len(queries):>10}"
+            )
+        print(f"{'':>8}  (IVF build: {build_s:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
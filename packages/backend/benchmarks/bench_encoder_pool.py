@@ -0,0 +1,78 @@
+"""Benchmark encoding throughput against the number of encoder worker processes.
+
+For each worker count (0 = in-process encoder), measures bulk indexing
+throughput (one large encode call, split across the workers) and query
+throughput with many concurrent single-query callers. Worker start-up time
+(model load in every replica) is reported separately. Throughput should
+scale with the number of workers up to the number of physical cores.
+
+Usage::
+
+    uv run python benchmarks/bench_encoder_pool.py
+    uv run python benchmarks/bench_encoder_pool.py --backend onnx-int8 --workers 0 2 4 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from claude_skills_mcp_backend.encoder_pool import EncoderPool
+from claude_skills_mcp_backend.encoders import create_encoder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    words = (
+        "analyze single cell rna sequencing protein structure docking drug "
+        "discovery plots statistics genome variant chemistry literature"
+    ).split()
+    texts = [
+        " ".join(rng.choice(words, size=rng.integers(8, 40))) for _ in range(args.texts)
+    ]
+    queries = [
+        " ".join(rng.choice(words, size=rng.integers(4, 12)))
+        for _ in range(args.queries)
+    ]
+
+    print(f"{os.cpu_count()} CPUs, backend {args.backend}")
+    print(f"{'workers':>7}  {'start s':>8}  {'index texts/s':>13}  {'queries/s':>9}")
+    for num_workers in args.workers:
+        start = time.perf_counter()
+        if num_workers == 0:
+            encoder = create_encoder(args.backend, args.model)
+        else:
+            encoder = EncoderPool(args.backend, args.model, num_workers)
+        start_s = time.perf_counter() - start
+
+        encoder.encode(texts[:32])  # warm-up
+        start = time.perf_counter()
+        encoder.encode(texts)
+        index_rate = len(texts) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as clients:
+            list(clients.map(lambda q: encoder.encode([q]), queries))
+        query_rate = len(queries) / (time.perf_counter() - start)
+
+        print(
+            f"{num_workers:>7}  {start_s:>8.2f}  "
+            f"{index_rate:>13.0f}  {query_rate:>9.0f}"
+        )
+        if isinstance(encoder, EncoderPool):
+            encoder.close()
+
+
+if __name__ == "__main__":
+    main()
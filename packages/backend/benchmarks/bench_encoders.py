@@ -0,0 +1,118 @@
+"""Benchmark load time, latency, throughput and memory per encoder backend.
+
+Each backend runs in a fresh subprocess so that its import cost and peak
+resident memory are measured in isolation. Reports the time to import and
+load the model, the median latency of encoding one short query, the
+throughput of bulk-encoding skill-description-like texts, and the peak RSS
+of the process. The "torch" and "onnx*" backends download the model on
+first use.
+
+Usage::
+
+    uv run python benchmarks/bench_encoders.py
+    uv run python benchmarks/bench_encoders.py --backends torch onnx-int8 --texts 2000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+WORDS = (
+    "analyze single cell rna sequencing data protein structure prediction "
+    "molecular docking drug discovery pipeline visualization plots statistics "
+    "genome assembly variant calling chemistry reaction literature review"
+).split()
+
+
+def _texts(count: int, rng: np.random.Generator) -> list[str]:
+    """Generate random description-length texts."""
+    return [" ".join(rng.choice(WORDS, size=rng.integers(8, 40))) for _ in range(count)]
+
+
+def _run_backend(backend: str, model_name: str, num_texts: int, queries: int) -> dict:
+    """Measure one backend in the current process."""
+    rng = np.random.default_rng(0)
+    texts = _texts(num_texts, rng)
+
+    start = time.perf_counter()
+    from claude_skills_mcp_backend.encoders import create_encoder
+
+    encoder = create_encoder(backend, model_name)
+    load_s = time.perf_counter() - start
+
+    encoder.encode(texts[:8])  # warm-up
+    latencies = []
+    for query in _texts(queries, rng):
+        start = time.perf_counter()
+        encoder.encode([query])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    encoder.encode(texts)
+    bulk_s = time.perf_counter() - start
+
+    return {
+        "load_s": load_s,
+        "query_ms": 1000 * float(np.median(latencies)),
+        "texts_per_s": num_texts / bulk_s,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backends", nargs="+", default=["torch", "onnx", "onnx-int8", "hashing"]
+    )
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--texts", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = _run_backend(args.worker, args.model, args.texts, args.queries)
+        print(json.dumps(result))
+        return
+
+    print(
+        f"{'backend':>10}  {'load s':>7}  {'ms/query':>9}  "
+        f"{'texts/s':>9}  {'peak RSS MB':>11}"
+    )
+    for backend in args.backends:
+        proc = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--worker",
+                backend,
+                "--model",
+                args.model,
+                "--texts",
+                str(args.texts),
+                "--queries",
+                str(args.queries),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1:] or ["failed"]
+            print(f"{backend:>10}  {error[0]}")
+            continue
+
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(
+            f"{backend:>10}  {result['load_s']:>7.2f}  {result['query_ms']:>9.2f}  "
+            f"{result['texts_per_s']:>9.0f}  {result['peak_rss_mb']:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
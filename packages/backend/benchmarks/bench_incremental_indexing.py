@@ -0,0 +1,79 @@
+"""Benchmark incremental index growth: per-batch concatenation vs growable buffers.
+
+Simulates ``load_skills_in_batches`` feeding ``SkillSearchEngine.add_skills``
+with small batches. The legacy path copies the whole embeddings matrix and
+skill list on every batch (quadratic in the number of skills); the growable
+path appends into capacity-doubling buffers (linear). Random vectors stand in
+for real embeddings, so no model download is needed.
+
+Usage::
+
+    uv run python benchmarks/bench_incremental_indexing.py
+    uv run python benchmarks/bench_incremental_indexing.py --sizes 10000 50000 --batch-size 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from claude_skills_mcp_backend.growable import GrowableArray, SkillTable
+
+
+def _legacy(batches: list[np.ndarray], names: list[list[str]]) -> float:
+    """Time appending with np.concatenate and list concatenation."""
+    start = time.perf_counter()
+    embeddings = None
+    skills: list[str] = []
+    for batch, batch_names in zip(batches, names):
+        if embeddings is None:
+            embeddings = batch
+        else:
+            embeddings = np.concatenate([embeddings, batch])
+        skills = skills + batch_names
+    return time.perf_counter() - start
+
+
+def _growable(batches: list[np.ndarray], names: list[list[str]]) -> float:
+    """Time appending into a GrowableArray and SkillTable."""
+    start = time.perf_counter()
+    embeddings = GrowableArray(batches[0].shape[1:])
+    skills = SkillTable()
+    for batch, batch_names in zip(batches, names):
+        embeddings.append(batch)
+        skills.append(batch_names)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[2500, 5000, 10000, 20000]
+    )
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(f"{'skills':>8}  {'concatenate s':>14}  {'growable s':>11}  {'speedup':>8}")
+    for n in args.sizes:
+        batches = [
+            rng.standard_normal((args.batch_size, args.dim)).astype(np.float32)
+            for _ in range(n // args.batch_size)
+        ]
+        names = [
+            [f"skill-{b}-{i}" for i in range(args.batch_size)]
+            for b in range(len(batches))
+        ]
+
+        legacy_s = _legacy(batches, names)
+        growable_s = _growable(batches, names)
+        print(
+            f"{n:>8}  {legacy_s:>14.3f}  {growable_s:>11.3f}  "
+            f"{legacy_s / growable_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark cold start from an index bundle against re-indexing from scratch.
+
+Indexes synthetic skills, saves them with ``SkillSearchEngine.save_bundle``
+and compares restoring a fresh engine with ``load_bundle`` against
+``index_skills``. The deterministic hashing encoder stands in for the model,
+so no download is needed and the re-indexing times are a lower bound: a
+real model encodes orders of magnitude slower, while loading a bundle never
+encodes anything.
+
+Usage::
+
+    uv run python benchmarks/bench_index_bundle.py
+    uv run python benchmarks/bench_index_bundle.py --sizes 10000 50000 --storage int8
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+from claude_skills_mcp_backend.skill_loader import Skill
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--storage", default="float32")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    words = (
+        "analyze single cell rna sequencing protein structure docking drug "
+        "discovery plots statistics genome variant chemistry literature"
+    ).split()
+
+    def engine() -> SkillSearchEngine:
+        return SkillSearchEngine(
+            "all-MiniLM-L6-v2",
+            encoder_backend="hashing",
+            embedding_storage=args.storage,
+            deduplicate=False,
+        )
+
+    print(
+        f"{'skills':>8}  {'index s':>8}  {'save s':>7}  {'load s':>7}  {'bundle MB':>9}"
+    )
+    for n in args.sizes:
+        skills = [
+            Skill(
+                name=f"skill-{i}",
+                description=" ".join(rng.choice(words, size=12)),
+                content=" ".join(rng.choice(words, size=200)),
+                source=f"bench://skill-{i}",
+            )
+            for i in range(n)
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "index.bundle"
+            source = engine()
+            source.warm_up().join()
+            start = time.perf_counter()
+            source.index_skills(skills)
+            index_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            source.save_bundle(path)
+            save_s = time.perf_counter() - start
+
+            restored = engine()
+            start = time.perf_counter()
+            restored.load_bundle(path)
+            load_s = time.perf_counter() - start
+
+            size_mb = path.stat().st_size / (1024 * 1024)
+            print(
+                f"{n:>8}  {index_s:>8.2f}  {save_s:>7.2f}  {load_s:>7.3f}  "
+                f"{size_mb:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
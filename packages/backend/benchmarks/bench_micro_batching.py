@@ -0,0 +1,85 @@
+"""Benchmark query encoding under concurrency with and without micro-batching.
+
+Runs a fixed number of single-query encodes from a pool of client threads,
+either calling the encoder directly (one model call per query) or through
+``MicroBatcher``, and reports throughput and p50/p99 latency per
+concurrency level. Use a real backend ("torch", "onnx-int8") to see the
+effect of batching on model throughput; "hashing" has no per-call overhead
+to amortize.
+
+Usage::
+
+    uv run python benchmarks/bench_micro_batching.py
+    uv run python benchmarks/bench_micro_batching.py --backend onnx-int8 --wait-ms 1 2 5
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from claude_skills_mcp_backend.encoders import create_encoder
+from claude_skills_mcp_backend.micro_batching import MicroBatcher
+
+
+def _run(encode, queries: list[str], concurrency: int) -> tuple[float, np.ndarray]:
+    """Encode each query from ``concurrency`` threads.
+
+    Returns the wall time and per-query latencies.
+    """
+
+    def one(query: str) -> float:
+        start = time.perf_counter()
+        encode([query])
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.array(list(pool.map(one, queries)))
+    return time.perf_counter() - start, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--wait-ms", type=float, nargs="+", default=[2.0])
+    args = parser.parse_args()
+
+    encoder = create_encoder(args.backend, args.model)
+    rng = np.random.default_rng(0)
+    words = "analyze rna protein docking plots genome variant chemistry".split()
+    queries = [
+        " ".join(rng.choice(words, size=rng.integers(4, 12)))
+        for _ in range(args.requests)
+    ]
+    encoder.encode(queries[:8])  # warm-up
+
+    print(
+        f"{'clients':>7}  {'mode':>14}  {'queries/s':>9}  {'p50 ms':>8}  "
+        f"{'p99 ms':>8}  {'batch':>6}"
+    )
+    for concurrency in args.concurrency:
+        modes = [("direct", encoder.encode, None)]
+        for wait_ms in args.wait_ms:
+            batcher = MicroBatcher(
+                encoder.encode, max_batch_size=args.batch_size, max_wait_ms=wait_ms
+            )
+            modes.append((f"batched {wait_ms:g}ms", batcher.encode, batcher))
+
+        for name, encode, batcher in modes:
+            elapsed, latencies = _run(encode, queries, concurrency)
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            batch = batcher.get_stats()["mean_batch_size"] if batcher else 1
+            print(
+                f"{concurrency:>7}  {name:>14}  {len(queries) / elapsed:>9.0f}  "
+                f"{p50:>8.2f}  {p99:>8.2f}  {batch:>6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
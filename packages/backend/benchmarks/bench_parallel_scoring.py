@@ -0,0 +1,72 @@
+"""Benchmark partitioned parallel scoring against a serial scan.
+
+Scores one query against a matrix of random normalized vectors with the
+engine's ``_scan`` and selects the top results with ``_select_top_k``, once
+with ``search_threads=1`` and once per requested thread count. Partitions
+hold at least ``_MIN_PARTITION_ROWS`` rows, so smaller indexes stay serial.
+Speedups need as many free cores as threads.
+
+Usage::
+
+    uv run python benchmarks/bench_parallel_scoring.py
+    uv run python benchmarks/bench_parallel_scoring.py --sizes 100000 --threads 2 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+
+def _median_ms(fn, repeats: int) -> float:
+    """Return the median latency of fn() in milliseconds."""
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 100000, 400000])
+    parser.add_argument("--threads", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    engines = {
+        threads: SkillSearchEngine(
+            "all-MiniLM-L6-v2", encoder_backend="hashing", search_threads=threads
+        )
+        for threads in [1, *args.threads]
+    }
+
+    print(f"{'skills':>8}  " + "  ".join(f"{f'{t} thr ms':>9}" for t in engines))
+    for n in args.sizes:
+        matrix = SkillSearchEngine._normalize_rows(
+            rng.standard_normal((n, args.dim)).astype(np.float32)
+        )
+        query = SkillSearchEngine._normalize_rows(
+            rng.standard_normal((1, args.dim)).astype(np.float32)
+        )[0]
+
+        timings = []
+        for engine in engines.values():
+
+            def search(engine: SkillSearchEngine = engine) -> np.ndarray:
+                scores = engine._scan(matrix, None, query)
+                return engine._select_top_k(scores, args.top_k)
+
+            timings.append(_median_ms(search, args.repeats))
+        print(f"{n:>8}  " + "  ".join(f"{ms:>9.2f}" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
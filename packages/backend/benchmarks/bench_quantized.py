@@ -0,0 +1,76 @@
+"""Benchmark memory, latency and recall per embedding storage mode.
+
+For each ``embedding_storage`` mode, builds the engine's storage for a
+random normalized corpus and measures the in-memory size of the matrix that
+the first pass scans, the per-query scoring latency (scan plus full-precision
+rescoring of the shortlist), and recall@k against exact float32 scoring.
+
+Usage::
+
+    uv run python benchmarks/bench_quantized.py
+    uv run python benchmarks/bench_quantized.py --sizes 100000 --dim 768
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from claude_skills_mcp_backend.index_persistence import full_precision
+from claude_skills_mcp_backend.quantization import STORAGE_MODES
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--rescore-depth", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'skills':>8}  {'storage':>8}  {'scan MB':>8}  "
+        f"{'ms/query':>9}  {'recall@k':>9}"
+    )
+    for n in args.sizes:
+        embeddings = SkillSearchEngine._normalize_rows(
+            rng.standard_normal((n, args.dim))
+        )
+        queries = SkillSearchEngine._normalize_rows(
+            embeddings[rng.integers(0, n, args.queries)]
+            + 0.05 * rng.standard_normal((args.queries, args.dim))
+        )
+        exact = [
+            set(SkillSearchEngine._top_k_indices(embeddings @ q, args.k).tolist())
+            for q in queries
+        ]
+
+        for mode in STORAGE_MODES:
+            engine = SkillSearchEngine(
+                "unused", embedding_storage=mode, rescore_depth=args.rescore_depth
+            )
+            quantized = engine._quantize(embeddings)
+            full = full_precision(embeddings, mode)
+            scan_mb = (quantized.nbytes if quantized else full.nbytes) / (1024 * 1024)
+
+            engine._score_rows(full, quantized, queries[0])  # warm-up
+            hits = 0
+            start = time.perf_counter()
+            for q, truth in zip(queries, exact):
+                scores = engine._score_rows(full, quantized, q)
+                top = SkillSearchEngine._top_k_indices(scores, args.k)
+                hits += len(truth.intersection(top.tolist()))
+            ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+            print(
+                f"{n:>8}  {mode:>8}  {scan_mb:>8.1f}  {ms:>9.3f}  "
+                f"{hits / (args.k * len(queries)):>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
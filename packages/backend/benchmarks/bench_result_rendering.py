@@ -0,0 +1,92 @@
+"""Benchmark assembling find_helpful_skills responses from search hits.
+
+Compares copying each hit with ``Skill.to_dict`` and formatting its
+document listing on every call (the previous behaviour) with the
+``SkillResult`` views and the sections the engine renders when a skill is
+indexed. Only result construction and formatting are timed, not scoring or
+indexing.
+
+Usage::
+
+    uv run python benchmarks/bench_result_rendering.py
+    uv run python benchmarks/bench_result_rendering.py --documents 5 200 --top-k 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from claude_skills_mcp_backend.mcp_handlers import format_search_result
+from claude_skills_mcp_backend.search_results import (
+    SkillResult,
+    attach_skill_sections,
+)
+from claude_skills_mcp_backend.skill_loader import Skill
+
+
+def _median_us(fn, repeats: int) -> float:
+    """Return the median latency of fn() in microseconds."""
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return float(np.median(timings))
+
+
+def _make_skills(count: int, num_documents: int) -> list[Skill]:
+    return [
+        Skill(
+            name=f"Skill {i}",
+            description=f"Description of skill {i}",
+            content="Skill instructions. " * 400,
+            source=f"bench://skill/{i}",
+            documents={
+                f"scripts/helper_{j}.py": {"type": "text", "size": 1024 * j}
+                for j in range(num_documents)
+            },
+            tags=["bench"],
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, nargs="+", default=[0, 20, 200])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'documents':>9}  {'copy us':>9}  {'view us':>9}")
+    for num_documents in args.documents:
+        skills = _make_skills(args.top_k, num_documents)
+        # Done by the engine when the skills are indexed
+        attach_skill_sections(skills)
+
+        def copied() -> str:
+            parts = []
+            for i, skill in enumerate(skills, 1):
+                # Plain dictionaries are rendered on every call
+                result = {**skill.to_dict(), "relevance_score": 0.5}
+                parts.extend(format_search_result(i, result, True, 2000))
+            return "\n".join(parts)
+
+        def viewed() -> str:
+            parts = []
+            for i, skill in enumerate(skills, 1):
+                result = SkillResult(skill, row=i, version=1, relevance_score=0.5)
+                parts.extend(format_search_result(i, result, True, 2000))
+            return "\n".join(parts)
+
+        assert copied() == viewed()
+        print(
+            f"{num_documents:>9}  {_median_us(copied, args.repeats):>9.1f}  "
+            f"{_median_us(viewed, args.repeats):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
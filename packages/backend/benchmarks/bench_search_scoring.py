@@ -0,0 +1,80 @@
+"""Benchmark per-query scoring latency and allocation in SkillSearchEngine.
+
+Compares the legacy path (re-normalizing the whole embeddings matrix on every
+query, see ``_legacy_cosine_similarity``) against the pre-normalized float32 matrix
+used by ``search`` (one matrix-vector product). Random vectors stand in for
+real embeddings, so no model download is needed.
+
+Usage::
+
+    uv run python benchmarks/bench_search_scoring.py
+    uv run python benchmarks/bench_search_scoring.py --sizes 1000 10000 --dim 768
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+
+def _measure(fn, repeats: int) -> tuple[float, float]:
+    """Return (median latency in ms, peak traced allocation in MB) for fn()."""
+    fn()  # warm-up
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return float(np.median(timings)), peak / (1024 * 1024)
+
+
+def _legacy_cosine_similarity(vec: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Normalize both inputs and score, as search did before pre-normalizing."""
+    vec_norm = vec / np.linalg.norm(vec)
+    matrix_norm = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.dot(matrix_norm, vec_norm)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'skills':>8}  {'legacy ms':>10}  {'legacy MB':>10}  "
+        f"{'normalized ms':>14}  {'normalized MB':>14}"
+    )
+    for n in args.sizes:
+        raw = rng.standard_normal((n, args.dim)).astype(np.float32)
+        query = rng.standard_normal(args.dim).astype(np.float32)
+
+        normalized = SkillSearchEngine._normalize_rows(raw)
+        query_normalized = SkillSearchEngine._normalize_rows(query[None, :])[0]
+
+        legacy_ms, legacy_mb = _measure(
+            lambda: _legacy_cosine_similarity(query, raw), args.repeats
+        )
+        fast_ms, fast_mb = _measure(lambda: normalized @ query_normalized, args.repeats)
+
+        print(
+            f"{n:>8}  {legacy_ms:>10.3f}  {legacy_mb:>10.2f}  "
+            f"{fast_ms:>14.3f}  {fast_mb:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
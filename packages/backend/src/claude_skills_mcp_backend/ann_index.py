@@ -0,0 +1,274 @@
+"""Approximate nearest-neighbour indexes for large skill corpora."""
+
+import logging
+import math
+import threading
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ANN_BACKENDS = ("exact", "ivf")
+
+
+class IVFFlatIndex:
+    """Inverted-file (IVF-flat) index over normalized embeddings in pure NumPy.
+
+    Vectors are partitioned by spherical k-means into ``n_lists`` clusters.
+    A query only scores the vectors in its ``n_probe`` closest clusters,
+    exactly, against the engine's embeddings matrix, so the index itself
+    stores nothing but centroids and row ids.
+
+    Row ids are only ever appended, and every query is restricted to the
+    first ``num_vectors`` rows, so one index can be shared by several
+    immutable search snapshots while a writer keeps adding to it. Until
+    ``min_train_size`` vectors have been added the index is untrained and
+    ``search`` returns None (callers fall back to exact search).
+
+    Attributes
+    ----------
+    n_probe : int
+        Number of clusters scanned per query.
+    min_train_size : int
+        Number of vectors required before the index is trained.
+    num_vectors : int
+        Number of vectors added so far.
+    _state : tuple[np.ndarray, list[tuple[np.ndarray, int]], int] | None
+        Centroids, per-cluster (row ids, size) and the number of vectors the
+        centroids were trained on. Replaced as a whole, never mutated in a
+        way that breaks a concurrent reader.
+    _lock : threading.Lock
+        Serializes writers.
+    """
+
+    def __init__(self, n_probe: int = 16, min_train_size: int = 2048):
+        """Initialize an empty, untrained index.
+
+        Parameters
+        ----------
+        n_probe : int, optional
+            Number of clusters scanned per query, by default 16.
+        min_train_size : int, optional
+            Number of vectors required before training, by default 2048.
+        """
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.num_vectors = 0
+        self._state: tuple[np.ndarray, list[tuple[np.ndarray, int]], int] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the index has centroids and can answer queries."""
+        return self._state is not None
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Assign each vector to its most similar centroid, in bounded batches."""
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), 8192):
+            batch = vectors[start : start + 8192]
+            assignments[start : start + 8192] = np.argmax(batch @ centroids.T, axis=1)
+        return assignments
+
+    @classmethod
+    def _train(
+        cls, vectors: np.ndarray, n_lists: int, iterations: int = 10
+    ) -> np.ndarray:
+        """Run spherical k-means on (a sample of) the vectors.
+
+        Parameters
+        ----------
+        vectors : np.ndarray
+            Normalized vectors of shape (N, D).
+        n_lists : int
+            Number of clusters.
+        iterations : int, optional
+            Number of Lloyd iterations, by default 10.
+
+        Returns
+        -------
+        np.ndarray
+            Normalized float32 centroids of shape (n_lists, D).
+        """
+        rng = np.random.default_rng(0)
+        # 64 points per centroid are plenty to place it
+        sample_size = min(len(vectors), 64 * n_lists)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = cls._assign(sample, centroids)
+            order = np.argsort(assignments, kind="stable")
+            counts = np.bincount(assignments, minlength=n_lists)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            non_empty = counts > 0
+
+            sums = np.add.reduceat(sample[order], starts[non_empty], axis=0)
+            centroids[non_empty] = sums
+            # Re-seed empty clusters from random sample points
+            empty = np.flatnonzero(~non_empty)
+            if len(empty):
+                centroids[empty] = sample[rng.choice(sample_size, len(empty))]
+
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids /= np.maximum(norms, 1e-12)
+
+        return centroids.astype(np.float32, copy=False)
+
+    @staticmethod
+    def _append_ids(
+        lists: list[tuple[np.ndarray, int]], assignments: np.ndarray, first_id: int
+    ) -> None:
+        """Append consecutive row ids to their clusters' id lists (capacity doubling)."""
+        ids = np.arange(first_id, first_id + len(assignments), dtype=np.int32)
+        order = np.argsort(assignments, kind="stable")
+        clusters, starts = np.unique(assignments[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        for cluster, start, end in zip(clusters, starts, ends):
+            new_ids = ids[order[start:end]]
+            buffer, size = lists[cluster]
+            needed = size + len(new_ids)
+            if needed > len(buffer):
+                grown = np.empty(max(needed, 2 * len(buffer)), dtype=np.int32)
+                grown[:size] = buffer[:size]
+                buffer = grown
+            buffer[size:needed] = new_ids
+            lists[cluster] = (buffer, needed)
+
+    def extend(self, embeddings: np.ndarray, num_vectors: int | None = None) -> None:
+        """Index the rows of ``embeddings`` that are not indexed yet.
+
+        The index is (re)trained on all rows once ``min_train_size`` is
+        reached and again whenever the corpus has grown fourfold since the
+        last training, so that clusters stay balanced.
+
+        Parameters
+        ----------
+        embeddings : np.ndarray
+            Full normalized embeddings matrix; rows ``[num_vectors:]`` of a
+            previous call must be unchanged.
+        num_vectors : int | None, optional
+            Number of rows to index, by default all rows.
+        """
+        if num_vectors is None:
+            num_vectors = len(embeddings)
+
+        with self._lock:
+            if num_vectors <= self.num_vectors:
+                return
+
+            state = self._state
+            if num_vectors < self.min_train_size:
+                self.num_vectors = num_vectors
+                return
+
+            if state is None or num_vectors >= 4 * state[2]:
+                n_lists = max(1, min(4096, int(math.sqrt(num_vectors))))
+                logger.info(
+                    f"Training IVF index: {num_vectors} vectors, {n_lists} lists"
+                )
+                centroids = self._train(embeddings[:num_vectors], n_lists)
+                lists: list[tuple[np.ndarray, int]] = [
+                    (np.empty(0, dtype=np.int32), 0) for _ in range(n_lists)
+                ]
+                self._append_ids(
+                    lists, self._assign(embeddings[:num_vectors], centroids), 0
+                )
+                self._state = (centroids, lists, num_vectors)
+            else:
+                centroids, lists, _ = state
+                new_rows = embeddings[self.num_vectors : num_vectors]
+                self._append_ids(
+                    lists, self._assign(new_rows, centroids), self.num_vectors
+                )
+
+            self.num_vectors = num_vectors
+
+    def search(self, query: np.ndarray, num_vectors: int) -> np.ndarray | None:
+        """Find candidate rows for a query.
+
+        Parameters
+        ----------
+        query : np.ndarray
+            Normalized query embedding of shape (D,).
+        num_vectors : int
+            Only rows below this id are returned.
+
+        Returns
+        -------
+        np.ndarray | None
+            Sorted candidate row ids from the ``n_probe`` closest clusters,
+            or None if the index is not trained yet.
+        """
+        state = self._state
+        if state is None:
+            return None
+
+        centroids, lists, _ = state
+        n_probe = min(self.n_probe, len(centroids))
+        centroid_scores = centroids @ query
+        probes = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+
+        candidates = []
+        for cluster in probes:
+            buffer, size = lists[cluster]
+            ids = buffer[:size]
+            candidates.append(ids[ids < num_vectors])
+        return np.sort(np.concatenate(candidates))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get index statistics.
+
+        Returns
+        -------
+        dict[str, Any]
+            Backend name, vector count, training state and list sizes.
+        """
+        state = self._state
+        stats = {
+            "backend": "ivf",
+            "num_vectors": self.num_vectors,
+            "trained": state is not None,
+            "n_probe": self.n_probe,
+        }
+        if state is not None:
+            sizes = [size for _, size in state[1]]
+            stats["n_lists"] = len(sizes)
+            stats["max_list_size"] = max(sizes)
+        return stats
+
+
+def create_ann_index(
+    backend: str, n_probe: int = 16, min_train_size: int = 2048
+) -> IVFFlatIndex | None:
+    """Create the approximate nearest-neighbour index selected in config.
+
+    Parameters
+    ----------
+    backend : str
+        One of ``ANN_BACKENDS``: "exact" (brute force, no index) or "ivf".
+    n_probe : int, optional
+        Clusters scanned per query (IVF), by default 16.
+    min_train_size : int, optional
+        Corpus size below which exact search is used (IVF), by default 2048.
+
+    Returns
+    -------
+    IVFFlatIndex | None
+        The index, or None for exact search.
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown.
+    """
+    if backend == "exact":
+        return None
+    if backend == "ivf":
+        return IVFFlatIndex(n_probe=n_probe, min_train_size=min_train_size)
+    raise ValueError(
+        f"Unknown ANN backend: {backend!r} (expected one of {', '.join(ANN_BACKENDS)})"
+    )
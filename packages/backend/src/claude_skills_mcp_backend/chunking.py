@@ -0,0 +1,134 @@
+"""Split skill content into chunks for chunk-level embeddings."""
+
+import re
+
+import numpy as np
+
+from .skill_loader import Skill
+
+_HEADING_PATTERN = re.compile(r"^#{1,6}\s")
+
+
+def _split_sections(content: str) -> list[str]:
+    """Split markdown into sections at headings outside fenced code blocks.
+
+    Parameters
+    ----------
+    content : str
+        Markdown text.
+
+    Returns
+    -------
+    list[str]
+        Sections, each starting with its heading (except possibly the first).
+    """
+    sections: list[list[str]] = [[]]
+    in_fence = False
+    for line in content.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        if not in_fence and _HEADING_PATTERN.match(line) and sections[-1]:
+            sections.append([])
+        sections[-1].append(line)
+    return ["\n".join(lines).strip() for lines in sections]
+
+
+def _split_windows(text: str, max_chars: int) -> list[str]:
+    """Split text into windows of at most ``max_chars``, preferring whitespace.
+
+    Consecutive windows overlap by about a fifth of ``max_chars`` so that
+    sentences on a boundary appear whole in at least one window.
+
+    Parameters
+    ----------
+    text : str
+        Text to split.
+    max_chars : int
+        Maximum window length.
+
+    Returns
+    -------
+    list[str]
+        Windows covering ``text``.
+    """
+    overlap = max_chars // 5
+    windows = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+        if end < len(text):
+            # Break on the last whitespace in the second half of the window
+            split = text.rfind(" ", start + max_chars // 2, end)
+            if split != -1:
+                end = split
+        windows.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [window for window in windows if window]
+
+
+def chunk_text(content: str, max_chars: int = 1000) -> list[str]:
+    """Split markdown content into chunks of at most ``max_chars``.
+
+    Content is first split at markdown headings; small adjacent sections are
+    packed together and sections longer than ``max_chars`` are split into
+    overlapping windows.
+
+    Parameters
+    ----------
+    content : str
+        Markdown content (e.g. the body of a SKILL.md).
+    max_chars : int, optional
+        Maximum chunk length in characters, by default 1000.
+
+    Returns
+    -------
+    list[str]
+        Non-empty chunks in document order.
+    """
+    chunks: list[str] = []
+    current = ""
+    for section in _split_sections(content):
+        if not section:
+            continue
+        if len(section) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split_windows(section, max_chars))
+        elif current and len(current) + len(section) + 2 > max_chars:
+            chunks.append(current)
+            current = section
+        else:
+            current = f"{current}\n\n{section}" if current else section
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_skills(
+    skills: list[Skill], max_chars: int = 1000
+) -> tuple[list[str], np.ndarray]:
+    """Chunk the content of several skills.
+
+    Parameters
+    ----------
+    skills : list[Skill]
+        Skills whose content should be chunked.
+    max_chars : int, optional
+        Maximum chunk length in characters, by default 1000.
+
+    Returns
+    -------
+    tuple[list[str], np.ndarray]
+        All chunks concatenated in skill order, and an int64 array of
+        ``len(skills) + 1`` offsets such that the chunks of skill ``i`` are
+        ``chunks[offsets[i]:offsets[i + 1]]``.
+    """
+    chunks: list[str] = []
+    offsets = np.zeros(len(skills) + 1, dtype=np.int64)
+    for i, skill in enumerate(skills):
+        chunks.extend(chunk_text(skill.content or "", max_chars))
+        offsets[i + 1] = len(chunks)
+    return chunks, offsets
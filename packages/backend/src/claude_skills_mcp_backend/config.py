@@ -23,6 +23,31 @@ DEFAULT_CONFIG = {
         },
     ],
     "embedding_model": "all-MiniLM-L6-v2",
+    "encoder_backend": "torch",  # "torch", "onnx", "onnx-int8" or "hashing" (tests)
+    "preload_model": True,  # Load the model at startup, in parallel with skill fetching
+    "encoder_workers": 0,  # Encoder replica processes (0: encode in-process)
+    "embedding_cache_enabled": False,  # Persist skill embeddings across restarts/reloads
+    "vector_store_enabled": False,  # Share memory-mapped embedding matrices across processes
+    "query_cache_size": 1024,  # LRU cache of query embeddings (0 to disable)
+    "query_batch_size": 1,  # Concurrent queries encoded together (1 to disable)
+    "query_batch_wait_ms": 2.0,  # Longest wait for a batch to fill
+    "hybrid_search": False,  # Fuse BM25 keyword matching with vector similarity
+    "rrf_k": 60,  # Reciprocal rank fusion constant
+    "chunk_content": False,  # Also embed SKILL.md content in chunks
+    "chunk_size_chars": 1000,  # Maximum content chunk length
+    "ann_backend": "exact",  # "exact" (brute force) or "ivf" (approximate)
+    "ann_n_probe": 16,  # IVF clusters scanned per query
+    "ann_min_skills": 2048,  # Use exact search below this many skills
+    "embedding_storage": "float32",  # "float32", "float16" or "int8"
+    "rescore_depth": 100,  # Candidates rescored in full precision (quantized storage)
+    "compaction_threshold": 0.25,  # Dead-row fraction that triggers compaction (None: never)
+    "deduplicate_skills": True,  # Collapse duplicate skills into one entry
+    "duplicate_threshold": 0.95,  # Same-name description similarity (None: exact only)
+    "skill_graph_k": 10,  # Neighbours precomputed per skill for related_skills (0: off)
+    "search_threads": 4,  # Threads scoring partitions of large indexes (1: serial)
+    "degraded_search": True,  # Rank by keywords instead of waiting for the model
+    "index_bundle_enabled": False,  # Start from the last saved index, refresh in background
+    "index_bundle_path": None,  # None for a file in the temp cache directory
     "default_top_k": 3,
     "max_skill_content_chars": None,  # None for unlimited, or an integer to limit
     "load_skill_documents": True,  # Load additional files from skill directories
@@ -113,6 +138,48 @@ def get_example_config() -> str:
             },
         ],
         "embedding_model": "all-MiniLM-L6-v2",
+        "encoder_backend": "torch",
+        "comment_encoder_backend": "Runtime for the embedding model: 'torch' (sentence-transformers), 'onnx' or 'onnx-int8' (ONNX Runtime on CPU, much smaller and faster to load; needs the [onnx] extra), or 'hashing' (deterministic, for tests only)",
+        "preload_model": True,
+        "comment_preload_model": "Load the embedding model in the background at startup while skills are fetched, instead of when the first skills arrive",
+        "encoder_workers": 0,
+        "comment_encoder_workers": "Number of worker processes each holding a model replica; queries and indexing batches are split across them and embeddings come back through shared memory, so throughput scales with cores (0 to encode in the server process)",
+        "embedding_cache_enabled": False,
+        "comment_embedding_cache": "Reuse skill embeddings from disk so restarts and reloads only encode new or changed skills; stored in /tmp/claude_skills_mcp_cache/embeddings/, pruned to the indexed skills after each load, with unused entries deleted after 30 days",
+        "vector_store_enabled": False,
+        "comment_vector_store": "Keep embedding matrices in read-only memory-mapped files under /tmp/claude_skills_mcp_cache/vectors/ so all backend processes on a host share one copy; enable when several backends run on one host",
+        "query_cache_size": 1024,
+        "comment_query_cache": "Number of query embeddings kept in memory for repeated task descriptions (0 to disable)",
+        "query_batch_size": 1,
+        "query_batch_wait_ms": 2.0,
+        "comment_query_batching": "Queries from concurrent searches are encoded together in batches of up to query_batch_size, waiting at most query_batch_wait_ms for a batch to fill (1 to disable); raise it (e.g. to 32) when many searches arrive concurrently, as the wait only adds latency for a single client",
+        "hybrid_search": False,
+        "rrf_k": 60,
+        "comment_hybrid_search": "Combine BM25 keyword matching (skill names, descriptions, content) with vector similarity using reciprocal rank fusion (rrf_k); relevance_score then becomes a rank fusion score instead of the cosine similarity",
+        "chunk_content": False,
+        "chunk_size_chars": 1000,
+        "comment_chunk_content": "Also embed the full SKILL.md content in chunks of up to chunk_size_chars; each skill scores its best-matching chunk or description",
+        "ann_backend": "exact",
+        "ann_n_probe": 16,
+        "ann_min_skills": 2048,
+        "comment_ann": "Nearest-neighbour backend: 'exact' (brute force) or 'ivf' (approximate, for very large skill collections). IVF scans ann_n_probe clusters per query and is only used once ann_min_skills are indexed",
+        "embedding_storage": "float32",
+        "rescore_depth": 100,
+        "comment_embedding_storage": "In-memory vector storage: 'float32', or 'float16'/'int8' to scan compact vectors and rescore the top rescore_depth candidates from a memory-mapped full-precision copy",
+        "compaction_threshold": 0.25,
+        "comment_compaction": "Removed or replaced skills are masked out of searches; the index is rewritten in the background once this fraction of its rows is dead (null to disable)",
+        "deduplicate_skills": True,
+        "duplicate_threshold": 0.95,
+        "comment_deduplicate": "Skills with the same name, description and content (e.g. copies vendored by several repositories) are indexed once and list the other copies as alternate sources; a same-name skill whose description similarity is at least duplicate_threshold is also collapsed (null: exact copies only)",
+        "skill_graph_k": 10,
+        "comment_skill_graph": "Keep each skill's skill_graph_k most similar skills, updated as skills are added or changed, so the related_skills tool answers without a model call or index scan (0 to disable; related_skills then scans the stored embeddings)",
+        "search_threads": 4,
+        "comment_search_threads": "Large indexes are split into contiguous partitions (at least 16384 rows each) scored concurrently by this many threads, and the top results of the partitions are merged (1 to scan serially)",
+        "degraded_search": True,
+        "comment_degraded_search": "Until the embedding model is loaded, rank searches by keyword (BM25) match over the skills parsed so far (or the restored index) instead of waiting, and switch to semantic search once the model is ready; responses and /health report the active search_mode",
+        "index_bundle_enabled": False,
+        "index_bundle_path": None,
+        "comment_index_bundle": "Save the index (skills, embeddings, keyword index) to a single file after loading, and restore it at the next start so searches work immediately while skills are refreshed in the background; until that refresh finishes, results come from the saved index and may be stale. index_bundle_path defaults to a file in the temp cache directory",
         "default_top_k": 3,
         "max_skill_content_chars": None,
         "comment_max_chars": "Set to an integer (e.g., 5000) to truncate skill content, or null for unlimited",
@@ -0,0 +1,502 @@
+"""Embedding caches: persistent skill embeddings and in-memory query embeddings."""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _get_embedding_cache_dir() -> Path:
+    """Get embedding cache directory.
+
+    Returns
+    -------
+    Path
+        Path to embedding cache directory.
+    """
+    cache_dir = Path(tempfile.gettempdir()) / "claude_skills_mcp_cache" / "embeddings"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def hash_text(text: str) -> str:
+    """Compute the content hash used to key a cached embedding.
+
+    Parameters
+    ----------
+    text : str
+        Text that is (or will be) embedded.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest of the UTF-8 encoded text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Persistent store of embeddings keyed by model and text hash.
+
+    One set of cache files exists per model fingerprint, so switching
+    models never returns vectors from a different embedding space. Within
+    it, vectors are keyed by the SHA-256 of the exact text that was
+    embedded.
+
+    ``save`` appends the entries added since the last save as a new shard
+    file instead of rewriting the cache, so saving costs the new entries
+    only and processes sharing the cache directory never overwrite each
+    other's entries. Once more than ``_MAX_SHARDS`` shards exist they are
+    merged into the base file. ``prune`` bounds the cache to the texts an
+    index uses: other entries leave memory, and leave disk once no index
+    has used them for ``max_age_days`` (the files are shared between
+    processes that may index other skills).
+
+    Attributes
+    ----------
+    model_fingerprint : str
+        Identifier of the embedding model (name plus any backend details).
+    cache_file : Path
+        Path to the base ``.npz`` file of this cache; shards sit next to it.
+    max_age_days : float
+        Age after which entries no index uses are pruned from disk.
+    _vectors : dict[str, np.ndarray] | None
+        In-memory view of the cache (loaded lazily).
+    _used : dict[str, float]
+        Last time (epoch seconds) each in-memory entry was saved or kept
+        by a prune.
+    _pending : dict[str, np.ndarray]
+        Entries not yet written to disk.
+    _shards : set[Path]
+        Shard files read or written by this instance.
+    _lock : threading.Lock
+        Lock for thread-safe access.
+    """
+
+    # Shard files allowed before they are merged into the base file
+    _MAX_SHARDS = 16
+
+    def __init__(
+        self,
+        model_fingerprint: str,
+        cache_dir: Path | None = None,
+        max_age_days: float = 30.0,
+    ):
+        """Initialize the embedding cache.
+
+        Parameters
+        ----------
+        model_fingerprint : str
+            Identifier of the embedding model.
+        cache_dir : Path | None, optional
+            Directory for cache files, by default the shared temp cache.
+        max_age_days : float, optional
+            Age after which entries no index uses are pruned from disk, by
+            default 30 days.
+        """
+        self.model_fingerprint = model_fingerprint
+        cache_dir = cache_dir or _get_embedding_cache_dir()
+        hash_key = hashlib.md5(model_fingerprint.encode()).hexdigest()
+        self.cache_file = Path(cache_dir) / f"{hash_key}.npz"
+        self.max_age_days = max_age_days
+        self._vectors: dict[str, np.ndarray] | None = None
+        self._used: dict[str, float] = {}
+        self._pending: dict[str, np.ndarray] = {}
+        self._shards: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def _shard_paths(self) -> list[Path]:
+        """List the shard files on disk, oldest first."""
+        paths = []
+        for path in self.cache_file.parent.glob(f"{self.cache_file.stem}.shard-*.npz"):
+            try:
+                paths.append((path.stat().st_mtime, path))
+            except OSError:
+                continue  # Merged away by another process
+        return [path for _, path in sorted(paths)]
+
+    def _read_file(self, path: Path) -> dict[str, tuple[np.ndarray, float]]:
+        """Read one cache file.
+
+        Returns
+        -------
+        dict[str, tuple[np.ndarray, float]]
+            Vector and last-use time per key; empty if the file is missing,
+            unreadable or belongs to another model.
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data["model"]) != self.model_fingerprint:
+                    logger.warning(
+                        f"Embedding cache {path} belongs to another model, ignoring"
+                    )
+                    return {}
+                keys = data["keys"]
+                vectors = data["vectors"]
+                if "used" in data:
+                    used = data["used"]
+                else:
+                    used = np.full(len(keys), path.stat().st_mtime)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Failed to load embedding cache {path}: {e}")
+            return {}
+        return {str(key): (vectors[i], float(used[i])) for i, key in enumerate(keys)}
+
+    def _read_disk(self) -> tuple[dict[str, tuple[np.ndarray, float]], list[Path]]:
+        """Read the base file and every shard, later entries winning.
+
+        Returns
+        -------
+        tuple[dict[str, tuple[np.ndarray, float]], list[Path]]
+            Vector and latest use time per key, and the shards read.
+        """
+        entries = self._read_file(self.cache_file)
+        shards = self._shard_paths()
+        for path in shards:
+            for key, (vector, used) in self._read_file(path).items():
+                previous = entries.get(key)
+                if previous is not None:
+                    used = max(used, previous[1])
+                entries[key] = (vector, used)
+        return entries, shards
+
+    def _write(self, path: Path, entries: dict[str, tuple[np.ndarray, float]]) -> bool:
+        """Write entries to a cache file atomically.
+
+        The file is written to a temporary path and moved into place, so
+        concurrent readers (including other processes) never see a partial
+        file.
+
+        Returns
+        -------
+        bool
+            True if the file was written.
+        """
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp.npz")
+        try:
+            np.savez(
+                tmp_path,
+                model=np.array(self.model_fingerprint),
+                keys=np.array(list(entries.keys())),
+                vectors=np.stack([vector for vector, _ in entries.values()]),
+                used=np.array([used for _, used in entries.values()]),
+            )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to save embedding cache to {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+        return True
+
+    def _load(self) -> dict[str, np.ndarray]:
+        """Load cached vectors from disk on first access.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            Mapping of text hash to embedding vector.
+        """
+        if self._vectors is not None:
+            return self._vectors
+
+        entries, shards = self._read_disk()
+        self._vectors = {key: vector for key, (vector, _) in entries.items()}
+        self._used = {key: used for key, (_, used) in entries.items()}
+        self._shards = set(shards)
+        if entries:
+            logger.info(
+                f"Loaded {len(entries)} cached embeddings from {self.cache_file}"
+            )
+        return self._vectors
+
+    def get_many(self, keys: list[str]) -> list[np.ndarray | None]:
+        """Look up embeddings for a list of text hashes.
+
+        Parameters
+        ----------
+        keys : list[str]
+            Text hashes to look up.
+
+        Returns
+        -------
+        list[np.ndarray | None]
+            Cached vector for each key, or None on a miss.
+        """
+        with self._lock:
+            vectors = self._load()
+            return [vectors.get(key) for key in keys]
+
+    def put_many(self, keys: list[str], vectors: np.ndarray) -> None:
+        """Store embeddings for a list of text hashes (in memory until ``save``).
+
+        Parameters
+        ----------
+        keys : list[str]
+            Text hashes, one per row of ``vectors``.
+        vectors : np.ndarray
+            Embedding matrix with one row per key.
+        """
+        if not keys:
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        now = time.time()
+        with self._lock:
+            cached = self._load()
+            for key, vector in zip(keys, vectors):
+                cached[key] = self._pending[key] = vector.copy()
+                self._used[key] = now
+
+    def save(self) -> None:
+        """Append the entries added since the last save as a new shard file."""
+        with self._lock:
+            if not self._pending:
+                return
+
+            path = self.cache_file.with_name(
+                f"{self.cache_file.stem}.shard-{uuid.uuid4().hex}.npz"
+            )
+            entries = {
+                key: (vector, self._used[key]) for key, vector in self._pending.items()
+            }
+            if not self._write(path, entries):
+                return
+            self._shards.add(path)
+            logger.debug(f"Saved {len(entries)} embeddings to cache shard {path}")
+            self._pending.clear()
+
+            if len(self._shards) > self._MAX_SHARDS:
+                self._merge(keep=None)
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Save the cache, bounded to the texts an index uses.
+
+        Entries not in ``keep`` are dropped from memory, and from disk once
+        no index has kept them for ``max_age_days``; the entries in
+        ``keep`` are marked as used now. All shards are merged into the base
+        file.
+
+        Parameters
+        ----------
+        keep : Iterable[str]
+            Hashes of the texts the index uses.
+
+        Returns
+        -------
+        int
+            Number of entries dropped from memory.
+        """
+        with self._lock:
+            before = len(self._load())
+            self._merge(keep=set(keep))
+            return before - len(self._vectors)
+
+    def _merge(self, keep: set[str] | None) -> None:
+        """Merge memory, base file and shards into the base file.
+
+        Must be called with ``_lock`` held. The files are re-read first, so
+        entries other processes saved since they were loaded are kept.
+
+        Parameters
+        ----------
+        keep : set[str] | None
+            Keys the index uses, to prune the others; None keeps everything.
+        """
+        now = time.time()
+        entries, shards = self._read_disk()
+        for key, vector in self._vectors.items():
+            previous = entries.get(key)
+            used = self._used.get(key, now)
+            if previous is not None:
+                used = max(used, previous[1])
+            entries[key] = (vector, used)
+
+        if keep is not None:
+            cutoff = now - self.max_age_days * 86400
+            entries = {
+                key: (vector, now if key in keep else used)
+                for key, (vector, used) in entries.items()
+                if key in keep or used >= cutoff
+            }
+            self._vectors = {key: entries[key][0] for key in keep if key in entries}
+        else:
+            self._vectors = {key: vector for key, (vector, _) in entries.items()}
+        self._used = {key: entries[key][1] for key in self._vectors}
+
+        if entries and not self._write(self.cache_file, entries):
+            return
+        if not entries:
+            self.cache_file.unlink(missing_ok=True)
+        for path in self._shards.union(shards):
+            path.unlink(missing_ok=True)
+        self._shards = set()
+        self._pending.clear()
+        logger.debug(f"Merged {len(entries)} embeddings into {self.cache_file}")
+
+    def __len__(self) -> int:
+        """Return the number of cached embeddings in memory."""
+        with self._lock:
+            return len(self._load())
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU cache of query embeddings.
+
+    Queries are normalized (surrounding and repeated whitespace removed)
+    before lookup, and entries are keyed by model name. Seeing a different
+    model name drops every entry, since vectors from another model are
+    not comparable.
+
+    Attributes
+    ----------
+    max_size : int
+        Maximum number of cached queries (0 disables caching).
+    hits : int
+        Number of lookups served from the cache.
+    misses : int
+        Number of lookups not found in the cache.
+    evictions : int
+        Number of entries evicted to respect ``max_size``.
+    invalidations : int
+        Number of times the cache was cleared because the model changed.
+    _entries : OrderedDict[tuple[str, str], np.ndarray]
+        Cached vectors in least- to most-recently used order.
+    _model_name : str | None
+        Model the current entries belong to.
+    _lock : threading.Lock
+        Lock for thread-safe access.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        """Initialize the query cache.
+
+        Parameters
+        ----------
+        max_size : int, optional
+            Maximum number of cached queries, by default 1024.
+        """
+        self.max_size = max(0, max_size)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self._model_name: str | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a query string for cache lookup.
+
+        Parameters
+        ----------
+        query : str
+            Raw query text.
+
+        Returns
+        -------
+        str
+            Query with leading, trailing and repeated whitespace collapsed.
+        """
+        return " ".join(query.split())
+
+    def _check_model(self, model_name: str) -> None:
+        """Drop all entries if the model changed. Must hold ``_lock``."""
+        if self._model_name != model_name:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self._model_name = model_name
+
+    def get(self, model_name: str, query: str) -> np.ndarray | None:
+        """Look up the embedding of a query.
+
+        Parameters
+        ----------
+        model_name : str
+            Model that produced (or will produce) the embedding.
+        query : str
+            Query text (normalized internally).
+
+        Returns
+        -------
+        np.ndarray | None
+            Cached embedding, or None on a miss.
+        """
+        if self.max_size == 0:
+            return None
+
+        key = (model_name, self.normalize_query(query))
+        with self._lock:
+            self._check_model(model_name)
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, model_name: str, query: str, vector: np.ndarray) -> None:
+        """Store the embedding of a query.
+
+        Parameters
+        ----------
+        model_name : str
+            Model that produced the embedding.
+        query : str
+            Query text (normalized internally).
+        vector : np.ndarray
+            Query embedding. Stored as a read-only copy.
+        """
+        if self.max_size == 0:
+            return
+
+        vector = np.array(vector, dtype=np.float32)
+        vector.flags.writeable = False
+        key = (model_name, self.normalize_query(query))
+        with self._lock:
+            self._check_model(model_name)
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics.
+
+        Returns
+        -------
+        dict[str, Any]
+            Size, capacity, hit/miss/eviction counters and hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,307 @@
+"""Encoder replicas in worker processes, returning embeddings through shared memory."""
+
+import atexit
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .encoders import Encoder, create_encoder
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main(
+    conn: Connection, backend: str, model_name: str, num_threads: int | None
+) -> None:
+    """Serve encode requests with one model replica until told to stop.
+
+    Protocol over ``conn``: the worker reports ``("ready", dimension)``,
+    receives ``("attach", shm_name, capacity)``, then answers each
+    ``("encode", texts)`` with ``("done", num_rows)`` after writing the rows
+    into the shared buffer, until it receives ``("stop",)``. Failures are
+    answered with ``("error", message)``.
+    """
+    try:
+        encoder = create_encoder(backend, model_name, num_threads=num_threads)
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    conn.send(("ready", encoder.dimension))
+
+    message = conn.recv()
+    if message[0] != "attach":
+        return
+    _, shm_name, capacity = message
+    shm = SharedMemory(name=shm_name)
+    buffer = np.ndarray((capacity, encoder.dimension), np.float32, buffer=shm.buf)
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == "stop":
+                break
+            texts = message[1]
+            try:
+                buffer[: len(texts)] = encoder.encode(texts)
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+                continue
+            conn.send(("done", len(texts)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del buffer
+        shm.close()
+
+
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    def __init__(self, process, conn: Connection):
+        self.process = process
+        self.conn = conn
+        self.shm: SharedMemory | None = None
+        self.buffer: np.ndarray | None = None
+
+
+class EncoderPool(Encoder):
+    """Runs ``num_workers`` encoder replicas in separate processes.
+
+    Each worker owns a model replica and a shared-memory output buffer
+    created by this process. Only the texts travel to the worker (pickled
+    over a pipe); the worker writes the embeddings straight into its
+    buffer and replies with the row count, so no embedding is pickled.
+    Each call to ``encode`` is split across the idle workers, and
+    concurrent calls use different workers, so throughput scales with
+    cores while the GIL of this process only covers dispatching.
+
+    Attributes
+    ----------
+    backend : str
+        Encoder backend of the replicas.
+    model_name : str
+        Name of the sentence-transformers model.
+    num_workers : int
+        Number of worker processes.
+    capacity : int
+        Rows per shared buffer; larger requests are split.
+    dimension : int
+        Length of the embedding vectors.
+    _workers : list[_Worker]
+        All live workers.
+    _idle : queue.Queue[_Worker | None]
+        Workers not serving a request; None wakes waiters once the pool
+        is broken.
+    _broken : str | None
+        Why the pool can no longer encode (a dead worker could not be
+        replaced), or None.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        model_name: str,
+        num_workers: int,
+        capacity: int = 256,
+        threads_per_worker: int | None = None,
+    ):
+        """Start the workers and wait until every replica is loaded.
+
+        Parameters
+        ----------
+        backend : str
+            Encoder backend of the replicas, see ``create_encoder``.
+        model_name : str
+            Name of the sentence-transformers model.
+        num_workers : int
+            Number of worker processes.
+        capacity : int, optional
+            Rows per shared buffer, by default 256.
+        threads_per_worker : int | None, optional
+            Runtime threads per replica, by default the cores divided
+            evenly among the workers.
+
+        Raises
+        ------
+        RuntimeError
+            If a worker fails to load its replica.
+        """
+        self.backend = backend
+        self.model_name = model_name
+        self.num_workers = num_workers
+        self.capacity = capacity
+        if threads_per_worker is None:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+        self._threads_per_worker = threads_per_worker
+
+        # Spawned, not forked: forking a process that has loaded torch or
+        # started threads can deadlock
+        self._context = multiprocessing.get_context("spawn")
+        self._spawned = 0
+        self._workers: list[_Worker] = [self._spawn() for _ in range(num_workers)]
+
+        self._idle: queue.Queue[_Worker | None] = queue.Queue()
+        self._dispatcher = ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="encoder-dispatch"
+        )
+        self._broken: str | None = None
+        self._closed = False
+        self._close_lock = threading.Lock()
+        atexit.register(self.close)
+
+        try:
+            for worker in self._workers:
+                self._attach(worker)
+        except Exception:
+            self.close()
+            raise
+
+        logger.info(
+            f"Started {num_workers} {backend} encoder workers "
+            f"({threads_per_worker} threads each)"
+        )
+
+    def _spawn(self) -> _Worker:
+        """Start a worker process; ``_attach`` waits for its replica."""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                self.backend,
+                self.model_name,
+                self._threads_per_worker,
+            ),
+            name=f"encoder-worker-{self._spawned}",
+            daemon=True,
+        )
+        self._spawned += 1
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    @staticmethod
+    def _release(worker: _Worker) -> None:
+        """Close a stopped worker's pipe and shared buffer."""
+        worker.conn.close()
+        if worker.shm is not None:
+            worker.buffer = None
+            worker.shm.close()
+            worker.shm.unlink()
+            worker.shm = None
+
+    def _replace(self, worker: _Worker) -> None:
+        """Replace a dead worker with a new one, or mark the pool broken."""
+        logger.warning(f"Encoder worker {worker.process.name} died, restarting it")
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.terminate()
+        with self._close_lock:
+            # A closed pool releases its workers itself
+            if self._closed:
+                return
+            self._workers.remove(worker)
+            self._release(worker)
+            try:
+                replacement = self._spawn()
+                self._workers.append(replacement)
+                self._attach(replacement)
+            except Exception as e:
+                self._broken = f"a dead worker could not be restarted ({e})"
+                logger.error(f"Encoder pool is broken: {self._broken}")
+                self._idle.put(None)
+
+    def _attach(self, worker: _Worker) -> None:
+        """Wait for a worker's replica and hand it its shared buffer."""
+        try:
+            status, payload = worker.conn.recv()
+        except EOFError:
+            status, payload = "error", "worker exited during startup"
+        if status != "ready":
+            raise RuntimeError(f"Encoder worker failed to start: {payload}")
+
+        self.dimension = payload
+        worker.shm = SharedMemory(create=True, size=self.capacity * payload * 4)
+        worker.buffer = np.ndarray(
+            (self.capacity, payload), np.float32, buffer=worker.shm.buf
+        )
+        worker.conn.send(("attach", worker.shm.name, self.capacity))
+        self._idle.put(worker)
+
+    def _encode_on_worker(self, texts: list[str]) -> np.ndarray:
+        """Encode at most ``capacity`` texts on the next idle worker.
+
+        A worker that dies fails the request and is replaced, so later
+        requests are served again; only a worker that reported an error
+        (or succeeded) goes back to the idle queue.
+        """
+        worker = self._idle.get()
+        if worker is None:
+            # Pass the wake-up on to the next waiter
+            self._idle.put(None)
+            raise RuntimeError(f"Encoder pool is broken: {self._broken}")
+        try:
+            worker.conn.send(("encode", texts))
+            status, payload = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            self._replace(worker)
+            raise RuntimeError(f"Encoder worker {worker.process.name} died") from e
+
+        try:
+            if status != "done":
+                raise RuntimeError(f"Encoder worker failed: {payload}")
+            # Copy out before the worker can be handed its next request
+            return worker.buffer[:payload].copy()
+        finally:
+            self._idle.put(worker)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embed texts on the worker processes, see ``Encoder.encode``.
+
+        Raises
+        ------
+        RuntimeError
+            If the pool is closed or a worker fails.
+        """
+        if self._closed:
+            raise RuntimeError("Encoder pool is closed")
+        if self._broken is not None:
+            raise RuntimeError(f"Encoder pool is broken: {self._broken}")
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        # Spread the texts over all workers, within their buffer capacity
+        size = min(self.capacity, math.ceil(len(texts) / self.num_workers))
+        pieces = [texts[start : start + size] for start in range(0, len(texts), size)]
+        if len(pieces) == 1:
+            return self._encode_on_worker(pieces[0])
+        return np.concatenate(
+            list(self._dispatcher.map(self._encode_on_worker, pieces))
+        )
+
+    def close(self) -> None:
+        """Stop the workers and release the shared buffers."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._dispatcher.shutdown(wait=True)
+        for worker in self._workers:
+            try:
+                worker.conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            self._release(worker)
+        atexit.unregister(self.close)
@@ -0,0 +1,382 @@
+"""Text encoder backends that turn skill and query texts into embeddings."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+
+from .lexical_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8", "hashing")
+
+
+def _get_onnx_cache_dir() -> Path:
+    """Get directory for quantized ONNX models.
+
+    Returns
+    -------
+    Path
+        Path to ONNX model cache directory.
+    """
+    cache_dir = Path(tempfile.gettempdir()) / "claude_skills_mcp_cache" / "onnx"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+class Encoder(ABC):
+    """Interface of an embedding model.
+
+    Attributes
+    ----------
+    dimension : int
+        Length of the embedding vectors.
+    """
+
+    dimension: int
+
+    @abstractmethod
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embed texts.
+
+        Parameters
+        ----------
+        texts : list[str]
+            Texts to embed.
+
+        Returns
+        -------
+        np.ndarray
+            Float32 matrix of shape (len(texts), dimension), not necessarily
+            normalized.
+        """
+
+
+class SentenceTransformerEncoder(Encoder):
+    """sentence-transformers model running on PyTorch.
+
+    Attributes
+    ----------
+    model : SentenceTransformer
+        The wrapped model.
+    dimension : int
+        Length of the embedding vectors.
+    """
+
+    def __init__(self, model_name: str, num_threads: int | None = None):
+        """Load the model.
+
+        Parameters
+        ----------
+        model_name : str
+            Name or path of the sentence-transformers model.
+        num_threads : int | None, optional
+            Intra-op threads of the (process-wide) torch thread pool, by
+            default torch's choice.
+        """
+        # Imported here so the other backends never pay for importing torch
+        from sentence_transformers import SentenceTransformer
+
+        if num_threads:
+            import torch
+
+            torch.set_num_threads(num_threads)
+        self.model = SentenceTransformer(model_name)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embed texts, see ``Encoder.encode``."""
+        return np.asarray(
+            self.model.encode(texts, convert_to_numpy=True), dtype=np.float32
+        )
+
+
+class OnnxEncoder(Encoder):
+    """ONNX Runtime export of a sentence-transformers model on the CPU.
+
+    Loads the ``onnx/model.onnx`` export and ``tokenizer.json`` published
+    with the model on the Hugging Face Hub (or found in a local model
+    directory), and applies the model's pooling itself, so neither torch
+    nor transformers is imported. With ``quantize``, the weights are
+    quantized to int8 once (dynamic quantization: activations are
+    quantized on the fly) and the result is cached on disk.
+
+    Attributes
+    ----------
+    session : onnxruntime.InferenceSession
+        Inference session of the (quantized) model.
+    tokenizer : tokenizers.Tokenizer
+        Fast tokenizer with truncation and padding enabled.
+    pooling : str
+        "mean" or "cls".
+    batch_size : int
+        Texts run through the model at a time.
+    dimension : int
+        Length of the embedding vectors.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        quantize: bool = True,
+        batch_size: int = 32,
+        num_threads: int | None = None,
+    ):
+        """Load (and if needed quantize) the model.
+
+        Parameters
+        ----------
+        model_name : str
+            Hub id (``sentence-transformers/`` is assumed when no
+            organization is given) or local directory of the model.
+        quantize : bool, optional
+            Use int8 dynamically quantized weights, by default True.
+        batch_size : int, optional
+            Texts run through the model at a time, by default 32.
+        num_threads : int | None, optional
+            Intra-op threads of the inference session, by default one per
+            core.
+
+        Raises
+        ------
+        ImportError
+            If onnxruntime or tokenizers is not installed.
+        FileNotFoundError
+            If the model has no ONNX export.
+        """
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The ONNX encoder backends require onnxruntime and tokenizers "
+                "(install claude-skills-mcp-backend[onnx])"
+            ) from e
+
+        model_dir = self._model_dir(model_name)
+        model_path = model_dir / "onnx" / "model.onnx"
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"No ONNX export found for {model_name} (expected {model_path})"
+            )
+        if quantize:
+            model_path = self._quantized(model_name, model_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {node.name for node in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(
+            max_length=self._read_json(model_dir / "sentence_bert_config.json").get(
+                "max_seq_length", 256
+            )
+        )
+        if self.tokenizer.padding is None:
+            self.tokenizer.enable_padding()
+
+        pooling_config = self._read_json(model_dir / "1_Pooling" / "config.json")
+        self.pooling = "cls" if pooling_config.get("pooling_mode_cls_token") else "mean"
+        self.batch_size = batch_size
+        self.dimension = int(self.encode([""]).shape[1])
+
+    @staticmethod
+    def _model_dir(model_name: str) -> Path:
+        """Find or download the files of a model."""
+        if Path(model_name).expanduser().is_dir():
+            return Path(model_name).expanduser()
+
+        from huggingface_hub import snapshot_download
+
+        repo_id = model_name
+        if "/" not in model_name:
+            repo_id = f"sentence-transformers/{model_name}"
+        return Path(
+            snapshot_download(
+                repo_id,
+                allow_patterns=[
+                    "onnx/model.onnx",
+                    "tokenizer.json",
+                    "sentence_bert_config.json",
+                    "1_Pooling/config.json",
+                ],
+            )
+        )
+
+    @staticmethod
+    def _quantized(model_name: str, model_path: Path) -> Path:
+        """Get the int8 version of a model, quantizing it on first use."""
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        # Keyed by the exported file too, so a changed export is requantized
+        stat = model_path.stat()
+        key = f"{model_name}\n{model_path.resolve()}\n{stat.st_size}:{stat.st_mtime_ns}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        quantized_path = _get_onnx_cache_dir() / f"{digest}-int8.onnx"
+        if not quantized_path.exists():
+            logger.info(f"Quantizing {model_name} to int8 (one-time)")
+            tmp_path = quantized_path.with_suffix(f".{os.getpid()}.tmp")
+            quantize_dynamic(
+                str(model_path), str(tmp_path), weight_type=QuantType.QInt8
+            )
+            os.replace(tmp_path, quantized_path)
+        return quantized_path
+
+    @staticmethod
+    def _read_json(path: Path) -> dict:
+        """Read an optional JSON config file."""
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embed texts, see ``Encoder.encode``."""
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            encodings = self.tokenizer.encode_batch(
+                texts[start : start + self.batch_size]
+            )
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array(
+                [e.attention_mask for e in encodings], dtype=np.int64
+            )
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self._input_names:
+                feeds["token_type_ids"] = np.array(
+                    [e.type_ids for e in encodings], dtype=np.int64
+                )
+
+            # (batch, tokens, dim) token embeddings
+            token_embeddings = self.session.run(None, feeds)[0]
+            if self.pooling == "cls":
+                batches.append(token_embeddings[:, 0])
+            else:
+                mask = attention_mask[:, :, None].astype(np.float32)
+                summed = (token_embeddings * mask).sum(axis=1)
+                batches.append(summed / np.maximum(mask.sum(axis=1), 1e-9))
+
+        if not batches:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.concatenate(batches).astype(np.float32, copy=False)
+
+
+class HashingEncoder(Encoder):
+    """Deterministic bag-of-words feature hashing encoder.
+
+    Each token adds +1 or -1 to one of ``dimension`` buckets, both chosen
+    by a hash of the token. Needs no model download and no extra
+    dependencies, so it is meant for tests and benchmarks of everything
+    but embedding quality.
+
+    Attributes
+    ----------
+    dimension : int
+        Length of the embedding vectors.
+    """
+
+    def __init__(self, dimension: int = 384):
+        """Initialize the encoder.
+
+        Parameters
+        ----------
+        dimension : int, optional
+            Length of the embedding vectors, by default 384.
+        """
+        self.dimension = dimension
+        self._buckets: dict[str, tuple[int, float]] = {}
+
+    def _bucket(self, token: str) -> tuple[int, float]:
+        """Get the bucket and sign of a token."""
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            digest = int.from_bytes(
+                hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little"
+            )
+            bucket = (digest % self.dimension, 1.0 if digest >> 63 else -1.0)
+            self._buckets[token] = bucket
+        return bucket
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embed texts, see ``Encoder.encode``."""
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for token in tokenize(text):
+                bucket, sign = self._bucket(token)
+                embeddings[i, bucket] += sign
+        return embeddings
+
+
+def create_encoder(
+    backend: str, model_name: str, num_threads: int | None = None
+) -> Encoder:
+    """Load the encoder selected in config.
+
+    Parameters
+    ----------
+    backend : str
+        One of ``ENCODER_BACKENDS``: "torch" (sentence-transformers),
+        "onnx" (ONNX Runtime), "onnx-int8" (ONNX Runtime with int8
+        weights) or "hashing" (deterministic test encoder, ignores
+        ``model_name``).
+    model_name : str
+        Name of the sentence-transformers model.
+    num_threads : int | None, optional
+        Threads used by the model runtime, by default the runtime's choice.
+
+    Returns
+    -------
+    Encoder
+        The loaded encoder.
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown.
+    """
+    if backend == "torch":
+        return SentenceTransformerEncoder(model_name, num_threads=num_threads)
+    if backend in ("onnx", "onnx-int8"):
+        return OnnxEncoder(
+            model_name, quantize=backend == "onnx-int8", num_threads=num_threads
+        )
+    if backend == "hashing":
+        return HashingEncoder()
+    raise ValueError(
+        f"Unknown encoder backend: {backend!r} "
+        f"(expected one of {', '.join(ENCODER_BACKENDS)})"
+    )
+
+
+def encoder_fingerprint(backend: str, model_name: str) -> str:
+    """Identify the embedding space of an encoder, for keying caches.
+
+    Parameters
+    ----------
+    backend : str
+        Encoder backend.
+    model_name : str
+        Name of the sentence-transformers model.
+
+    Returns
+    -------
+    str
+        ``model_name`` for the reference PyTorch backend (so existing
+        caches stay valid), otherwise the backend is included.
+    """
+    if backend == "torch":
+        return model_name
+    if backend == "hashing":
+        return backend
+    return f"{model_name}@{backend}"
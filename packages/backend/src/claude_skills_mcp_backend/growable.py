@@ -0,0 +1,189 @@
+"""Append-only, capacity-doubling buffers for incrementally built indexes."""
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+import numpy as np
+
+from .skill_loader import Skill
+
+
+class GrowableArray:
+    """Preallocated array with a logical length that doubles its capacity when full.
+
+    Appending n rows to an array of N rows costs O(n) amortized instead of
+    the O(N + n) of ``np.concatenate``. Rows below the logical length are
+    never written again, so views handed out by ``append`` stay valid (and
+    unchanged) while later rows are appended, which lets immutable search
+    snapshots share one buffer.
+
+    Attributes
+    ----------
+    last_view : np.ndarray | None
+        View of all rows returned by the latest ``append``.
+    _buffer : np.ndarray
+        Backing storage; rows ``[:len(self)]`` are in use.
+    _size : int
+        Logical number of rows.
+    """
+
+    def __init__(
+        self,
+        row_shape: tuple[int, ...],
+        dtype: Any = np.float32,
+        capacity: int = 64,
+    ):
+        """Initialize an empty buffer.
+
+        Parameters
+        ----------
+        row_shape : tuple[int, ...]
+            Shape of one row, e.g. ``(384,)`` for embeddings or ``()`` for a
+            1-D array.
+        dtype : Any, optional
+            Element type, by default float32.
+        capacity : int, optional
+            Initial capacity in rows, by default 64.
+        """
+        self._buffer = np.empty((max(1, capacity),) + tuple(row_shape), dtype=dtype)
+        self._size = 0
+        self.last_view: np.ndarray | None = None
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "GrowableArray":
+        """Create a buffer holding a copy of an existing array.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            Initial rows.
+
+        Returns
+        -------
+        GrowableArray
+            Buffer with capacity for twice as many rows.
+        """
+        growable = cls(array.shape[1:], array.dtype, capacity=2 * len(array))
+        growable.append(array)
+        return growable
+
+    def append(self, rows: np.ndarray) -> np.ndarray:
+        """Append rows, growing the buffer if needed.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            Rows to append, with the buffer's row shape.
+
+        Returns
+        -------
+        np.ndarray
+            View of all rows appended so far.
+        """
+        needed = self._size + len(rows)
+        if needed > len(self._buffer):
+            capacity = max(needed, 2 * len(self._buffer))
+            grown = np.empty((capacity,) + self._buffer.shape[1:], self._buffer.dtype)
+            grown[: self._size] = self._buffer[: self._size]
+            # Existing views keep the old buffer alive and unchanged
+            self._buffer = grown
+
+        self._buffer[self._size : needed] = rows
+        self._size = needed
+        self.last_view = self._buffer[:needed]
+        return self.last_view
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows that fit without reallocating."""
+        return len(self._buffer)
+
+    def __len__(self) -> int:
+        """Return the logical number of rows."""
+        return self._size
+
+
+class SkillTable:
+    """Append-only table of skills, parallel to the rows of the embeddings.
+
+    Backed by a Python list (a pointer array with amortized O(1) appends);
+    ``append`` returns a fixed-length view, so snapshots can share the table
+    while more skills are appended.
+
+    Attributes
+    ----------
+    last_view : SkillTableView | None
+        View returned by the latest ``append``.
+    _skills : list[Skill]
+        All skills appended so far.
+    """
+
+    def __init__(self, skills: Sequence[Skill] = ()):
+        """Initialize the table.
+
+        Parameters
+        ----------
+        skills : Sequence[Skill], optional
+            Initial skills, by default none.
+        """
+        self._skills: list[Skill] = []
+        self.last_view: SkillTableView | None = None
+        if skills:
+            self.append(skills)
+
+    def append(self, skills: Sequence[Skill]) -> "SkillTableView":
+        """Append skills.
+
+        Parameters
+        ----------
+        skills : Sequence[Skill]
+            Skills to append.
+
+        Returns
+        -------
+        SkillTableView
+            View of all skills appended so far.
+        """
+        self._skills.extend(skills)
+        self.last_view = SkillTableView(self._skills, len(self._skills))
+        return self.last_view
+
+    def __len__(self) -> int:
+        """Return the number of skills."""
+        return len(self._skills)
+
+
+class SkillTableView(Sequence):
+    """Read-only view of the first ``length`` skills of a ``SkillTable``."""
+
+    __slots__ = ("_skills", "_length")
+
+    def __init__(self, skills: list[Skill], length: int):
+        self._skills = skills
+        self._length = length
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self._skills[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("skill index out of range")
+        return self._skills[index]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Skill]:
+        for i in range(self._length):
+            yield self._skills[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(
+                a is b or a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SkillTableView({list(self)!r})"
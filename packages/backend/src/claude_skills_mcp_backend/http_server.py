@@ -2,6 +2,7 @@
 
 import logging
 import threading
+import time
 from typing import Any
 
 import uvicorn
@@ -11,8 +12,14 @@ from starlette.routing import Route, Mount
 from mcp.server.fastmcp import FastMCP
 from mcp.types import TextContent
 
+from .index_bundle import default_bundle_path
 from .search_engine import SkillSearchEngine
-from .skill_loader import load_skills_in_batches, load_all_skills
+from .skill_loader import (
+    load_all_skills,
+    load_skills_in_batches,
+    load_source,
+    source_key,
+)
 from .config import load_config
 from .update_checker import UpdateChecker
 from .scheduler import HourlyScheduler
@@ -38,8 +45,17 @@ class LoadingState:
         self.loaded_skills = 0
         self.is_complete = False
         self.errors: list[str] = []
+        self.started_at = time.monotonic()
+        self.first_searchable_seconds: float | None = None
         self._lock = threading.Lock()
 
+    def mark_searchable(self) -> None:
+        with self._lock:
+            if self.first_searchable_seconds is None:
+                elapsed = time.monotonic() - self.started_at
+                self.first_searchable_seconds = elapsed
+                logger.info(f"First skills searchable after {elapsed:.1f}s")
+
     def update_progress(self, loaded: int, total: int | None = None) -> None:
         with self._lock:
             self.loaded_skills = loaded
@@ -70,8 +86,10 @@ def register_mcp_tools(default_top_k: int = 3, max_content_chars: int | None = N
     
     # Import handle functions from mcp_handlers
     from .mcp_handlers import (
+        RELATED_SKILLS_DESCRIPTION,
         handle_search_skills,
         handle_read_skill_document,
+        handle_related_skills,
         handle_list_skills,
     )
     
@@ -89,11 +107,23 @@ def register_mcp_tools(default_top_k: int = 3, max_content_chars: int | None = N
     async def find_helpful_skills(
         task_description: str,
         top_k: int = default_top_k,
-        list_documents: bool = True
+        list_documents: bool = True,
+        source: str | None = None,
+        repo: str | None = None,
+        has_documents: bool | None = None,
+        tags: list[str] | None = None,
     ) -> list[TextContent]:
-        """Search for relevant skills."""
+        """Search for relevant skills, optionally filtered by metadata."""
         return await handle_search_skills(
-            {"task_description": task_description, "top_k": top_k, "list_documents": list_documents},
+            {
+                "task_description": task_description,
+                "top_k": top_k,
+                "list_documents": list_documents,
+                "source": source,
+                "repo": repo,
+                "has_documents": has_documents,
+                "tags": tags,
+            },
             search_engine,
             loading_state_global,
             default_top_k,
@@ -120,6 +150,17 @@ def register_mcp_tools(default_top_k: int = 3, max_content_chars: int | None = N
             args["document_path"] = document_path
         return await handle_read_skill_document(args, search_engine)
     
+    @mcp.tool(
+        name="related_skills",
+        title="Find skills related to a skill",
+        description=RELATED_SKILLS_DESCRIPTION,
+    )
+    async def related_skills(skill_name: str, k: int = 5) -> list[TextContent]:
+        """List the skills most similar to a skill."""
+        return await handle_related_skills(
+            {"skill_name": skill_name, "k": k}, search_engine, loading_state_global
+        )
+
     @mcp.tool(
         name="list_skills",
         title="List available skills",
@@ -139,16 +180,40 @@ async def health_check(request):
     skills_loaded = len(search_engine.skills) if search_engine else 0
     models_loaded = search_engine.model is not None if search_engine else False
 
+    loading_complete = (
+        loading_state_global.is_complete if loading_state_global else False
+    )
+
     response = {
         "status": "ok",
         "version": "1.0.6",
         "skills_loaded": skills_loaded,
         "models_loaded": models_loaded,
-        "loading_complete": loading_state_global.is_complete
-        if loading_state_global
-        else False,
+        "loading_complete": loading_complete,
     }
 
+    if search_engine:
+        readiness = search_engine.get_readiness()
+        if loading_complete:
+            index_state = "ready"
+        else:
+            index_state = "partial" if skills_loaded else "loading"
+        readiness["index"]["state"] = index_state
+        response.update(readiness)
+        # Vector searches need both a loaded model and at least one indexed
+        # skill; keyword searches only need parsed skills
+        response["searchable"] = readiness["search_mode"] == "keyword" or (
+            readiness["model"]["state"] == "ready" and bool(skills_loaded)
+        )
+        response["time_to_first_searchable_seconds"] = (
+            loading_state_global.first_searchable_seconds
+            if loading_state_global
+            else None
+        )
+        response["query_cache"] = search_engine.query_cache.get_stats()
+        if search_engine.query_batcher is not None:
+            response["query_batching"] = search_engine.query_batcher.get_stats()
+
     # Add auto-update information
     if config_global:
         response["auto_update_enabled"] = config_global.get(
@@ -208,11 +273,56 @@ async def initialize_backend(config_path: str | None = None, verbose: bool = Fal
 
     # Initialize search engine
     logger.info("Initializing search engine...")
-    search_engine = SkillSearchEngine(config["embedding_model"])
+    search_engine = SkillSearchEngine(
+        config["embedding_model"],
+        embedding_cache=config.get("embedding_cache_enabled", False),
+        query_cache_size=config.get("query_cache_size", 1024),
+        hybrid_search=config.get("hybrid_search", False),
+        rrf_k=config.get("rrf_k", 60),
+        chunk_content=config.get("chunk_content", False),
+        chunk_size=config.get("chunk_size_chars", 1000),
+        ann_backend=config.get("ann_backend", "exact"),
+        ann_n_probe=config.get("ann_n_probe", 16),
+        ann_min_skills=config.get("ann_min_skills", 2048),
+        embedding_storage=config.get("embedding_storage", "float32"),
+        rescore_depth=config.get("rescore_depth", 100),
+        vector_store=config.get("vector_store_enabled", False),
+        compaction_threshold=config.get("compaction_threshold", 0.25),
+        encoder_backend=config.get("encoder_backend", "torch"),
+        query_batch_size=config.get("query_batch_size", 1),
+        query_batch_wait_ms=config.get("query_batch_wait_ms", 2.0),
+        encoder_workers=config.get("encoder_workers", 0),
+        deduplicate=config.get("deduplicate_skills", True),
+        duplicate_threshold=config.get("duplicate_threshold", 0.95),
+        graph_k=config.get("skill_graph_k", 10),
+        search_threads=config.get("search_threads", 4),
+        degraded_search=config.get("degraded_search", True),
+    )
 
     # Initialize loading state
     loading_state_global = LoadingState()
 
+    # Restore the index saved by the previous run, so searches work while
+    # skills are fetched and re-indexed in the background
+    bundle_path = None
+    bundle_loaded = False
+    if config.get("index_bundle_enabled", False):
+        bundle_path = config.get("index_bundle_path") or default_bundle_path(
+            config["skill_sources"], search_engine.model_fingerprint
+        )
+        bundle_loaded = search_engine.load_bundle(bundle_path)
+        if bundle_loaded:
+            loading_state_global.update_progress(len(search_engine.skills))
+            loading_state_global.mark_searchable()
+
+    def save_bundle() -> None:
+        if bundle_path is not None:
+            search_engine.save_bundle(bundle_path)
+
+    # Load the model while skills are being fetched instead of on the first batch
+    if config.get("preload_model", True):
+        search_engine.warm_up()
+
     # Initialize update checker
     github_token = config.get("github_api_token")
     update_checker_global = UpdateChecker(github_token)
@@ -226,22 +336,57 @@ async def initialize_backend(config_path: str | None = None, verbose: bool = Fal
         max_content_chars=config.get("max_skill_content_chars"),
     )
 
+    # Skills parsed while the model loads, indexed once it is ready
+    pending_skills: list = []
+
     # Define batch callback for incremental loading
     def on_batch_loaded(batch_skills: list, total_loaded: int) -> None:
         logger.info(f"Batch loaded: {len(batch_skills)} skills (total: {total_loaded})")
-        search_engine.add_skills(batch_skills)
+        pending_skills.extend(batch_skills)
+        if search_engine.degraded_search:
+            # Keyword-searchable right away; encoding would wait for the model
+            search_engine.stage_skills(batch_skills)
+        if search_engine.model_state == "ready" or not search_engine.degraded_search:
+            search_engine.add_skills(pending_skills.copy())
+            pending_skills.clear()
         loading_state_global.update_progress(total_loaded)
+        if batch_skills:
+            loading_state_global.mark_searchable()
 
     # Start background thread to load skills
     def background_loader() -> None:
         try:
             logger.info("Starting background skill loading...")
-            load_skills_in_batches(
-                skill_sources=config["skill_sources"],
-                config=config,
-                batch_callback=on_batch_loaded,
-                batch_size=config.get("batch_size", 10),
-            )
+            if bundle_loaded:
+                # Refresh the restored index, encoding only changed skills
+                skills = load_all_skills(
+                    skill_sources=config["skill_sources"], config=config
+                )
+                if skills:
+                    stats = search_engine.sync_skills(skills)
+                    logger.info(
+                        f"Refreshed restored index: {stats['added']} added, "
+                        f"{stats['modified']} modified, {stats['removed']} removed"
+                    )
+                else:
+                    logger.warning("No skills loaded, keeping the restored index")
+                loading_state_global.update_progress(
+                    len(search_engine.skills), len(search_engine.skills)
+                )
+            else:
+                load_skills_in_batches(
+                    skill_sources=config["skill_sources"],
+                    config=config,
+                    batch_callback=on_batch_loaded,
+                    batch_size=config.get("batch_size", 10),
+                )
+                # Waits for the model if it is still loading
+                search_engine.add_skills(pending_skills.copy())
+                pending_skills.clear()
+                search_engine.discard_staged()
+            # Swap the incrementally built matrices for the shared mapped copy
+            search_engine.persist()
+            save_bundle()
             loading_state_global.mark_complete()
             logger.info("Background skill loading complete")
         except Exception as e:
@@ -284,16 +429,24 @@ async def initialize_backend(config_path: str | None = None, verbose: bool = Fal
                         f"Reloading {len(result.changed_sources)} changed sources..."
                     )
 
-                    # For simplicity, reload all skills if any changed
-                    # This clears the index and reloads everything
-                    logger.info("Reloading all skills...")
-                    new_skills = load_all_skills(
-                        skill_sources=config["skill_sources"], config=config
-                    )
-
-                    # Re-index all skills
-                    search_engine.index_skills(new_skills)
-                    logger.info(f"Re-indexed {len(new_skills)} skills after update")
+                    # Only the shards of changed sources are reloaded, and
+                    # only their changed skills are encoded
+                    for source_config in result.changed_sources:
+                        shard = source_key(source_config)
+                        new_skills = load_source(source_config, config)
+                        if not new_skills:
+                            logger.warning(
+                                f"No skills loaded from {shard}, keeping its shard"
+                            )
+                            continue
+                        stats = search_engine.sync_shard(shard, new_skills)
+                        logger.info(
+                            f"Re-indexed {len(new_skills)} skills of {shard} "
+                            f"after update ({stats['added']} added, "
+                            f"{stats['modified']} modified, "
+                            f"{stats['removed']} removed)"
+                        )
+                    save_bundle()
                 else:
                     logger.info("No updates detected")
 
@@ -0,0 +1,168 @@
+"""Single-file index bundles for restoring the search index at startup."""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_MAGIC = b"CSKBNDL\x00"
+BUNDLE_FORMAT_VERSION = 1
+
+# Magic, format version, reserved, header length
+_PREAMBLE = struct.Struct("<8sIIQ")
+# Arrays start on cache-line boundaries, so mapped rows are aligned for SIMD
+_ALIGNMENT = 64
+
+
+def _get_bundle_dir() -> Path:
+    """Get index bundle directory.
+
+    Returns
+    -------
+    Path
+        Path to index bundle directory.
+    """
+    bundle_dir = Path(tempfile.gettempdir()) / "claude_skills_mcp_cache" / "bundles"
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    return bundle_dir
+
+
+def default_bundle_path(
+    skill_sources: list[dict[str, Any]], model_fingerprint: str
+) -> Path:
+    """Get the bundle path for a configuration.
+
+    Parameters
+    ----------
+    skill_sources : list[dict[str, Any]]
+        Configured skill sources.
+    model_fingerprint : str
+        Identifier of the embedding model.
+
+    Returns
+    -------
+    Path
+        Path in the shared temp cache, named after a hash of the sources and
+        the model, so different configurations never load each other's index.
+    """
+    key = json.dumps([skill_sources, model_fingerprint], sort_keys=True)
+    hash_key = hashlib.md5(key.encode()).hexdigest()
+    return _get_bundle_dir() / f"{hash_key}.bundle"
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_bundle(
+    path: str | Path, header: dict[str, Any], arrays: dict[str, np.ndarray]
+) -> None:
+    """Write a bundle atomically.
+
+    The file holds a fixed preamble (magic, format version, header length),
+    a JSON header and the raw arrays, each aligned to 64 bytes. It is
+    written to a temporary file and renamed into place, so a reader never
+    sees a partially written bundle and processes still mapping the
+    previous one keep reading it.
+
+    Parameters
+    ----------
+    path : str | Path
+        Destination file.
+    header : dict[str, Any]
+        JSON-serializable metadata; the array layout is added to it.
+    arrays : dict[str, np.ndarray]
+        Arrays to store by name.
+    """
+    path = Path(path)
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {
+            "dtype": np.dtype(array.dtype).str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset = _align(offset + array.nbytes)
+    header_bytes = json.dumps(
+        {**header, "format_version": BUNDLE_FORMAT_VERSION, "arrays": layout}
+    ).encode("utf-8")
+    preamble = _PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, 0, len(header_bytes))
+    data_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(preamble)
+            f.write(header_bytes)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(np.ascontiguousarray(array).tobytes())
+            # Pad to the full length, in case the last array is empty
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def read_bundle(path: str | Path) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """Read a bundle, mapping its arrays read-only.
+
+    Parameters
+    ----------
+    path : str | Path
+        Bundle file.
+
+    Returns
+    -------
+    tuple[dict[str, Any], dict[str, np.ndarray]]
+        The JSON header and the arrays by name, as read-only ``np.memmap``
+        views of the file (nothing is copied until a page is touched).
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    ValueError
+        If the file is not a bundle, has an unsupported format version or
+        is truncated.
+    """
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"Not an index bundle: {path}")
+        magic, version, _, header_length = _PREAMBLE.unpack(preamble)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"Not an index bundle: {path}")
+        if version != BUNDLE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported index bundle format version {version} "
+                f"(expected {BUNDLE_FORMAT_VERSION})"
+            )
+        header_bytes = f.read(header_length)
+    if len(header_bytes) < header_length:
+        raise ValueError(f"Truncated index bundle: {path}")
+    header = json.loads(header_bytes)
+
+    data_start = _align(_PREAMBLE.size + header_length)
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        start = data_start + spec["offset"]
+        end = start + dtype.itemsize * int(np.prod(shape))
+        if end > len(buffer):
+            raise ValueError(f"Truncated index bundle: {path}")
+        arrays[name] = buffer[start:end].view(dtype).reshape(shape)
+    return header, arrays
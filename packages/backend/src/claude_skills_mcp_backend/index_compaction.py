@@ -0,0 +1,64 @@
+"""Helpers for rewriting the index without its tombstoned rows."""
+
+import numpy as np
+
+from .index_snapshot import IndexSnapshot
+from .skill_graph import SkillGraph
+
+
+def needs_compaction(snapshot: IndexSnapshot, threshold: float | None) -> bool:
+    """Whether enough rows of a snapshot are tombstoned to compact it.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot to check.
+    threshold : float | None
+        Fraction of dead rows above which the index is compacted, or None
+        to never compact.
+
+    Returns
+    -------
+    bool
+        True if the dead rows exceed ``threshold`` of all rows.
+    """
+    if threshold is None:
+        return False
+    return snapshot.num_dead > threshold * len(snapshot.skills)
+
+
+def graph_usable(snapshot: IndexSnapshot, graph_k: int) -> bool:
+    """Whether a snapshot's similarity graph can be updated, not rebuilt."""
+    return (
+        graph_k > 0
+        and snapshot.graph is not None
+        and snapshot.graph.k == graph_k
+        and snapshot.graph.num_rows == len(snapshot.skills)
+    )
+
+
+def live_graph(
+    snapshot: IndexSnapshot, embeddings: np.ndarray | None, graph_k: int
+) -> SkillGraph | None:
+    """Carry a snapshot's graph over to its live rows (see ``live_arrays``).
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot to read.
+    embeddings : np.ndarray | None
+        Embeddings of its live rows.
+    graph_k : int
+        Neighbours per skill the graph must keep.
+
+    Returns
+    -------
+    SkillGraph | None
+        Graph over the live rows, or None if the snapshot has no usable
+        graph.
+    """
+    if embeddings is None or not graph_usable(snapshot, graph_k):
+        return None
+    if snapshot.num_dead == 0:
+        return snapshot.graph
+    return snapshot.graph.remap(np.flatnonzero(~snapshot.tombstones), embeddings)
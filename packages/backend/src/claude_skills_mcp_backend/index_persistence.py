@@ -0,0 +1,342 @@
+"""Saving index matrices to disk and restoring indexes from bundles."""
+
+import logging
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .embedding_cache import hash_text
+from .index_bundle import read_bundle, write_bundle
+from .index_compaction import live_graph
+from .index_snapshot import IndexSnapshot, live_arrays
+from .lexical_index import BM25Index
+from .quantization import file_backed
+from .skill_graph import SkillGraph
+from .skill_loader import Skill
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+def content_keys(skills: Sequence[Skill]) -> list[str]:
+    """Hash skill contents (chunks are a deterministic function of them)."""
+    return [hash_text(skill.content or "") for skill in skills]
+
+
+def stored_versions(snapshot: IndexSnapshot) -> set[str]:
+    """Get the vector store versions a snapshot maps."""
+    versions = set()
+    for matrix in (snapshot.embeddings, snapshot.chunk_embeddings):
+        if isinstance(matrix, np.memmap) and matrix.filename:
+            versions.add(Path(matrix.filename).stem)
+    return versions
+
+
+def full_precision(
+    matrix: np.ndarray | None, embedding_storage: str
+) -> np.ndarray | None:
+    """Move a full-precision matrix off the heap in quantized storage modes."""
+    if (
+        matrix is None
+        or embedding_storage == "float32"
+        or isinstance(matrix, np.memmap)
+    ):
+        return matrix
+    return file_backed(matrix)
+
+
+def load_or_store(
+    vector_store: VectorStore | None,
+    kind: str,
+    keys: list[str],
+    compute: Callable[[], np.ndarray],
+    keep: set[str],
+) -> np.ndarray:
+    """Get a matrix from the shared vector store, computing it on a miss.
+
+    Parameters
+    ----------
+    vector_store : VectorStore | None
+        Host-wide store, or None when it is disabled.
+    kind : str
+        What the matrix holds, see ``VectorStore.version_key``.
+    keys : list[str]
+        Hashes of the texts behind the rows.
+    compute : Callable[[], np.ndarray]
+        Computes the normalized matrix if it is not stored yet.
+    keep : set[str]
+        Stored versions still mapped by the index, kept when pruning.
+
+    Returns
+    -------
+    np.ndarray
+        Memory-mapped stored matrix, or the computed matrix when the
+        vector store is disabled.
+    """
+    if vector_store is None:
+        return compute()
+
+    version = vector_store.version_key(kind, keys)
+    stored = vector_store.open(version)
+    if stored is not None:
+        logger.info(f"Using {len(stored)} stored {kind} vectors (no encoding)")
+        return stored
+    return vector_store.save(version, compute(), keep=keep)
+
+
+def persisted_matrices(
+    snapshot: IndexSnapshot,
+    vector_store: VectorStore | None,
+    embedding_storage: str,
+    chunk_size: int,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """Store the matrices of a snapshot and get the copies to search.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot with description embeddings.
+    vector_store : VectorStore | None
+        Host-wide store to save the matrices to, if enabled.
+    embedding_storage : str
+        Storage mode; quantized modes keep full-precision rows in a
+        memory-mapped file.
+    chunk_size : int
+        Characters per content chunk, part of the stored chunk version.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray | None]
+        Description and chunk embeddings, memory-mapped where the vector
+        store or the storage mode moves them off the heap.
+    """
+    keep = stored_versions(snapshot)
+    embeddings = full_precision(
+        load_or_store(
+            vector_store,
+            "descriptions",
+            [hash_text(skill.description) for skill in snapshot.skills],
+            lambda: snapshot.embeddings,
+            keep,
+        ),
+        embedding_storage,
+    )
+    chunk_embeddings = snapshot.chunk_embeddings
+    if chunk_embeddings is not None and len(chunk_embeddings):
+        chunk_embeddings = full_precision(
+            load_or_store(
+                vector_store,
+                f"chunks:{chunk_size}",
+                content_keys(snapshot.skills),
+                lambda: snapshot.chunk_embeddings,
+                keep,
+            ),
+            embedding_storage,
+        )
+    return embeddings, chunk_embeddings
+
+
+def save_index_bundle(
+    path: str | Path,
+    snapshot: IndexSnapshot,
+    *,
+    model_fingerprint: str,
+    chunk_size: int,
+    hybrid_search: bool,
+    graph_k: int,
+) -> bool:
+    """Save the live rows of a snapshot to a single-file bundle.
+
+    Parameters
+    ----------
+    path : str | Path
+        Bundle file, replaced atomically.
+    snapshot : IndexSnapshot
+        Snapshot to save.
+    model_fingerprint : str
+        Embedding space of the snapshot's vectors.
+    chunk_size : int
+        Characters per content chunk, recorded if the snapshot has chunks.
+    hybrid_search : bool
+        Save a BM25 index even if the snapshot has to rebuild it.
+    graph_k : int
+        Neighbours per skill of a usable similarity graph.
+
+    Returns
+    -------
+    bool
+        True if the bundle was written; False if the snapshot has no live
+        skills or the file could not be written.
+    """
+    skills, embeddings, chunk_embeddings, chunk_offsets = live_arrays(snapshot)
+    if embeddings is None or not skills:
+        return False
+
+    header: dict[str, Any] = {
+        "model_fingerprint": model_fingerprint,
+        "created_at": time.time(),
+        "skills": [skill.to_dict() for skill in skills],
+        "duplicates": {
+            source: [skill.to_dict() for skill in copies]
+            for source, copies in snapshot.duplicates.items()
+        },
+        "chunk_size": None,
+    }
+    arrays = {"embeddings": embeddings}
+    if chunk_offsets is not None:
+        header["chunk_size"] = chunk_size
+        arrays["chunk_embeddings"] = chunk_embeddings
+        arrays["chunk_offsets"] = chunk_offsets
+
+    graph = live_graph(snapshot, embeddings, graph_k)
+    if graph is not None:
+        arrays["graph_neighbors"] = graph.neighbors
+        arrays["graph_similarities"] = graph.similarities
+
+    lexical = snapshot.lexical if snapshot.num_dead == 0 else None
+    if lexical is None and hybrid_search:
+        lexical = BM25Index()
+        lexical.add_skills(skills)
+    if lexical is not None:
+        terms, lexical_arrays = lexical.to_arrays(len(skills))
+        header["lexical"] = {"terms": terms, "k1": lexical.k1, "b": lexical.b}
+        arrays.update(
+            {f"lexical_{name}": array for name, array in lexical_arrays.items()}
+        )
+
+    try:
+        write_bundle(path, header, arrays)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Failed to save index bundle {path}: {e}")
+        return False
+    logger.info(f"Saved index bundle with {len(skills)} skills to {path}")
+    return True
+
+
+class RestoredIndex(NamedTuple):
+    """Contents of an index bundle, ready to be indexed.
+
+    Attributes
+    ----------
+    skills : list[Skill]
+        Live skills, one per embedding row.
+    duplicates : dict[str, tuple[Skill, ...]]
+        Collapsed duplicates by the source of their canonical skill.
+    embeddings : np.ndarray
+        Normalized description embeddings, mapped from the bundle.
+    chunk_embeddings : np.ndarray | None
+        Normalized chunk embeddings, or None without content chunking.
+    chunk_offsets : np.ndarray | None
+        Chunk offsets of the skills, or None without content chunking.
+    lexical : BM25Index | None
+        Restored BM25 index, if hybrid search is enabled and it was saved.
+    graph : SkillGraph | None
+        Restored similarity graph, if one was saved.
+    """
+
+    skills: list[Skill]
+    duplicates: dict[str, tuple[Skill, ...]]
+    embeddings: np.ndarray
+    chunk_embeddings: np.ndarray | None
+    chunk_offsets: np.ndarray | None
+    lexical: BM25Index | None
+    graph: SkillGraph | None
+
+
+def load_index_bundle(
+    path: str | Path,
+    *,
+    model_fingerprint: str,
+    chunk_size: int | None,
+    hybrid_search: bool,
+) -> RestoredIndex | None:
+    """Read and validate a bundle written by ``save_index_bundle``.
+
+    Parameters
+    ----------
+    path : str | Path
+        Bundle file.
+    model_fingerprint : str
+        Embedding space the bundle must have been built in.
+    chunk_size : int | None
+        Characters per content chunk the bundle must use, or None when
+        content chunking is disabled (its chunks are then ignored).
+    hybrid_search : bool
+        Restore the BM25 index of the bundle.
+
+    Returns
+    -------
+    RestoredIndex | None
+        Contents of the bundle; None if it is missing, invalid, or was
+        built with another model or chunking configuration.
+    """
+    try:
+        header, arrays = read_bundle(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring index bundle {path}: {e}")
+        return None
+
+    if header.get("model_fingerprint") != model_fingerprint:
+        logger.info(
+            f"Ignoring index bundle {path}: built with model "
+            f"{header.get('model_fingerprint')!r}"
+        )
+        return None
+    chunk_embeddings = chunk_offsets = None
+    if chunk_size is not None:
+        if header.get("chunk_size") != chunk_size:
+            logger.info(
+                f"Ignoring index bundle {path}: content chunks of "
+                f"{header.get('chunk_size')} characters "
+                f"(expected {chunk_size})"
+            )
+            return None
+        chunk_embeddings = arrays["chunk_embeddings"]
+        chunk_offsets = arrays["chunk_offsets"]
+
+    try:
+        skills = [Skill.from_dict(data) for data in header["skills"]]
+        duplicates = {
+            source: tuple(Skill.from_dict(data) for data in copies)
+            for source, copies in header["duplicates"].items()
+        }
+        embeddings = arrays["embeddings"]
+        if len(embeddings) != len(skills):
+            raise ValueError(f"{len(embeddings)} embeddings for {len(skills)} skills")
+        lexical = None
+        if hybrid_search and "lexical" in header:
+            lexical = BM25Index.from_arrays(
+                header["lexical"]["terms"],
+                {
+                    name: arrays[f"lexical_{name}"]
+                    for name in ("offsets", "doc_ids", "tfs", "doc_lengths")
+                },
+                k1=header["lexical"]["k1"],
+                b=header["lexical"]["b"],
+            )
+        graph = None
+        if "graph_neighbors" in arrays:
+            graph = SkillGraph(arrays["graph_neighbors"], arrays["graph_similarities"])
+            if graph.num_rows != len(skills):
+                raise ValueError(
+                    f"Similarity graph of {graph.num_rows} rows "
+                    f"for {len(skills)} skills"
+                )
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Ignoring invalid index bundle {path}: {e}")
+        return None
+
+    return RestoredIndex(
+        skills,
+        duplicates,
+        embeddings,
+        chunk_embeddings,
+        chunk_offsets,
+        lexical,
+        graph,
+    )
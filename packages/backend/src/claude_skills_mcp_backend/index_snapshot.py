@@ -0,0 +1,377 @@
+"""Immutable index snapshots and the helpers that append to and compact them."""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field, replace
+from typing import NamedTuple
+
+import numpy as np
+
+from .ann_index import IVFFlatIndex
+from .growable import GrowableArray, SkillTable
+from .lexical_index import BM25Index
+from .metadata_index import MetadataIndex
+from .name_index import NameIndex
+from .quantization import QuantizedMatrix
+from .skill_graph import SkillGraph
+from .skill_loader import Skill
+
+
+@dataclass(frozen=True)
+class IndexSnapshot:
+    """Immutable view of the search index.
+
+    Writers build a new snapshot off to the side and publish it by swapping a
+    single reference, so readers never wait on (or observe) a partial update.
+
+    Attributes
+    ----------
+    skills : Sequence[Skill]
+        Indexed skills, one per row of ``embeddings`` (a list or a view of
+        an append-only ``SkillTable``). Must not be mutated.
+    embeddings : np.ndarray | None
+        Read-only normalized embeddings matrix, or None when empty.
+    version : int
+        Monotonically increasing version number of the index.
+    lexical : BM25Index | None
+        Append-only BM25 index whose first ``len(skills)`` documents belong
+        to this snapshot, or None when hybrid search is disabled.
+    chunk_embeddings : np.ndarray | None
+        Read-only normalized embeddings of skill content chunks, or None when
+        content chunking is disabled.
+    chunk_offsets : np.ndarray | None
+        Int64 array of ``len(skills) + 1`` offsets; the chunks of skill ``i``
+        are rows ``chunk_offsets[i]:chunk_offsets[i + 1]`` of
+        ``chunk_embeddings``.
+    ann : IVFFlatIndex | None
+        Append-only approximate nearest-neighbour index over ``embeddings``
+        (first ``len(skills)`` rows), or None for exact search.
+    quantized : QuantizedMatrix | None
+        Compact copy of ``embeddings`` scanned first when a quantized
+        storage mode is used (``embeddings`` is then file-backed and only
+        read to rescore a shortlist).
+    quantized_chunks : QuantizedMatrix | None
+        Compact copy of ``chunk_embeddings``, likewise.
+    tombstones : np.ndarray | None
+        Read-only boolean bitmap over the rows of ``skills``; True marks a
+        removed (or replaced) skill that searches skip. None when no row
+        is dead.
+    num_dead : int
+        Number of True entries in ``tombstones``.
+    metadata : MetadataIndex | None
+        Append-only filter masks whose first ``len(skills)`` rows belong to
+        this snapshot, or None when empty.
+    names : NameIndex | None
+        Append-only name lookup whose first ``len(skills)`` rows belong to
+        this snapshot, or None when empty.
+    duplicates : Mapping[str, tuple[Skill, ...]]
+        Skills collapsed into a live skill, keyed by the source of that
+        canonical skill. Must not be mutated.
+    graph : SkillGraph | None
+        Nearest neighbours of every row among all rows (tombstoned ones
+        included), or None when empty or disabled.
+    """
+
+    skills: Sequence[Skill] = field(default_factory=list)
+    embeddings: np.ndarray | None = None
+    version: int = 0
+    lexical: BM25Index | None = None
+    chunk_embeddings: np.ndarray | None = None
+    chunk_offsets: np.ndarray | None = None
+    ann: IVFFlatIndex | None = None
+    quantized: QuantizedMatrix | None = None
+    quantized_chunks: QuantizedMatrix | None = None
+    tombstones: np.ndarray | None = None
+    num_dead: int = 0
+    metadata: MetadataIndex | None = None
+    names: NameIndex | None = None
+    duplicates: Mapping[str, tuple[Skill, ...]] = field(default_factory=dict)
+    graph: SkillGraph | None = None
+
+    @property
+    def num_live(self) -> int:
+        """Number of skills that are not tombstoned."""
+        return len(self.skills) - self.num_dead
+
+
+class EncodedSkills(NamedTuple):
+    """Everything computed off-lock for skills about to be appended.
+
+    Attributes
+    ----------
+    embeddings : np.ndarray
+        Normalized description embeddings, one row per skill.
+    chunk_embeddings : np.ndarray | None
+        Normalized content chunk embeddings, if chunking is enabled.
+    chunk_offsets : np.ndarray | None
+        Chunk offsets per skill (relative to the first skill), if chunking
+        is enabled.
+    quantized : QuantizedMatrix | None
+        Quantized copy of ``embeddings`` in quantized storage modes.
+    quantized_chunks : QuantizedMatrix | None
+        Quantized copy of ``chunk_embeddings``, likewise.
+    documents : list
+        BM25 term counts of each skill (see ``tokenize_skill``).
+    """
+
+    embeddings: np.ndarray
+    chunk_embeddings: np.ndarray | None
+    chunk_offsets: np.ndarray | None
+    quantized: QuantizedMatrix | None
+    quantized_chunks: QuantizedMatrix | None
+    documents: list
+
+
+def live_rows(snapshot: IndexSnapshot) -> dict[str, int]:
+    """Map the source of each live skill of a snapshot to its row.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot to read.
+
+    Returns
+    -------
+    dict[str, int]
+        First live row per source.
+    """
+    rows: dict[str, int] = {}
+    for i, skill in enumerate(snapshot.skills):
+        if snapshot.tombstones is None or not snapshot.tombstones[i]:
+            rows.setdefault(skill.source, i)
+    return rows
+
+
+def tombstone(
+    snapshot: IndexSnapshot, rows: list[int], num_appended: int = 0
+) -> np.ndarray:
+    """Copy a snapshot's tombstone bitmap with more rows marked dead.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot whose bitmap is copied (it is never modified in place, as
+        readers may be using it).
+    rows : list[int]
+        Rows to mark dead.
+    num_appended : int, optional
+        Live rows appended after the snapshot's rows, by default 0.
+
+    Returns
+    -------
+    np.ndarray
+        New bitmap of ``len(snapshot.skills) + num_appended`` entries.
+    """
+    num_rows = len(snapshot.skills)
+    tombstones = np.zeros(num_rows + num_appended, dtype=bool)
+    if snapshot.tombstones is not None:
+        tombstones[:num_rows] = snapshot.tombstones
+    tombstones[rows] = True
+    tombstones.flags.writeable = False
+    return tombstones
+
+
+def mask_sources(snapshot: IndexSnapshot, sources: set[str]) -> IndexSnapshot:
+    """View a snapshot with the live rows of some sources tombstoned.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot to mask (not modified).
+    sources : set[str]
+        Sources whose live rows are hidden, e.g. because they are being
+        replaced.
+
+    Returns
+    -------
+    IndexSnapshot
+        ``snapshot`` itself if no live row has one of ``sources``.
+    """
+    rows = [row for source, row in live_rows(snapshot).items() if source in sources]
+    if not rows:
+        return snapshot
+    return replace(
+        snapshot,
+        tombstones=tombstone(snapshot, rows),
+        num_dead=snapshot.num_dead + len(rows),
+    )
+
+
+def live_arrays(
+    snapshot: IndexSnapshot,
+) -> tuple[list[Skill], np.ndarray | None, np.ndarray | None, np.ndarray | None]:
+    """Gather the live rows of a snapshot (nothing is re-encoded).
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot to read.
+
+    Returns
+    -------
+    tuple[list[Skill], np.ndarray | None, np.ndarray | None, np.ndarray | None]
+        Live skills, their description embeddings, chunk embeddings and
+        chunk offsets. Arrays are the snapshot's own when no row is dead.
+    """
+    if snapshot.num_dead == 0:
+        return (
+            list(snapshot.skills),
+            snapshot.embeddings,
+            snapshot.chunk_embeddings,
+            snapshot.chunk_offsets,
+        )
+
+    live = np.flatnonzero(~snapshot.tombstones)
+    skills = [snapshot.skills[i] for i in live]
+    if not skills:
+        return skills, None, None, None
+    chunk_embeddings = chunk_offsets = None
+    if snapshot.chunk_offsets is not None:
+        old_offsets = snapshot.chunk_offsets
+        counts = np.diff(old_offsets)[live]
+        chunk_offsets = np.concatenate([[0], np.cumsum(counts)])
+        # Old row of each kept chunk: its skill's old start plus its
+        # position within the skill
+        chunk_rows = np.repeat(
+            old_offsets[live] - chunk_offsets[:-1], counts
+        ) + np.arange(chunk_offsets[-1])
+        chunk_embeddings = np.ascontiguousarray(snapshot.chunk_embeddings[chunk_rows])
+    embeddings = np.ascontiguousarray(snapshot.embeddings[live])
+    return skills, embeddings, chunk_embeddings, chunk_offsets
+
+
+def allowed_rows(
+    snapshot: IndexSnapshot, keys: list[tuple[str, str]]
+) -> tuple[np.ndarray | None, int]:
+    """Combine the filter masks and the tombstones of a snapshot.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot being searched.
+    keys : list[tuple[str, str]]
+        Metadata keys that returned skills must all match.
+
+    Returns
+    -------
+    tuple[np.ndarray | None, int]
+        Bool mask of the live rows matching every key (None when every
+        row may be returned) and its number of True entries.
+    """
+    if not keys:
+        if snapshot.tombstones is None:
+            return None, snapshot.num_live
+        return ~snapshot.tombstones, snapshot.num_live
+
+    allowed = snapshot.metadata.select(keys, len(snapshot.skills))
+    if snapshot.tombstones is not None:
+        allowed &= ~snapshot.tombstones
+    return allowed, int(np.count_nonzero(allowed))
+
+
+class SnapshotBuffers:
+    """Capacity-doubling buffers that successive appended snapshots share.
+
+    Each snapshot field that grows with the index (skills, embeddings,
+    chunk offsets, quantized codes) has one buffer. An append extends the
+    buffer when the current snapshot is its latest view, so consecutive
+    ``add_skills`` calls cost O(batch) amortized; otherwise (first add, or
+    after a full re-index or compaction) the buffer is seeded once from the
+    snapshot's array. Callers must serialize appends.
+
+    Attributes
+    ----------
+    skill_table : SkillTable | None
+        Buffer of the skill list.
+    arrays : dict[str, GrowableArray]
+        Buffer per array field name.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without buffers."""
+        self.skill_table: SkillTable | None = None
+        self.arrays: dict[str, GrowableArray] = {}
+
+    def append_skills(
+        self, current: Sequence[Skill], skills: list[Skill]
+    ) -> Sequence[Skill]:
+        """Append skills to the shared skill table.
+
+        Parameters
+        ----------
+        current : Sequence[Skill]
+            Skills of the current snapshot.
+        skills : list[Skill]
+            Skills to append.
+
+        Returns
+        -------
+        Sequence[Skill]
+            View of ``current`` followed by ``skills``.
+        """
+        table = self.skill_table
+        if table is None or table.last_view is not current:
+            # The current snapshot was not built by appending to this table
+            # (first add, or after index_skills): start a new one
+            table = self.skill_table = SkillTable(current)
+        return table.append(skills)
+
+    def append_rows(
+        self, name: str, current: np.ndarray | None, rows: np.ndarray
+    ) -> np.ndarray:
+        """Append rows to a shared growable buffer.
+
+        Parameters
+        ----------
+        name : str
+            Buffer name (one per snapshot field).
+        current : np.ndarray | None
+            The field's array in the current snapshot.
+        rows : np.ndarray
+            Rows to append.
+
+        Returns
+        -------
+        np.ndarray
+            View of ``current`` followed by ``rows``.
+        """
+        buffer = self.arrays.get(name)
+        if current is None:
+            buffer = GrowableArray(rows.shape[1:], rows.dtype)
+        elif buffer is None or buffer.last_view is not current:
+            buffer = GrowableArray.from_array(current)
+        self.arrays[name] = buffer
+        return buffer.append(rows)
+
+    def append_quantized(
+        self,
+        name: str,
+        current: QuantizedMatrix | None,
+        new: QuantizedMatrix | None,
+    ) -> QuantizedMatrix | None:
+        """Append quantized rows to shared growable buffers.
+
+        Parameters
+        ----------
+        name : str
+            Field name; codes and scales get one buffer each.
+        current : QuantizedMatrix | None
+            The field's matrix in the current snapshot.
+        new : QuantizedMatrix | None
+            Rows to append, or None outside quantized storage modes.
+
+        Returns
+        -------
+        QuantizedMatrix | None
+            View of ``current`` followed by ``new``, or None if ``new`` is.
+        """
+        if new is None:
+            return None
+        codes = self.append_rows(
+            f"{name}_codes", current.codes if current else None, new.codes
+        )
+        scales = None
+        if new.scales is not None:
+            scales = self.append_rows(
+                f"{name}_scales", current.scales if current else None, new.scales
+            )
+        return QuantizedMatrix(new.mode, codes, scales)
@@ -0,0 +1,306 @@
+"""Plans for reconciling the index with freshly loaded skills."""
+
+import copy
+from dataclasses import dataclass
+
+import numpy as np
+
+from .embedding_cache import hash_text
+from .index_snapshot import IndexSnapshot, live_rows
+from .skill_loader import Skill
+
+
+def skill_fingerprint(skill: Skill) -> str:
+    """Hash everything about a skill that affects its index entries.
+
+    Parameters
+    ----------
+    skill : Skill
+        Skill to hash.
+
+    Returns
+    -------
+    str
+        Hash of the name, description, content and filter metadata.
+    """
+    return hash_text(
+        "\0".join(
+            (
+                skill.name,
+                skill.description,
+                skill.content or "",
+                # Filter metadata
+                ",".join(skill.tags),
+                "documents" if skill.documents else "",
+            )
+        )
+    )
+
+
+@dataclass(frozen=True)
+class SyncPlan:
+    """How a freshly loaded skill list maps onto the rows of a snapshot.
+
+    Attributes
+    ----------
+    reuse : np.ndarray
+        Int64 row of the snapshot whose entries each new skill reuses, or
+        -1 for an added or modified skill that must be encoded.
+    stats : dict[str, int]
+        Counts of "added", "modified", "removed" and "unchanged" skills.
+    """
+
+    reuse: np.ndarray
+    stats: dict[str, int]
+
+    @property
+    def kept(self) -> np.ndarray:
+        """Positions of the new skills that reuse a row."""
+        return np.flatnonzero(self.reuse >= 0)
+
+    @property
+    def changed(self) -> np.ndarray:
+        """Positions of the new skills that must be encoded."""
+        return np.flatnonzero(self.reuse < 0)
+
+    def is_identity(self, snapshot: IndexSnapshot) -> bool:
+        """Whether every row of ``snapshot`` is kept in place."""
+        return (
+            snapshot.num_dead == 0
+            and len(self.reuse) == len(snapshot.skills)
+            and np.array_equal(self.reuse, np.arange(len(self.reuse)))
+        )
+
+    def select(self, keep: np.ndarray) -> "SyncPlan":
+        """Restrict the plan to some of the new skills (stats are kept).
+
+        Parameters
+        ----------
+        keep : np.ndarray
+            Positions of the new skills that stay, ascending.
+
+        Returns
+        -------
+        SyncPlan
+            Plan for the selected skills.
+        """
+        return SyncPlan(self.reuse[keep], self.stats)
+
+    def gather(self, old: np.ndarray, new: np.ndarray | None) -> np.ndarray:
+        """Build a per-skill matrix from reused rows and newly encoded ones.
+
+        Parameters
+        ----------
+        old : np.ndarray
+            Matrix of the snapshot, one row per indexed skill.
+        new : np.ndarray | None
+            Rows of the changed skills, in order (None if none changed).
+
+        Returns
+        -------
+        np.ndarray
+            Float32 matrix with one row per new skill.
+        """
+        matrix = np.empty((len(self.reuse), old.shape[1]), dtype=np.float32)
+        kept = self.kept
+        matrix[kept] = old[self.reuse[kept]]
+        if new is not None:
+            matrix[self.changed] = new
+        return matrix
+
+    def chunk_offsets(
+        self, old_offsets: np.ndarray, new_offsets: np.ndarray
+    ) -> np.ndarray:
+        """Compute the chunk offsets of the new skills.
+
+        Parameters
+        ----------
+        old_offsets : np.ndarray
+            Chunk offsets of the snapshot.
+        new_offsets : np.ndarray
+            Chunk offsets of the changed skills (relative to the first).
+
+        Returns
+        -------
+        np.ndarray
+            Int64 offsets of ``len(reuse) + 1`` entries.
+        """
+        kept, changed = self.kept, self.changed
+        counts = np.empty(len(self.reuse), dtype=np.int64)
+        counts[kept] = np.diff(old_offsets)[self.reuse[kept]]
+        counts[changed] = np.diff(new_offsets)
+        return np.concatenate([[0], np.cumsum(counts)])
+
+    def gather_chunks(
+        self,
+        old: np.ndarray,
+        old_offsets: np.ndarray,
+        new: np.ndarray | None,
+        new_offsets: np.ndarray,
+        offsets: np.ndarray,
+    ) -> np.ndarray:
+        """Build the chunk matrix of the new skills from reused and new chunks.
+
+        Parameters
+        ----------
+        old : np.ndarray
+            Chunk embeddings of the snapshot.
+        old_offsets : np.ndarray
+            Chunk offsets of the snapshot.
+        new : np.ndarray | None
+            Chunk embeddings of the changed skills (None if none changed).
+        new_offsets : np.ndarray
+            Chunk offsets of the changed skills (relative to the first).
+        offsets : np.ndarray
+            Chunk offsets of the new skills, see ``chunk_offsets``.
+
+        Returns
+        -------
+        np.ndarray
+            Float32 chunk matrix of the new skills.
+        """
+        matrix = np.empty((offsets[-1], old.shape[1]), dtype=np.float32)
+        for j in self.kept:
+            i = self.reuse[j]
+            matrix[offsets[j] : offsets[j + 1]] = old[
+                old_offsets[i] : old_offsets[i + 1]
+            ]
+        for k, j in enumerate(self.changed):
+            matrix[offsets[j] : offsets[j + 1]] = new[
+                new_offsets[k] : new_offsets[k + 1]
+            ]
+        return matrix
+
+
+def plan_sync(snapshot: IndexSnapshot, skills: list[Skill]) -> SyncPlan:
+    """Match a freshly loaded skill list to the live skills of a snapshot.
+
+    Skills are matched by identity (``source``) and reused when their
+    fingerprint (see ``skill_fingerprint``) is unchanged.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Currently indexed snapshot.
+    skills : list[Skill]
+        The complete new set of skills, deduplicated.
+
+    Returns
+    -------
+    SyncPlan
+        Rows to reuse and the sync counts.
+    """
+    old_rows = live_rows(snapshot)
+    reuse = np.full(len(skills), -1, dtype=np.int64)
+    added = 0
+    for j, skill in enumerate(skills):
+        i = old_rows.get(skill.source)
+        if i is None:
+            added += 1
+            continue
+        if skill_fingerprint(snapshot.skills[i]) == skill_fingerprint(skill):
+            reuse[j] = i
+
+    num_kept = int(np.count_nonzero(reuse >= 0))
+    new_sources = {skill.source for skill in skills}
+    stats = {
+        "added": added,
+        "modified": len(skills) - num_kept - added,
+        "removed": sum(1 for source in old_rows if source not in new_sources),
+        "unchanged": num_kept,
+    }
+    return SyncPlan(reuse, stats)
+
+
+def _with_shard(skill: Skill, shard: str) -> Skill:
+    """Copy a skill (sharing its documents) with another shard key."""
+    skill = copy.copy(skill)
+    skill.shard = shard
+    return skill
+
+
+@dataclass(frozen=True)
+class ShardPlan:
+    """What a reload of one source shard changes.
+
+    All skills carry the shard key; they are the reloaded objects, or
+    copies of those loaded with another key.
+
+    Attributes
+    ----------
+    added : list[Skill]
+        Skills new to the index.
+    modified : list[Skill]
+        Skills whose indexed version differs.
+    unchanged : list[Skill]
+        Fresh copies of unchanged skills that are not the indexed objects.
+    stale : list[str]
+        Sources of indexed skills of the shard that disappeared.
+    stats : dict[str, int]
+        Counts of "added", "modified", "removed" and "unchanged" skills.
+    """
+
+    added: list[Skill]
+    modified: list[Skill]
+    unchanged: list[Skill]
+    stale: list[str]
+    stats: dict[str, int]
+
+
+def plan_shard_sync(
+    snapshot: IndexSnapshot, shard: str, skills: list[Skill]
+) -> ShardPlan:
+    """Compare the reloaded skills of one shard with the indexed ones.
+
+    Live skills and collapsed duplicates both count as indexed. Reloaded
+    skills with another ``shard`` are copied with ``shard`` set rather than
+    modified, as the caller may still use them.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Currently indexed snapshot.
+    shard : str
+        Shard key of the reloaded source.
+    skills : list[Skill]
+        The complete new set of skills of that shard.
+
+    Returns
+    -------
+    ShardPlan
+        Skills to add, upsert and refresh, and sources to remove.
+    """
+    skills = [
+        skill if skill.shard == shard else _with_shard(skill, shard) for skill in skills
+    ]
+    indexed = {
+        skill.source: skill
+        for duplicates in snapshot.duplicates.values()
+        for skill in duplicates
+    }
+    indexed.update(
+        (source, snapshot.skills[row]) for source, row in live_rows(snapshot).items()
+    )
+
+    incoming = {skill.source for skill in skills}
+    stale = [
+        source
+        for source, skill in indexed.items()
+        if skill.shard == shard and source not in incoming
+    ]
+    added, modified, unchanged = [], [], []
+    for skill in skills:
+        old = indexed.get(skill.source)
+        if old is None:
+            added.append(skill)
+        elif skill_fingerprint(old) != skill_fingerprint(skill):
+            modified.append(skill)
+        elif old is not skill:
+            unchanged.append(skill)
+    stats = {
+        "added": len(added),
+        "modified": len(modified),
+        "removed": len(stale),
+        "unchanged": len(skills) - len(added) - len(modified),
+    }
+    return ShardPlan(added, modified, unchanged, stale, stats)
@@ -0,0 +1,155 @@
+"""Keyword-only (degraded) search while the embedding model is not ready."""
+
+import logging
+from collections.abc import Callable
+
+import numpy as np
+
+from .index_snapshot import IndexSnapshot, allowed_rows
+from .lexical_index import BM25Index
+from .metadata_index import MetadataIndex
+from .name_index import NameIndex
+from .search_results import SkillResult, attach_skill_sections, build_results
+from .skill_loader import Skill
+
+logger = logging.getLogger(__name__)
+
+
+def keyword_snapshot(
+    index: IndexSnapshot,
+    staged: IndexSnapshot,
+    model_ready: bool,
+    degraded_search: bool,
+) -> IndexSnapshot | None:
+    """Pick the snapshot to rank by keywords while the model is not ready.
+
+    Parameters
+    ----------
+    index : IndexSnapshot
+        Current snapshot of the index.
+    staged : IndexSnapshot
+        Skills staged for keyword search (see ``stage_skills``).
+    model_ready : bool
+        Whether the embedding model is loaded.
+    degraded_search : bool
+        Whether searches may rank by keywords at all.
+
+    Returns
+    -------
+    IndexSnapshot | None
+        The index (if it has live skills and a keyword index) or else
+        the staged skills, or None when searches use vectors: the model
+        is ready and skills are indexed, degraded search is disabled, or
+        there is nothing to rank by keywords.
+    """
+    if model_ready and index.num_live:
+        return None
+    if not degraded_search:
+        return None
+    if not model_ready and index.num_live and index.lexical is not None:
+        return index
+    if staged.skills:
+        return staged
+    return None
+
+
+def add_staged_skills(
+    staged: IndexSnapshot, skills: list[Skill]
+) -> IndexSnapshot | None:
+    """Add skills to the keyword-only snapshot of staged skills.
+
+    Staged skills only get BM25 and filter entries, which need no model.
+
+    Parameters
+    ----------
+    staged : IndexSnapshot
+        Current staged snapshot.
+    skills : list[Skill]
+        Parsed skills; those whose source is already staged are skipped.
+
+    Returns
+    -------
+    IndexSnapshot | None
+        New staged snapshot, or None if no skill was added.
+    """
+    sources = {skill.source for skill in staged.skills}
+    new_skills = []
+    for skill in skills:
+        if skill.source not in sources:
+            sources.add(skill.source)
+            new_skills.append(skill)
+    if not new_skills:
+        return None
+
+    lexical = staged.lexical or BM25Index()
+    metadata = staged.metadata or MetadataIndex()
+    names = staged.names or NameIndex()
+    lexical.add_skills(new_skills)
+    metadata.add_skills(new_skills)
+    names.add_skills(new_skills)
+    attach_skill_sections(new_skills)
+    return IndexSnapshot(
+        skills=[*staged.skills, *new_skills],
+        version=staged.version + 1,
+        lexical=lexical,
+        metadata=metadata,
+        names=names,
+    )
+
+
+def keyword_search(
+    snapshot: IndexSnapshot,
+    queries: list[str],
+    top_k: int,
+    keys: list[tuple[str, str]],
+    select_top_k: Callable[[np.ndarray, int], np.ndarray],
+) -> list[list[SkillResult]]:
+    """Rank skills by BM25 scores alone, without the model.
+
+    Only skills sharing a term with the query are returned. The best
+    match scores 1.0 and the others their BM25 score relative to it.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot with a keyword index (the index or the staged skills).
+    queries : list[str]
+        Queries to search for.
+    top_k : int
+        Number of results to return per query.
+    keys : list[tuple[str, str]]
+        Metadata keys that returned skills must all match.
+    select_top_k : Callable[[np.ndarray, int], np.ndarray]
+        Selects the indices of the top-k scores of one query, best first.
+
+    Returns
+    -------
+    list[list[SkillResult]]
+        One result list per query, with "search_mode" "keyword".
+    """
+    allowed, num_allowed = allowed_rows(snapshot, keys)
+    top_k = min(top_k, num_allowed)
+    logger.info(
+        f"Model not ready, ranking {len(queries)} queries by keywords (top_k={top_k})"
+    )
+
+    batches = []
+    for query in queries:
+        scores = snapshot.lexical.score(query, len(snapshot.skills))
+        if allowed is not None:
+            scores[~allowed] = 0.0
+        top_indices = select_top_k(scores, top_k)
+        top_indices = top_indices[scores[top_indices] > 0]
+        relevance = scores
+        if len(top_indices):
+            relevance = scores / scores[top_indices[0]]
+        batches.append(
+            build_results(
+                snapshot,
+                top_indices,
+                relevance,
+                lexical_scores=scores,
+                search_mode="keyword",
+            )
+        )
+    return batches
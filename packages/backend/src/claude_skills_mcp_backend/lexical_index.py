@@ -0,0 +1,307 @@
+"""Incremental BM25 inverted index for lexical skill retrieval."""
+
+import logging
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+from .skill_loader import Skill
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    """a an and are as at be by for from has in is it its of on or that the to
+    was were will with this these those you your use using can""".split()
+)
+
+# Field weights: matches in the name count more than in the body, so exact
+# tool names ("rdkit", "scanpy") in a query surface the right skill.
+_FIELD_WEIGHTS = (("name", 3), ("description", 2), ("content", 1))
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric tokens, dropping stopwords.
+
+    Parameters
+    ----------
+    text : str
+        Text to tokenize.
+
+    Returns
+    -------
+    list[str]
+        Tokens in order of appearance.
+    """
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def tokenize_skill(skill: Skill) -> Counter:
+    """Compute weighted term frequencies over a skill's name, description and content.
+
+    Parameters
+    ----------
+    skill : Skill
+        Skill to tokenize.
+
+    Returns
+    -------
+    Counter
+        Mapping of term to weighted frequency.
+    """
+    counts: Counter = Counter()
+    for field_name, weight in _FIELD_WEIGHTS:
+        for token in tokenize(getattr(skill, field_name) or ""):
+            counts[token] += weight
+    return counts
+
+
+class _PostingList:
+    """Append-only, array-backed posting list for one term.
+
+    The arrays and the logical length are published together as one tuple,
+    so a concurrent reader always sees a consistent prefix.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(
+        self, doc_ids: np.ndarray | None = None, tfs: np.ndarray | None = None
+    ) -> None:
+        if doc_ids is None:
+            self._data: tuple[np.ndarray, np.ndarray, int] = (
+                np.empty(4, dtype=np.int32),
+                np.empty(4, dtype=np.float32),
+                0,
+            )
+        else:
+            # Full arrays (possibly read-only maps): the next append copies
+            self._data = (doc_ids, tfs, len(doc_ids))
+
+    def append(self, doc_id: int, tf: float) -> None:
+        """Append a posting. Document ids must be appended in increasing order."""
+        doc_ids, tfs, size = self._data
+        if size == len(doc_ids):
+            new_doc_ids = np.empty(2 * size, dtype=np.int32)
+            new_tfs = np.empty(2 * size, dtype=np.float32)
+            new_doc_ids[:size] = doc_ids[:size]
+            new_tfs[:size] = tfs[:size]
+            doc_ids, tfs = new_doc_ids, new_tfs
+        doc_ids[size] = doc_id
+        tfs[size] = tf
+        self._data = (doc_ids, tfs, size + 1)
+
+    def view(self, num_docs: int) -> tuple[np.ndarray, np.ndarray]:
+        """Get the postings for documents with id below ``num_docs``."""
+        doc_ids, tfs, size = self._data
+        end = int(np.searchsorted(doc_ids[:size], num_docs))
+        return doc_ids[:end], tfs[:end]
+
+
+class BM25Index:
+    """Incrementally maintained BM25 index over skills.
+
+    Documents are only ever appended, and every query is scored against the
+    first ``num_docs`` documents, so an index can be shared by several
+    immutable search snapshots while a writer keeps appending to it.
+
+    Attributes
+    ----------
+    k1 : float
+        BM25 term frequency saturation parameter.
+    b : float
+        BM25 length normalization parameter.
+    num_docs : int
+        Number of documents added so far.
+    _postings : dict[str, _PostingList]
+        Posting list per term.
+    _doc_lengths : np.ndarray
+        Weighted length of each document (capacity-doubling buffer).
+    _lock : threading.Lock
+        Serializes writers.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """Initialize an empty index.
+
+        Parameters
+        ----------
+        k1 : float, optional
+            Term frequency saturation, by default 1.2.
+        b : float, optional
+            Length normalization, by default 0.75.
+        """
+        self.k1 = k1
+        self.b = b
+        self.num_docs = 0
+        self._postings: dict[str, _PostingList] = {}
+        self._doc_lengths = np.empty(16, dtype=np.float32)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_arrays(
+        cls,
+        terms: list[str],
+        arrays: dict[str, np.ndarray],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> "BM25Index":
+        """Rebuild an index from the output of ``to_arrays``.
+
+        Posting lists are views of the given arrays, which may be read-only
+        memory maps; they are copied only when documents are appended.
+
+        Parameters
+        ----------
+        terms : list[str]
+            Terms, one per posting list.
+        arrays : dict[str, np.ndarray]
+            "offsets", "doc_ids", "tfs" and "doc_lengths" arrays.
+        k1 : float, optional
+            Term frequency saturation, by default 1.2.
+        b : float, optional
+            Length normalization, by default 0.75.
+
+        Returns
+        -------
+        BM25Index
+            Index over ``len(arrays["doc_lengths"])`` documents.
+
+        Raises
+        ------
+        ValueError
+            If the arrays do not describe ``len(terms)`` posting lists.
+        """
+        offsets = arrays["offsets"]
+        doc_ids, tfs = arrays["doc_ids"], arrays["tfs"]
+        if len(offsets) != len(terms) + 1 or offsets[-1] != len(doc_ids):
+            raise ValueError(
+                f"Posting offsets do not match {len(terms)} terms "
+                f"and {len(doc_ids)} postings"
+            )
+        index = cls(k1=k1, b=b)
+        bounds = offsets.tolist()
+        for term, start, end in zip(terms, bounds, bounds[1:]):
+            index._postings[term] = _PostingList(doc_ids[start:end], tfs[start:end])
+        index.num_docs = len(arrays["doc_lengths"])
+        index._doc_lengths = np.array(arrays["doc_lengths"], dtype=np.float32)
+        return index
+
+    def to_arrays(
+        self, num_docs: int | None = None
+    ) -> tuple[list[str], dict[str, np.ndarray]]:
+        """Export the first ``num_docs`` documents as flat arrays.
+
+        Parameters
+        ----------
+        num_docs : int | None, optional
+            Number of documents to export, by default all documents.
+
+        Returns
+        -------
+        tuple[list[str], dict[str, np.ndarray]]
+            The terms and "offsets" (int64, ``len(terms) + 1``), "doc_ids"
+            (int32) and "tfs" (float32) arrays holding the concatenated
+            posting lists, plus "doc_lengths" (float32, ``num_docs``).
+        """
+        if num_docs is None:
+            num_docs = self.num_docs
+        terms: list[str] = []
+        doc_id_parts: list[np.ndarray] = []
+        tf_parts: list[np.ndarray] = []
+        with self._lock:
+            for term, postings in self._postings.items():
+                doc_ids, tfs = postings.view(num_docs)
+                if len(doc_ids):
+                    terms.append(term)
+                    doc_id_parts.append(doc_ids)
+                    tf_parts.append(tfs)
+
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(part) for part in doc_id_parts], out=offsets[1:])
+        return terms, {
+            "offsets": offsets,
+            "doc_ids": np.concatenate(doc_id_parts or [np.empty(0, np.int32)]),
+            "tfs": np.concatenate(tf_parts or [np.empty(0, np.float32)]),
+            "doc_lengths": self._doc_lengths[:num_docs].copy(),
+        }
+
+    def add_documents(self, documents: list[Counter]) -> None:
+        """Append documents given as term frequency counters.
+
+        Parameters
+        ----------
+        documents : list[Counter]
+            Term frequencies per document, e.g. from ``tokenize_skill``.
+        """
+        with self._lock:
+            needed = self.num_docs + len(documents)
+            if needed > len(self._doc_lengths):
+                capacity = max(needed, 2 * len(self._doc_lengths))
+                doc_lengths = np.empty(capacity, dtype=np.float32)
+                doc_lengths[: self.num_docs] = self._doc_lengths[: self.num_docs]
+                self._doc_lengths = doc_lengths
+
+            for counts in documents:
+                doc_id = self.num_docs
+                for term, tf in counts.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = _PostingList()
+                    postings.append(doc_id, tf)
+                self._doc_lengths[doc_id] = sum(counts.values())
+                self.num_docs += 1
+
+    def add_skills(self, skills: list[Skill]) -> None:
+        """Tokenize and append skills.
+
+        Parameters
+        ----------
+        skills : list[Skill]
+            Skills to add, in index order.
+        """
+        self.add_documents([tokenize_skill(skill) for skill in skills])
+
+    def score(self, query: str, num_docs: int | None = None) -> np.ndarray:
+        """Compute BM25 scores of a query against the first ``num_docs`` documents.
+
+        Parameters
+        ----------
+        query : str
+            Query text.
+        num_docs : int | None, optional
+            Number of documents to score, by default all documents.
+
+        Returns
+        -------
+        np.ndarray
+            Float32 scores of shape (num_docs,); zero where no term matched.
+        """
+        if num_docs is None:
+            num_docs = self.num_docs
+        scores = np.zeros(num_docs, dtype=np.float32)
+        if num_docs == 0:
+            return scores
+
+        doc_lengths = self._doc_lengths[:num_docs]
+        avg_length = float(doc_lengths.mean()) or 1.0
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            doc_ids, tfs = postings.view(num_docs)
+            df = len(doc_ids)
+            if df == 0:
+                continue
+
+            idf = math.log(1.0 + (num_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * doc_lengths[doc_ids] / avg_length)
+            # Each document appears at most once per posting list
+            scores[doc_ids] += idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+
+        return scores
@@ -1,8 +1,10 @@
 """MCP server implementation for Claude Skills search."""
 
+import asyncio
 import fnmatch
 import logging
 import threading
+from collections.abc import Mapping
 from typing import Any
 
 from mcp.server import Server
@@ -10,9 +12,183 @@ from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
 from .search_engine import SkillSearchEngine
+from .search_results import SkillResult, render_skill_sections
 
 logger = logging.getLogger(__name__)
 
+# Optional filters of find_helpful_skills, passed through to
+# SkillSearchEngine.search
+SEARCH_FILTER_PROPERTIES: dict[str, Any] = {
+    "source": {
+        "type": "string",
+        "enum": ["github", "local"],
+        "description": "Only return skills loaded from GitHub or from the local filesystem",
+    },
+    "repo": {
+        "type": "string",
+        "description": "Only return skills from this GitHub repository (e.g., 'anthropics/skills')",
+    },
+    "has_documents": {
+        "type": "boolean",
+        "description": "Only return skills with (true) or without (false) additional documents (scripts, references, assets)",
+    },
+    "tags": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only return skills whose frontmatter tags include all of these tags",
+    },
+}
+
+# Header of find_helpful_skills responses ranked without the embedding model
+KEYWORD_MODE_NOTICE = (
+    "[KEYWORD SEARCH: the embedding model is still loading, so skills are "
+    "ranked by keyword match; semantic search takes over automatically once "
+    "it is ready]\n"
+)
+
+
+# Description and input schema of related_skills
+RELATED_SKILLS_DESCRIPTION = (
+    "Use after finding a relevant skill to discover adjacent skills (complementary tools, "
+    "alternative approaches, next steps). Answered from precomputed similarities, so it is much "
+    "cheaper than another find_helpful_skills call. Returns names, descriptions and sources; "
+    "use read_skill_document or find_helpful_skills for the full content."
+)
+RELATED_SKILLS_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "skill_name": {
+            "type": "string",
+            "description": "Name of the skill (as returned by find_helpful_skills)",
+        },
+        "k": {
+            "type": "integer",
+            "description": "Number of related skills to return (default: 5)",
+            "default": 5,
+            "minimum": 1,
+            "maximum": 20,
+        },
+    },
+    "required": ["skill_name"],
+}
+
+
+def get_search_filters(arguments: dict[str, Any]) -> dict[str, Any]:
+    """Extract the search filters from find_helpful_skills arguments.
+
+    Parameters
+    ----------
+    arguments : dict[str, Any]
+        Tool arguments.
+
+    Returns
+    -------
+    dict[str, Any]
+        Keyword arguments for ``SkillSearchEngine.search``; unset filters
+        are omitted.
+    """
+    filters = {
+        name: arguments[name]
+        for name in SEARCH_FILTER_PROPERTIES
+        if arguments.get(name) is not None
+    }
+    if isinstance(filters.get("tags"), str):
+        filters["tags"] = [filters["tags"]]
+    return filters
+
+
+def _get_skill_sections(result: Mapping[str, Any]) -> tuple[str, str]:
+    """Get the skill sections of a result, rendered when it was indexed."""
+    if isinstance(result, SkillResult) and result.skill.result_sections is not None:
+        return result.skill.result_sections
+    return render_skill_sections(result)
+
+
+def skill_not_found_message(skill_name: str, search_engine: SkillSearchEngine) -> str:
+    """Explain that no skill has a name, suggesting similar names if any.
+
+    Parameters
+    ----------
+    skill_name : str
+        Name that matched no skill.
+    search_engine : SkillSearchEngine
+        Engine whose name index provides the suggestions.
+
+    Returns
+    -------
+    str
+        Error text for the tool response.
+    """
+    suggestions = search_engine.suggest_skill_names(skill_name)
+    if not suggestions:
+        return (
+            f"Skill '{skill_name}' not found. "
+            "Please use find_helpful_skills to find valid skill names."
+        )
+    names = ", ".join(f"'{name}'" for name in suggestions)
+    return (
+        f"Skill '{skill_name}' not found. Did you mean: {names}? "
+        "Retry with one of these names, or use find_helpful_skills to find "
+        "valid skill names."
+    )
+
+
+def format_search_result(
+    rank: int,
+    result: Mapping[str, Any],
+    list_documents: bool = True,
+    max_content_chars: int | None = None,
+) -> list[str]:
+    """Format one find_helpful_skills hit.
+
+    Parameters
+    ----------
+    rank : int
+        1-based position of the hit.
+    result : Mapping[str, Any]
+        Search result.
+    list_documents : bool, optional
+        Whether to list the skill's documents, by default True.
+    max_content_chars : int | None, optional
+        Truncate content beyond this many characters, by default None.
+
+    Returns
+    -------
+    list[str]
+        Response parts, to be joined with newlines.
+    """
+    description, listing = _get_skill_sections(result)
+    score = f"{result['relevance_score']:.4f}"
+    if result.get("search_mode") == "hybrid":
+        # Not a cosine similarity: 1.0 means ranked first by both rankings
+        score += " (rank fusion of semantic and keyword match)"
+    parts = [
+        f"\n{'=' * 80}",
+        f"\nSkill {rank}: {result['name']}",
+        f"\nRelevance Score: {score}",
+        f"\nSource: {result['source']}",
+    ]
+    if result.get("alternate_sources"):
+        parts.append(f"\nAlso available from: {', '.join(result['alternate_sources'])}")
+    parts.append(description)
+    if list_documents and listing:
+        parts.append(listing)
+    parts.append(f"\n{'-' * 80}")
+    parts.append("\nFull Content:\n")
+
+    content = result["content"]
+    if max_content_chars is not None and len(content) > max_content_chars:
+        parts.append(content[:max_content_chars] + "...")
+        parts.append(
+            f"\n\n[Content truncated at {max_content_chars} characters. "
+            f"View full skill at: {result['source']}]"
+        )
+    else:
+        parts.append(content)
+
+    parts.append(f"\n{'=' * 80}\n")
+    return parts
+
 
 class LoadingState:
     """Thread-safe state tracker for background skill loading.
@@ -177,6 +353,7 @@ class SkillsMCPServer:
                                 "description": "Include a list of available documents (scripts, references, assets) for each skill (default: True)",
                                 "default": True,
                             },
+                            **SEARCH_FILTER_PROPERTIES,
                         },
                         "required": ["task_description"],
                     },
@@ -216,6 +393,12 @@ class SkillsMCPServer:
                         "required": ["skill_name"],
                     },
                 ),
+                Tool(
+                    name="related_skills",
+                    title="Find skills related to a skill",
+                    description=RELATED_SKILLS_DESCRIPTION,
+                    inputSchema=RELATED_SKILLS_SCHEMA,
+                ),
                 Tool(
                     name="list_skills",
                     title="List available skills",
@@ -239,6 +422,10 @@ class SkillsMCPServer:
                 return await self._handle_search_skills(arguments)
             elif name == "read_skill_document":
                 return await self._handle_read_skill_document(arguments)
+            elif name == "related_skills":
+                return await handle_related_skills(
+                    arguments, self.search_engine, self.loading_state
+                )
             elif name == "list_skills":
                 return await self._handle_list_skills(arguments)
             else:
@@ -265,6 +452,7 @@ class SkillsMCPServer:
 
         top_k = arguments.get("top_k", self.default_top_k)
         list_documents = arguments.get("list_documents", True)
+        filters = get_search_filters(arguments)
 
         # Build formatted response
         response_parts = []
@@ -274,8 +462,11 @@ class SkillsMCPServer:
         if status_msg:
             response_parts.append(status_msg)
 
-        # Perform search
-        results = self.search_engine.search(task_description, top_k)
+        # Perform search in a worker thread so concurrent queries are not
+        # serialized on the event loop
+        results = await asyncio.to_thread(
+            self.search_engine.search, task_description, top_k, **filters
+        )
 
         # Format results as text
         if not results:
@@ -295,59 +486,23 @@ class SkillsMCPServer:
             return [
                 TextContent(
                     type="text",
-                    text="No relevant skills found for the given task description.",
+                    text=(
+                        "No relevant skills found for the given task description"
+                        + (" and filters." if filters else ".")
+                    ),
                 )
             ]
 
+        if results[0].get("search_mode") == "keyword":
+            response_parts.append(KEYWORD_MODE_NOTICE)
         response_parts.append(
             f"Found {len(results)} relevant skill(s) for: '{task_description}'\n"
         )
 
         for i, result in enumerate(results, 1):
-            response_parts.append(f"\n{'=' * 80}")
-            response_parts.append(f"\nSkill {i}: {result['name']}")
-            response_parts.append(f"\nRelevance Score: {result['relevance_score']:.4f}")
-            response_parts.append(f"\nSource: {result['source']}")
-            response_parts.append(f"\nDescription: {result['description']}")
-
-            # Include document count if available
-            documents = result.get("documents", {})
-            if documents:
-                response_parts.append(
-                    f"\nAdditional Documents: {len(documents)} file(s)"
-                )
-
-                # List documents if requested
-                if list_documents:
-                    response_parts.append("\nAvailable Documents:")
-                    for doc_path in sorted(documents.keys()):
-                        doc_info = documents[doc_path]
-                        doc_type = doc_info.get("type", "unknown")
-                        doc_size = doc_info.get("size", 0)
-                        size_kb = doc_size / 1024
-                        response_parts.append(
-                            f"  - {doc_path} ({doc_type}, {size_kb:.1f} KB)"
-                        )
-
-            response_parts.append(f"\n{'-' * 80}")
-            response_parts.append("\nFull Content:\n")
-
-            # Apply character limit truncation if configured
-            content = result["content"]
-            if (
-                self.max_content_chars is not None
-                and len(content) > self.max_content_chars
-            ):
-                truncated_content = content[: self.max_content_chars] + "..."
-                response_parts.append(truncated_content)
-                response_parts.append(
-                    f"\n\n[Content truncated at {self.max_content_chars} characters. "
-                    f"View full skill at: {result['source']}]"
-                )
-            else:
-                response_parts.append(content)
-
-            response_parts.append(f"\n{'=' * 80}\n")
+            response_parts.extend(
+                format_search_result(i, result, list_documents, self.max_content_chars)
+            )
 
         return [TextContent(type="text", text="\n".join(response_parts))]
 
@@ -373,18 +528,12 @@ class SkillsMCPServer:
         document_path = arguments.get("document_path")
         include_base64 = arguments.get("include_base64", False)
 
-        # Find the skill by name
-        skill = None
-        for s in self.search_engine.skills:
-            if s.name == skill_name:
-                skill = s
-                break
-
+        skill = self.search_engine.get_skill(skill_name)
         if not skill:
             return [
                 TextContent(
                     type="text",
-                    text=f"Skill '{skill_name}' not found. Please use find_helpful_skills to find valid skill names.",
+                    text=skill_not_found_message(skill_name, self.search_engine),
                 )
             ]
 
@@ -590,6 +739,7 @@ async def handle_search_skills(
 
     top_k = arguments.get("top_k", default_top_k)
     list_documents = arguments.get("list_documents", True)
+    filters = get_search_filters(arguments)
 
     response_parts = []
 
@@ -598,8 +748,11 @@ async def handle_search_skills(
     if status_msg:
         response_parts.append(status_msg)
 
-    # Perform search
-    results = search_engine.search(task_description, top_k)
+    # Perform search in a worker thread so concurrent queries are not
+    # serialized on the event loop
+    results = await asyncio.to_thread(
+        search_engine.search, task_description, top_k, **filters
+    )
 
     if not results:
         if (
@@ -617,51 +770,23 @@ async def handle_search_skills(
         return [
             TextContent(
                 type="text",
-                text="No relevant skills found for the given task description.",
+                text=(
+                    "No relevant skills found for the given task description"
+                    + (" and filters." if filters else ".")
+                ),
             )
         ]
 
+    if results[0].get("search_mode") == "keyword":
+        response_parts.append(KEYWORD_MODE_NOTICE)
     response_parts.append(
         f"Found {len(results)} relevant skill(s) for: '{task_description}'\n"
     )
 
     for i, result in enumerate(results, 1):
-        response_parts.append(f"\n{'=' * 80}")
-        response_parts.append(f"\nSkill {i}: {result['name']}")
-        response_parts.append(f"\nRelevance Score: {result['relevance_score']:.4f}")
-        response_parts.append(f"\nSource: {result['source']}")
-        response_parts.append(f"\nDescription: {result['description']}")
-
-        documents = result.get("documents", {})
-        if documents:
-            response_parts.append(f"\nAdditional Documents: {len(documents)} file(s)")
-
-            if list_documents:
-                response_parts.append("\nAvailable Documents:")
-                for doc_path in sorted(documents.keys()):
-                    doc_info = documents[doc_path]
-                    doc_type = doc_info.get("type", "unknown")
-                    doc_size = doc_info.get("size", 0)
-                    size_kb = doc_size / 1024
-                    response_parts.append(
-                        f"  - {doc_path} ({doc_type}, {size_kb:.1f} KB)"
-                    )
-
-        response_parts.append(f"\n{'-' * 80}")
-        response_parts.append("\nFull Content:\n")
-
-        content = result["content"]
-        if max_content_chars is not None and len(content) > max_content_chars:
-            truncated_content = content[:max_content_chars] + "..."
-            response_parts.append(truncated_content)
-            response_parts.append(
-                f"\n\n[Content truncated at {max_content_chars} characters. "
-                f"View full skill at: {result['source']}]"
-            )
-        else:
-            response_parts.append(content)
-
-        response_parts.append(f"\n{'=' * 80}\n")
+        response_parts.extend(
+            format_search_result(i, result, list_documents, max_content_chars)
+        )
 
     return [TextContent(type="text", text="\n".join(response_parts))]
 
@@ -679,18 +804,12 @@ async def handle_read_skill_document(
     document_path = arguments.get("document_path")
     include_base64 = arguments.get("include_base64", False)
 
-    # Find the skill by name
-    skill = None
-    for s in search_engine.skills:
-        if s.name == skill_name:
-            skill = s
-            break
-
+    skill = search_engine.get_skill(skill_name)
     if not skill:
         return [
             TextContent(
                 type="text",
-                text=f"Skill '{skill_name}' not found. Please use find_helpful_skills to find valid skill names.",
+                text=skill_not_found_message(skill_name, search_engine),
             )
         ]
 
@@ -802,6 +921,71 @@ async def handle_read_skill_document(
     return [TextContent(type="text", text="\n".join(response_parts))]
 
 
+async def handle_related_skills(
+    arguments: dict[str, Any], search_engine, loading_state
+) -> list[TextContent]:
+    """Handle related_skills tool calls (shared by the stdio and HTTP servers)."""
+    skill_name = arguments.get("skill_name")
+    if not skill_name:
+        raise ValueError("skill_name is required")
+    bounds = RELATED_SKILLS_SCHEMA["properties"]["k"]
+    k = arguments.get("k")
+    if k is None:
+        k = bounds["default"]
+    if (
+        isinstance(k, bool)
+        or not isinstance(k, int)
+        or not bounds["minimum"] <= k <= bounds["maximum"]
+    ):
+        return [
+            TextContent(
+                type="text",
+                text=(
+                    f"Invalid k: {k!r}. k must be an integer from "
+                    f"{bounds['minimum']} to {bounds['maximum']}."
+                ),
+            )
+        ]
+
+    response_parts = []
+
+    # Add loading status if skills are still being loaded
+    status_msg = loading_state.get_status_message() if loading_state else None
+    if status_msg:
+        response_parts.append(status_msg)
+
+    try:
+        results = await asyncio.to_thread(search_engine.related_skills, skill_name, k)
+    except ValueError:
+        return [
+            TextContent(
+                type="text",
+                text=(status_msg or "")
+                + skill_not_found_message(skill_name, search_engine),
+            )
+        ]
+
+    if not results:
+        response_parts.append(f"No skills related to '{skill_name}' found.")
+        return [TextContent(type="text", text="\n".join(response_parts))]
+
+    response_parts.append(f"Found {len(results)} skill(s) related to '{skill_name}':\n")
+    for i, result in enumerate(results, 1):
+        response_parts.append(f"{i}. {result['name']}")
+        response_parts.append(f"   Similarity: {result['relevance_score']:.4f}")
+        response_parts.append(f"   Description: {result['description']}")
+        response_parts.append(f"   Source: {result['source']}")
+        if result.get("alternate_sources"):
+            response_parts.append(
+                f"   Also available from: {', '.join(result['alternate_sources'])}"
+            )
+        if result.get("documents"):
+            response_parts.append(f"   Documents: {len(result['documents'])} file(s)")
+        response_parts.append("")
+
+    return [TextContent(type="text", text="\n".join(response_parts))]
+
+
 async def handle_list_skills(
     arguments: dict[str, Any], search_engine, loading_state
 ) -> list[TextContent]:
@@ -0,0 +1,219 @@
+"""Precomputed boolean masks over skill metadata for filtered search."""
+
+import threading
+from collections import defaultdict
+from collections.abc import Sequence
+from urllib.parse import urlparse
+
+import numpy as np
+
+from .growable import GrowableArray
+from .skill_loader import Skill
+
+SOURCE_KINDS = ("github", "local")
+
+
+def source_kind(source: str) -> str:
+    """Classify a skill source.
+
+    Parameters
+    ----------
+    source : str
+        Skill source (GitHub URL or local path).
+
+    Returns
+    -------
+    str
+        "github" for GitHub URLs, "local" for filesystem paths, otherwise
+        the URL scheme.
+    """
+    parsed = urlparse(source)
+    if parsed.netloc.lower() in ("github.com", "www.github.com"):
+        return "github"
+    # Single-letter schemes are Windows drive letters
+    if len(parsed.scheme) <= 1 or parsed.scheme == "file":
+        return "local"
+    return parsed.scheme.lower()
+
+
+def normalize_repo(repo: str) -> str:
+    """Normalize a GitHub repository to lowercase ``owner/name``.
+
+    Parameters
+    ----------
+    repo : str
+        ``owner/name`` or a GitHub URL of the repository or of a path in it.
+
+    Returns
+    -------
+    str
+        Lowercase ``owner/name``, or "" if ``repo`` names no repository.
+    """
+    path = urlparse(repo).path if "github.com" in repo.lower() else repo
+    parts = [part for part in path.strip().split("/") if part]
+    if len(parts) < 2:
+        return ""
+    owner, name = parts[0], parts[1].removesuffix(".git")
+    return f"{owner}/{name}".lower()
+
+
+def skill_metadata(skill: Skill) -> set[tuple[str, str]]:
+    """Compute the filterable metadata of a skill as (field, value) keys.
+
+    Parameters
+    ----------
+    skill : Skill
+        Skill to describe.
+
+    Returns
+    -------
+    set[tuple[str, str]]
+        Keys for the "source" kind, the GitHub "repo", "has_documents"
+        ("true" or "false") and each "tag".
+    """
+    kind = source_kind(skill.source)
+    keys = {
+        ("source", kind),
+        ("has_documents", "true" if skill.documents else "false"),
+    }
+    if kind == "github":
+        repo = normalize_repo(skill.source)
+        if repo:
+            keys.add(("repo", repo))
+    keys.update(("tag", tag.lower()) for tag in skill.tags)
+    return keys
+
+
+def filter_keys(
+    source: str | None = None,
+    repo: str | None = None,
+    has_documents: bool | None = None,
+    tags: Sequence[str] | None = None,
+) -> list[tuple[str, str]]:
+    """Translate search filter arguments into metadata keys.
+
+    Parameters
+    ----------
+    source : str | None, optional
+        Source kind, "github" or "local".
+    repo : str | None, optional
+        GitHub repository, see ``normalize_repo``.
+    has_documents : bool | None, optional
+        Whether skills must (True) or must not (False) have documents.
+    tags : Sequence[str] | None, optional
+        Tags that skills must all carry.
+
+    Returns
+    -------
+    list[tuple[str, str]]
+        Keys that a skill must all match; empty when nothing is filtered.
+
+    Raises
+    ------
+    ValueError
+        If ``source`` is unknown or ``repo`` is not a repository.
+    """
+    keys = []
+    if source is not None:
+        if source.lower() not in SOURCE_KINDS:
+            raise ValueError(
+                f"Unknown source filter: {source!r} "
+                f"(expected one of {', '.join(SOURCE_KINDS)})"
+            )
+        keys.append(("source", source.lower()))
+    if repo is not None:
+        normalized = normalize_repo(repo)
+        if not normalized:
+            raise ValueError(f"Invalid repo filter: {repo!r} (expected owner/name)")
+        keys.append(("repo", normalized))
+    if has_documents is not None:
+        keys.append(("has_documents", "true" if has_documents else "false"))
+    for tag in tags or ():
+        keys.append(("tag", tag.strip().lower()))
+    return keys
+
+
+class MetadataIndex:
+    """Append-only boolean masks over skill rows, one per metadata key.
+
+    Every (field, value) key, e.g. ``("repo", "owner/name")`` or
+    ``("tag", "genomics")``, owns a bool array over all rows that is
+    extended as skills are appended. A filtered query ANDs the masks of
+    its keys into a single row mask, applied before top-k selection, so
+    no candidate is ranked only to be thrown away. Like ``BM25Index``, rows
+    are only ever appended and each snapshot reads the first ``num_rows``
+    entries, so snapshots can share one index while a writer appends.
+
+    Attributes
+    ----------
+    num_rows : int
+        Number of skills added so far.
+    _masks : dict[tuple[str, str], GrowableArray]
+        Bool mask per metadata key.
+    _lock : threading.Lock
+        Serializes writers.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.num_rows = 0
+        self._masks: dict[tuple[str, str], GrowableArray] = {}
+        self._lock = threading.Lock()
+
+    def add_skills(self, skills: Sequence[Skill]) -> None:
+        """Append skills.
+
+        Parameters
+        ----------
+        skills : Sequence[Skill]
+            Skills to add, in index order.
+        """
+        rows_by_key: dict[tuple[str, str], list[int]] = defaultdict(list)
+        for row, skill in enumerate(skills):
+            for key in skill_metadata(skill):
+                rows_by_key[key].append(row)
+
+        with self._lock:
+            for key in self._masks.keys() | rows_by_key.keys():
+                batch = np.zeros(len(skills), dtype=bool)
+                batch[rows_by_key.get(key, [])] = True
+                mask = self._masks.get(key)
+                if mask is None:
+                    # Rows added before the key first appeared do not match;
+                    # publish the mask only once it covers them
+                    mask = GrowableArray((), bool, capacity=2 * self.num_rows)
+                    mask.append(np.zeros(self.num_rows, dtype=bool))
+                    mask.append(batch)
+                    self._masks[key] = mask
+                else:
+                    mask.append(batch)
+            self.num_rows += len(skills)
+
+    def select(
+        self, keys: Sequence[tuple[str, str]], num_rows: int | None = None
+    ) -> np.ndarray:
+        """Combine the masks of several keys over the first ``num_rows`` rows.
+
+        Parameters
+        ----------
+        keys : Sequence[tuple[str, str]]
+            Keys that must all match, e.g. from ``filter_keys``.
+        num_rows : int | None, optional
+            Number of rows to cover, by default all rows.
+
+        Returns
+        -------
+        np.ndarray
+            New bool array of shape (num_rows,); True where a row matches
+            every key.
+        """
+        if num_rows is None:
+            num_rows = self.num_rows
+        selected = np.ones(num_rows, dtype=bool)
+        for key in keys:
+            mask = self._masks.get(key)
+            if mask is None:
+                selected[:] = False
+                break
+            selected &= mask.last_view[:num_rows]
+        return selected
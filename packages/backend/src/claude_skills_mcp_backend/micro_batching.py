@@ -0,0 +1,204 @@
+"""Dynamic micro-batching of concurrent encode requests."""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Request:
+    """Texts queued by one caller, and where their embeddings go."""
+
+    texts: list[str]
+    enqueued_at: float
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatcher:
+    """Coalesces concurrent encode calls into batched model calls.
+
+    Callers block in ``encode`` while a single worker thread drains the
+    queue: it takes the first pending request, keeps collecting requests
+    until ``max_batch_size`` texts are queued or ``max_wait_ms`` has passed
+    since the first one, encodes all their texts in one call and hands each
+    caller its rows. While a batch is being encoded, new requests pile up
+    and form the next batch, so batches grow with load on their own.
+
+    Attributes
+    ----------
+    encode_fn : Callable[[list[str]], np.ndarray]
+        Batch encoder, one output row per text.
+    max_batch_size : int
+        Texts after which a batch is flushed without waiting.
+    max_wait_ms : float
+        Longest time the first request of a batch waits for others.
+    _queue : queue.Queue[_Request]
+        Pending requests.
+    _latencies : deque[float]
+        Recent per-request latencies (queueing plus encoding), in seconds.
+    _batches : deque[tuple[float, float, int]]
+        Recent batches as (start, end, number of texts).
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[list[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        history: int = 10000,
+    ):
+        """Initialize the batcher (the worker starts on first use).
+
+        Parameters
+        ----------
+        encode_fn : Callable[[list[str]], np.ndarray]
+            Batch encoder, one output row per text.
+        max_batch_size : int, optional
+            Texts after which a batch is flushed, by default 32.
+        max_wait_ms : float, optional
+            Longest wait for more requests, by default 2.0.
+        history : int, optional
+            Requests and batches kept for the statistics, by default 10000.
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: queue.Queue[_Request] = queue.Queue()
+        self._latencies: deque[float] = deque(maxlen=history)
+        self._batches: deque[tuple[float, float, int]] = deque(maxlen=history)
+        self._requests = 0
+        self._texts = 0
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Encode texts as part of the next batch.
+
+        Parameters
+        ----------
+        texts : list[str]
+            Texts to encode.
+
+        Returns
+        -------
+        np.ndarray
+            Embeddings, one row per text.
+
+        Raises
+        ------
+        Exception
+            Whatever ``encode_fn`` raised for the batch.
+        """
+        request = _Request(list(texts), time.perf_counter())
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future.result()
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread if it is not running."""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="query-micro-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self) -> None:
+        """Collect and flush batches forever."""
+        max_wait = self.max_wait_ms / 1000.0
+        while True:
+            batch = [self._queue.get()]
+            num_texts = len(batch[0].texts)
+            deadline = time.perf_counter() + max_wait
+
+            while num_texts < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    # Drain requests that are already queued even past the deadline
+                    request = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                batch.append(request)
+                num_texts += len(request.texts)
+
+            self._flush(batch)
+
+    def _flush(self, batch: list[_Request]) -> None:
+        """Encode one batch and deliver each caller's rows."""
+        texts = [text for request in batch for text in request.texts]
+        start = time.perf_counter()
+        try:
+            embeddings = self.encode_fn(texts)
+        except Exception as e:
+            logger.error(f"Batched encode of {len(texts)} texts failed: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        end = time.perf_counter()
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(embeddings[offset : offset + len(request.texts)])
+            offset += len(request.texts)
+
+        with self._lock:
+            self._requests += len(batch)
+            self._texts += len(texts)
+            self._latencies.extend(end - request.enqueued_at for request in batch)
+            self._batches.append((start, end, len(texts)))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get latency, throughput and batch size statistics.
+
+        Latency percentiles cover the most recent requests (time from
+        ``encode`` being called to the result being ready); throughput and
+        mean batch size cover the most recent batches.
+
+        Returns
+        -------
+        dict[str, Any]
+            Totals, "p50_ms", "p99_ms", "mean_batch_size" and
+            "texts_per_second" (None before the first batch).
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            batches = list(self._batches)
+            stats: dict[str, Any] = {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "requests": self._requests,
+                "texts": self._texts,
+                "pending": self._queue.qsize(),
+            }
+
+        if not batches:
+            stats.update(
+                p50_ms=None, p99_ms=None, mean_batch_size=None, texts_per_second=None
+            )
+            return stats
+
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        window = batches[-1][1] - batches[0][0]
+        num_texts = sum(size for _, _, size in batches)
+        stats.update(
+            p50_ms=round(float(p50), 3),
+            p99_ms=round(float(p99), 3),
+            mean_batch_size=round(num_texts / len(batches), 2),
+            texts_per_second=round(num_texts / window, 1) if window > 0 else None,
+        )
+        return stats
@@ -0,0 +1,227 @@
+"""Exact and typo-tolerant lookup of skills by name."""
+
+import re
+import threading
+from collections import Counter
+from collections.abc import Sequence
+
+import numpy as np
+
+from .skill_loader import Skill
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a skill name for lookup.
+
+    Parameters
+    ----------
+    name : str
+        Skill name as given by a user or agent.
+
+    Returns
+    -------
+    str
+        Case-folded name with runs of spaces, hyphens, underscores and
+        punctuation collapsed into single spaces, e.g. "pdf processing"
+        for "PDF-Processing".
+    """
+    return _SEPARATORS.sub(" ", name.casefold()).strip()
+
+
+def name_trigrams(key: str) -> set[str]:
+    """Get the character trigrams of a normalized name.
+
+    Each word is padded with two leading spaces and one trailing space (as
+    in PostgreSQL's pg_trgm), so short words and word starts still produce
+    trigrams.
+
+    Parameters
+    ----------
+    key : str
+        Normalized name.
+
+    Returns
+    -------
+    set[str]
+        Distinct trigrams.
+    """
+    trigrams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+class NameIndex:
+    """Append-only hash and trigram indexes over skill names.
+
+    Exact names and normalized names (see ``normalize_name``) map to the
+    rows carrying them, so a lookup is a dictionary access instead of a
+    scan of the skill table. Every distinct normalized name is also posted
+    under its trigrams, so a name that matches nothing can be answered with
+    the most similar indexed names. Like ``MetadataIndex``, rows are only
+    ever appended and each snapshot passes its own row count (and
+    tombstones), so snapshots can share one index while a writer appends.
+
+    Attributes
+    ----------
+    num_rows : int
+        Number of skills added so far.
+    _exact : dict[str, list[int]]
+        Rows per skill name, ascending.
+    _keys : list[str]
+        Distinct normalized names, in order of first appearance.
+    _key_ids : dict[str, int]
+        Position of each normalized name in ``_keys``.
+    _key_rows : list[list[int]]
+        Rows per normalized name, ascending.
+    _key_sizes : list[int]
+        Number of trigrams per normalized name.
+    _trigrams : dict[str, list[int]]
+        Normalized name ids per trigram.
+    _lock : threading.Lock
+        Serializes writers.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.num_rows = 0
+        self._exact: dict[str, list[int]] = {}
+        self._keys: list[str] = []
+        self._key_ids: dict[str, int] = {}
+        self._key_rows: list[list[int]] = []
+        self._key_sizes: list[int] = []
+        self._trigrams: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def add_skills(self, skills: Sequence[Skill]) -> None:
+        """Append skills.
+
+        Parameters
+        ----------
+        skills : Sequence[Skill]
+            Skills to add, in index order.
+        """
+        with self._lock:
+            for row, skill in enumerate(skills, self.num_rows):
+                self._exact.setdefault(skill.name, []).append(row)
+                key = normalize_name(skill.name)
+                key_id = self._key_ids.get(key)
+                if key_id is None:
+                    key_id = len(self._keys)
+                    trigrams = name_trigrams(key)
+                    self._keys.append(key)
+                    self._key_rows.append([])
+                    self._key_sizes.append(len(trigrams))
+                    for trigram in trigrams:
+                        self._trigrams.setdefault(trigram, []).append(key_id)
+                    # Publish the id last, once its entries exist
+                    self._key_ids[key] = key_id
+                self._key_rows[key_id].append(row)
+            self.num_rows += len(skills)
+
+    def lookup(
+        self,
+        name: str,
+        num_rows: int | None = None,
+        tombstones: np.ndarray | None = None,
+    ) -> int | None:
+        """Find the row of a live skill by exact, then by normalized name.
+
+        Parameters
+        ----------
+        name : str
+            Skill name.
+        num_rows : int | None, optional
+            Number of rows to consider, by default all rows.
+        tombstones : np.ndarray | None, optional
+            Bool mask of removed rows to skip, by default none.
+
+        Returns
+        -------
+        int | None
+            First live row named ``name``, else first live row whose name
+            normalizes like ``name``, else None.
+        """
+        row = self._first_live(self._exact.get(name, ()), num_rows, tombstones)
+        if row is not None:
+            return row
+        key_id = self._key_ids.get(normalize_name(name))
+        if key_id is None:
+            return None
+        return self._first_live(self._key_rows[key_id], num_rows, tombstones)
+
+    def suggest(
+        self,
+        name: str,
+        limit: int = 3,
+        num_rows: int | None = None,
+        tombstones: np.ndarray | None = None,
+        min_similarity: float = 0.3,
+    ) -> list[int]:
+        """Find live skills whose names are most similar to ``name``.
+
+        Similarity is the Jaccard index of the trigram sets of the
+        normalized names. Only names sharing a trigram with ``name`` are
+        scored, so the cost depends on the postings of its trigrams rather
+        than on the size of the index.
+
+        Parameters
+        ----------
+        name : str
+            Possibly misspelled skill name.
+        limit : int, optional
+            Maximum number of suggestions, by default 3.
+        num_rows : int | None, optional
+            Number of rows to consider, by default all rows.
+        tombstones : np.ndarray | None, optional
+            Bool mask of removed rows to skip, by default none.
+        min_similarity : float, optional
+            Minimum similarity of a suggestion, by default 0.3.
+
+        Returns
+        -------
+        list[int]
+            One live row per suggested name, most similar first.
+        """
+        trigrams = name_trigrams(normalize_name(name))
+        if not trigrams or limit <= 0:
+            return []
+
+        shared: Counter[int] = Counter()
+        for trigram in trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+
+        scored = []
+        for key_id, count in shared.items():
+            similarity = count / (len(trigrams) + self._key_sizes[key_id] - count)
+            if similarity >= min_similarity:
+                scored.append((-similarity, self._keys[key_id], key_id))
+        scored.sort()
+
+        rows = []
+        for _, _, key_id in scored:
+            row = self._first_live(self._key_rows[key_id], num_rows, tombstones)
+            if row is not None:
+                rows.append(row)
+                if len(rows) == limit:
+                    break
+        return rows
+
+    def _first_live(
+        self,
+        rows: Sequence[int],
+        num_rows: int | None,
+        tombstones: np.ndarray | None,
+    ) -> int | None:
+        """Get the first of ``rows`` below ``num_rows`` that is not tombstoned."""
+        if num_rows is None:
+            num_rows = self.num_rows
+        for row in rows:
+            if row >= num_rows:
+                break
+            if tombstones is None or not tombstones[row]:
+                return row
+        return None
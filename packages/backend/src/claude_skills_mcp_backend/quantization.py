@@ -0,0 +1,161 @@
+"""Compact embedding storage for the first-pass similarity scan."""
+
+import logging
+import tempfile
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STORAGE_MODES = ("float32", "float16", "int8")
+
+# Rows converted to float32 at a time while scanning, bounding temporary memory
+_SCAN_BLOCK_ROWS = 4096
+
+
+class QuantizedMatrix:
+    """Read-only float16 or int8 (per-row scale) copy of an embeddings matrix.
+
+    Only used to compute approximate similarities for a first-pass scan;
+    callers rescore a shortlist against the full-precision rows.
+
+    Attributes
+    ----------
+    mode : str
+        "float16" or "int8".
+    codes : np.ndarray
+        Quantized rows, shape (N, D).
+    scales : np.ndarray | None
+        Float32 per-row scale for int8 codes (``row ~= codes * scale``),
+        None for float16.
+    """
+
+    def __init__(self, mode: str, codes: np.ndarray, scales: np.ndarray | None):
+        """Wrap already-quantized rows.
+
+        Parameters
+        ----------
+        mode : str
+            "float16" or "int8".
+        codes : np.ndarray
+            Quantized rows.
+        scales : np.ndarray | None
+            Per-row scales for int8 codes.
+        """
+        self.mode = mode
+        self.codes = codes
+        self.scales = scales
+        for array in (codes, scales):
+            if array is not None:
+                array.flags.writeable = False
+
+    @classmethod
+    def quantize(cls, matrix: np.ndarray, mode: str) -> "QuantizedMatrix":
+        """Quantize a float matrix.
+
+        Parameters
+        ----------
+        matrix : np.ndarray
+            Float matrix of shape (N, D).
+        mode : str
+            "float16" or "int8".
+
+        Returns
+        -------
+        QuantizedMatrix
+            Quantized copy of ``matrix``.
+
+        Raises
+        ------
+        ValueError
+            If the mode is not a quantized storage mode.
+        """
+        if mode == "float16":
+            return cls(mode, np.ascontiguousarray(matrix, dtype=np.float16), None)
+        if mode == "int8":
+            max_abs = np.abs(matrix).max(axis=1) if len(matrix) else np.empty(0)
+            scales = (np.maximum(max_abs, 1e-12) / 127.0).astype(np.float32)
+            codes = np.rint(matrix / scales[:, None]).astype(np.int8)
+            return cls(mode, codes, scales)
+        raise ValueError(f"Not a quantized storage mode: {mode!r}")
+
+    def slice(self, start: int, stop: int) -> "QuantizedMatrix":
+        """Get a contiguous range of rows without copying.
+
+        Parameters
+        ----------
+        start : int
+            First row.
+        stop : int
+            Row after the last one.
+
+        Returns
+        -------
+        QuantizedMatrix
+            Matrix viewing rows ``start`` to ``stop`` of this one.
+        """
+        scales = None if self.scales is None else self.scales[start:stop]
+        return QuantizedMatrix(self.mode, self.codes[start:stop], scales)
+
+    def dot(self, queries: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """Compute approximate dot products with one or more queries.
+
+        Parameters
+        ----------
+        queries : np.ndarray
+            Float32 queries of shape (D,) or (Q, D).
+        rows : np.ndarray | None, optional
+            Row indices to score, by default all rows.
+
+        Returns
+        -------
+        np.ndarray
+            Float32 scores of shape (R,) or (Q, R).
+        """
+        codes = self.codes if rows is None else self.codes[rows]
+        scores = np.empty(queries.shape[:-1] + (len(codes),), dtype=np.float32)
+        for start in range(0, len(codes), _SCAN_BLOCK_ROWS):
+            block = codes[start : start + _SCAN_BLOCK_ROWS].astype(np.float32)
+            scores[..., start : start + len(block)] = queries @ block.T
+
+        if self.scales is not None:
+            scores *= self.scales if rows is None else self.scales[rows]
+        return scores
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the codes and scales, in bytes."""
+        return self.codes.nbytes + (0 if self.scales is None else self.scales.nbytes)
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.codes)
+
+
+def file_backed(matrix: np.ndarray) -> np.ndarray:
+    """Move a float32 matrix out of the heap into a read-only file mapping.
+
+    The matrix is written to an anonymous temporary file and mapped back,
+    so only the rows that are actually read (the rescoring shortlist) are
+    paged in, and the kernel can drop them again under memory pressure.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        Float32 matrix of shape (N, D).
+
+    Returns
+    -------
+    np.ndarray
+        Read-only memory-mapped copy (or ``matrix`` itself if it is empty).
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    if matrix.size == 0:
+        return matrix
+
+    with tempfile.TemporaryFile(prefix="claude_skills_vectors_") as f:
+        # Written through the file, not the mapping, so no pages become resident
+        matrix.tofile(f)
+        f.flush()
+        # The mapping keeps its own reference to the file after it is closed
+        return np.memmap(f, dtype=np.float32, mode="r", shape=matrix.shape)
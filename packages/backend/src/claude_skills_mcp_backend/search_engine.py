@@ -1,194 +1,2554 @@
 """Vector search engine for finding relevant skills."""
 
+import heapq
 import logging
 import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
 from typing import Any
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
+from .ann_index import IVFFlatIndex, create_ann_index
+from .chunking import chunk_skills
+from .embedding_cache import EmbeddingCache, QueryEmbeddingCache, hash_text
+from .encoder_pool import EncoderPool
+from .encoders import ENCODER_BACKENDS, Encoder, create_encoder, encoder_fingerprint
+from .index_compaction import graph_usable, live_graph, needs_compaction
+from .index_persistence import (
+    content_keys,
+    full_precision,
+    load_index_bundle,
+    load_or_store,
+    persisted_matrices,
+    save_index_bundle,
+    stored_versions,
+)
+from .index_snapshot import (
+    EncodedSkills,
+    IndexSnapshot,
+    SnapshotBuffers,
+    allowed_rows,
+    live_arrays,
+    live_rows,
+    mask_sources,
+    tombstone,
+)
+from .index_sync import plan_shard_sync, plan_sync
+from .keyword_search import add_staged_skills, keyword_search, keyword_snapshot
+from .lexical_index import BM25Index, tokenize_skill
+from .metadata_index import MetadataIndex, filter_keys, skill_metadata
+from .micro_batching import MicroBatcher
+from .name_index import NameIndex
+from .quantization import STORAGE_MODES, QuantizedMatrix
+from .search_results import SkillResult, attach_skill_sections, build_results
+from .skill_graph import SkillGraph
 from .skill_loader import Skill
+from .vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
+# Rows per partition below which splitting a scan across threads costs more
+# in scheduling than it saves
+_MIN_PARTITION_ROWS = 16384
+
 
 class SkillSearchEngine:
-    """Search engine for finding relevant skills using vector similarity.
+    """Search engine for finding relevant skills using vector similarity,
+    optionally fused with BM25 lexical matching.
 
     Attributes
     ----------
-    model : SentenceTransformer | None
+    model : Encoder | None
         Embedding model for generating vectors (lazy-loaded).
     model_name : str
         Name of the sentence-transformers model to use.
-    skills : list[Skill]
-        List of indexed skills.
+    encoder_backend : str
+        Backend running the model ("torch", "onnx", "onnx-int8" or
+        "hashing").
+    encoder_workers : int
+        Worker processes holding model replicas (0 encodes in-process).
+    model_fingerprint : str
+        Identifier of the embedding space, used to key the caches.
+    model_state : str
+        "not_loaded", "loading", "ready" or "failed".
+    model_load_seconds : float | None
+        Time the model took to load, once it is ready.
+    model_error : str | None
+        Error of the last failed load attempt.
+    skills : Sequence[Skill]
+        Indexed skills that are not tombstoned (from the current snapshot).
     embeddings : np.ndarray | None
-        Embeddings matrix for all skill descriptions.
-    _lock : threading.Lock
-        Lock for thread-safe access to skills and embeddings.
+        L2-normalized, C-contiguous float32 embeddings matrix for all skill
+        descriptions, so that scoring a query is a single matrix-vector product
+        (from the current snapshot).
+    vector_store : VectorStore | None
+        Host-wide store of memory-mapped embedding matrices, if enabled.
+    embedding_cache : EmbeddingCache | None
+        Persistent embedding store consulted before encoding (if enabled).
+    query_cache : QueryEmbeddingCache
+        LRU cache of query embeddings keyed by model name.
+    query_batcher : MicroBatcher | None
+        Coalesces query encodes from concurrent searches into batched model
+        calls, or None when micro-batching is disabled.
+    hybrid_search : bool
+        Whether BM25 lexical scores are fused with vector scores.
+    rrf_k : int
+        Rank offset used by reciprocal rank fusion.
+    chunk_content : bool
+        Whether skill content is chunked and embedded in addition to the
+        description.
+    chunk_size : int
+        Maximum content chunk length in characters.
+    ann_backend : str
+        Nearest-neighbour backend for description embeddings ("exact" or "ivf").
+    ann_n_probe : int
+        Clusters scanned per query by the IVF backend.
+    ann_min_skills : int
+        Corpus size below which the IVF backend falls back to exact search.
+    embedding_storage : str
+        In-memory storage of vectors for the first-pass scan ("float32",
+        "float16" or "int8").
+    rescore_depth : int
+        Number of top first-pass candidates rescored in full precision when
+        a quantized storage mode is used.
+    compaction_threshold : float | None
+        Fraction of tombstoned rows above which the index is compacted in a
+        background thread, or None to only compact on ``compact()``.
+    deduplicate : bool
+        Whether duplicate skills are collapsed into one canonical entry.
+    duplicate_threshold : float | None
+        Description similarity at or above which a skill with the same name
+        as an earlier one is a near-duplicate, or None for exact duplicates
+        only.
+    graph_k : int
+        Neighbours precomputed per skill for ``related_skills`` (0 disables
+        the graph).
+    search_threads : int
+        Threads that score partitions of a large index in parallel.
+    degraded_search : bool
+        Whether searches are ranked by BM25 keyword scores instead of
+        waiting while the model is not ready.
+    _snapshot : IndexSnapshot
+        Currently published index snapshot.
+    _write_lock : threading.Lock
+        Serializes publishing of new snapshots. Readers never take it.
+    _model_lock : threading.Lock
+        Guards lazy loading of the embedding model.
+    _compaction_lock : threading.Lock
+        Held while a compaction is running, so at most one runs at a time.
+    _compaction_thread : threading.Thread | None
+        Most recently started background compaction.
+    _scoring_pool : ThreadPoolExecutor | None
+        Threads scoring index partitions, or None when scans run serially.
+    _staged : IndexSnapshot
+        Keyword-only snapshot (no embeddings) of skills staged with
+        ``stage_skills`` while the model loads.
+    _staged_lock : threading.Lock
+        Serializes staging of skills.
     """
 
-    def __init__(self, model_name: str):
+    def __init__(
+        self,
+        model_name: str,
+        embedding_cache: bool = False,
+        query_cache_size: int = 1024,
+        hybrid_search: bool = False,
+        rrf_k: int = 60,
+        chunk_content: bool = False,
+        chunk_size: int = 1000,
+        ann_backend: str = "exact",
+        ann_n_probe: int = 16,
+        ann_min_skills: int = 2048,
+        embedding_storage: str = "float32",
+        rescore_depth: int = 100,
+        vector_store: bool = False,
+        compaction_threshold: float | None = 0.25,
+        encoder_backend: str = "torch",
+        query_batch_size: int = 1,
+        query_batch_wait_ms: float = 2.0,
+        encoder_workers: int = 0,
+        deduplicate: bool = True,
+        duplicate_threshold: float | None = 0.95,
+        graph_k: int = 10,
+        search_threads: int = 4,
+        degraded_search: bool = True,
+    ):
         """Initialize the search engine.
 
         Parameters
         ----------
         model_name : str
             Name of the sentence-transformers model to use.
+        embedding_cache : bool, optional
+            Persist skill embeddings on disk and reuse them across restarts
+            and reloads, by default False.
+        query_cache_size : int, optional
+            Maximum number of query embeddings kept in the LRU cache
+            (0 disables it), by default 1024.
+        hybrid_search : bool, optional
+            Fuse BM25 scores over name, description and content with vector
+            scores, by default False.
+        rrf_k : int, optional
+            Rank offset for reciprocal rank fusion, by default 60.
+        chunk_content : bool, optional
+            Also embed skill content in chunks and score each skill by its
+            best-matching chunk or description, by default False.
+        chunk_size : int, optional
+            Maximum content chunk length in characters, by default 1000.
+        ann_backend : str, optional
+            "exact" for brute-force scoring or "ivf" for an approximate
+            IVF-flat index, by default "exact".
+        ann_n_probe : int, optional
+            Clusters scanned per query by the IVF backend, by default 16.
+        ann_min_skills : int, optional
+            Corpus size at which the IVF index is trained, by default 2048.
+        embedding_storage : str, optional
+            "float32" keeps full-precision vectors in memory. "float16" or
+            "int8" (per-row scale) keep only quantized vectors in memory for
+            the first-pass scan and move full-precision vectors to a
+            memory-mapped file used to rescore the top ``rescore_depth``
+            candidates, by default "float32".
+        rescore_depth : int, optional
+            Candidates rescored in full precision, by default 100.
+        vector_store : bool, optional
+            Keep full-precision matrices in content-addressed ``.npy`` files
+            mapped read-only, shared by all processes on the host, by
+            default False.
+        compaction_threshold : float | None, optional
+            Compact in the background once more than this fraction of rows
+            is tombstoned by ``remove_skills``, ``update_skill`` or
+            ``upsert_skills`` (None disables automatic compaction), by
+            default 0.25.
+        encoder_backend : str, optional
+            "torch" (sentence-transformers on PyTorch), "onnx" or
+            "onnx-int8" (ONNX Runtime on the CPU, the latter with int8
+            weights) or "hashing" (deterministic test encoder), by default
+            "torch".
+        query_batch_size : int, optional
+            Queries encoded together by the micro-batcher (1 disables
+            micro-batching), by default 1.
+        query_batch_wait_ms : float, optional
+            Longest time a query waits for others to share its batch, by
+            default 2.0.
+        encoder_workers : int, optional
+            Run this many encoder replicas in worker processes, returning
+            embeddings through shared memory, so encoding throughput scales
+            with cores (0 encodes in this process), by default 0.
+        deduplicate : bool, optional
+            Collapse skills with the same name, description and content
+            (e.g. vendored copies or forks) into the first one, listing the
+            others as alternate sources, before they are encoded, by
+            default True.
+        duplicate_threshold : float | None, optional
+            Also collapse a skill with the same name and content as an
+            earlier one whose description embedding has at least this
+            cosine similarity (None only collapses exact duplicates), by
+            default 0.95.
+        graph_k : int, optional
+            Maintain a graph of each skill's ``graph_k`` most similar skills
+            so ``related_skills`` is a lookup (0 disables it, and
+            ``related_skills`` scans the embeddings instead), by default 10.
+        search_threads : int, optional
+            Split scans of indexes with more than ``_MIN_PARTITION_ROWS``
+            rows per thread into contiguous partitions scored concurrently
+            (NumPy releases the GIL in matrix products) and merge their
+            top-k lists (1 scans serially), by default 4.
+        degraded_search : bool, optional
+            While the model is not ready, rank searches by BM25 keyword
+            scores (over the index when it has a keyword index, otherwise
+            over skills staged with ``stage_skills``) and start loading the
+            model in the background instead of blocking, by default True.
+
+        Raises
+        ------
+        ValueError
+            If ``ann_backend``, ``embedding_storage`` or ``encoder_backend``
+            is unknown.
         """
+        if embedding_storage not in STORAGE_MODES:
+            raise ValueError(
+                f"Unknown embedding storage: {embedding_storage!r} "
+                f"(expected one of {', '.join(STORAGE_MODES)})"
+            )
+        if encoder_backend not in ENCODER_BACKENDS:
+            raise ValueError(
+                f"Unknown encoder backend: {encoder_backend!r} "
+                f"(expected one of {', '.join(ENCODER_BACKENDS)})"
+            )
         logger.info(
-            f"Search engine initialized (model: {model_name}, lazy-loading enabled)"
+            f"Search engine initialized (model: {model_name}, "
+            f"encoder: {encoder_backend}, lazy-loading enabled)"
         )
-        self.model: SentenceTransformer | None = None
+        self.model: Encoder | None = None
+        self.model_state = "not_loaded"
+        self.model_load_seconds: float | None = None
+        self.model_error: str | None = None
         self.model_name = model_name
-        self.skills: list[Skill] = []
-        self.embeddings: np.ndarray | None = None
-        self._lock = threading.Lock()
+        self.encoder_backend = encoder_backend
+        self.encoder_workers = encoder_workers
+        self.model_fingerprint = encoder_fingerprint(encoder_backend, model_name)
+        self.embedding_cache = (
+            EmbeddingCache(self.model_fingerprint) if embedding_cache else None
+        )
+        self.vector_store = (
+            VectorStore(self.model_fingerprint) if vector_store else None
+        )
+        self.query_cache = QueryEmbeddingCache(query_cache_size)
+        self.query_batcher = None
+        if query_batch_size > 1:
+            self.query_batcher = MicroBatcher(
+                lambda texts: self._ensure_model_loaded().encode(texts),
+                max_batch_size=query_batch_size,
+                max_wait_ms=query_batch_wait_ms,
+            )
+        self.hybrid_search = hybrid_search
+        self.rrf_k = rrf_k
+        self.chunk_content = chunk_content
+        self.chunk_size = chunk_size
+        self.ann_backend = ann_backend
+        self.ann_n_probe = ann_n_probe
+        self.ann_min_skills = ann_min_skills
+        self.embedding_storage = embedding_storage
+        self.rescore_depth = rescore_depth
+        self.compaction_threshold = compaction_threshold
+        self.deduplicate = deduplicate
+        self.duplicate_threshold = duplicate_threshold
+        self.graph_k = graph_k
+        self.search_threads = search_threads
+        self.degraded_search = degraded_search
+        self._scoring_pool = None
+        if search_threads > 1:
+            self._scoring_pool = ThreadPoolExecutor(
+                search_threads, thread_name_prefix="search-scoring"
+            )
+        # Validate the backend name early
+        self._create_ann()
+        self._snapshot = IndexSnapshot()
+        # Append-only buffers shared by snapshots built with add_skills
+        self._buffers = SnapshotBuffers()
+        self._write_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: threading.Thread | None = None
+        self._staged = IndexSnapshot()
+        self._staged_lock = threading.Lock()
+
+    @property
+    def skills(self) -> Sequence[Skill]:
+        """Live (not tombstoned) skills in the currently published snapshot."""
+        snapshot = self._snapshot
+        if snapshot.tombstones is None:
+            return snapshot.skills
+        return [snapshot.skills[i] for i in np.flatnonzero(~snapshot.tombstones)]
+
+    @property
+    def embeddings(self) -> np.ndarray | None:
+        """Embeddings matrix of the currently published snapshot."""
+        return self._snapshot.embeddings
+
+    def get_snapshot(self) -> IndexSnapshot:
+        """Get the currently published index snapshot.
+
+        Returns
+        -------
+        IndexSnapshot
+            Consistent view of skills and embeddings.
+        """
+        return self._snapshot
+
+    def _publish(
+        self, skills: Sequence[Skill], embeddings: np.ndarray | None, **indexes: Any
+    ) -> None:
+        """Publish a new snapshot. Must be called with ``_write_lock`` held.
 
-    def _ensure_model_loaded(self) -> SentenceTransformer:
+        Parameters
+        ----------
+        skills : Sequence[Skill]
+            Skills of the new snapshot.
+        embeddings : np.ndarray | None
+            Normalized embeddings matrix of the new snapshot.
+        **indexes : Any
+            Remaining ``IndexSnapshot`` fields (lexical, chunk and ANN
+            indexes, tombstones); omitted fields take their defaults.
+        """
+        for value in (embeddings, *indexes.values()):
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+        self._snapshot = IndexSnapshot(
+            skills=skills,
+            embeddings=embeddings,
+            version=self._snapshot.version + 1,
+            **indexes,
+        )
+
+    def _create_ann(self) -> IVFFlatIndex | None:
+        """Create an empty nearest-neighbour index for the configured backend."""
+        return create_ann_index(
+            self.ann_backend,
+            n_probe=self.ann_n_probe,
+            min_train_size=self.ann_min_skills,
+        )
+
+    def _quantize(self, matrix: np.ndarray | None) -> QuantizedMatrix | None:
+        """Quantize a matrix for the configured storage mode, if any."""
+        if matrix is None or self.embedding_storage == "float32":
+            return None
+        return QuantizedMatrix.quantize(matrix, self.embedding_storage)
+
+    def _ensure_model_loaded(self) -> Encoder:
         """Ensure the embedding model is loaded (lazy initialization).
 
+        If another thread (e.g. ``warm_up``) is loading the model, waits
+        for that load instead of starting a second one.
+
         Returns
         -------
-        SentenceTransformer
+        Encoder
             The loaded embedding model.
         """
         if self.model is None:
-            logger.info(f"Loading embedding model: {self.model_name}")
-            self.model = SentenceTransformer(self.model_name)
-            logger.info(f"Embedding model loaded: {self.model_name}")
+            with self._model_lock:
+                if self.model is None:
+                    logger.info(
+                        f"Loading embedding model: {self.model_name} "
+                        f"({self.encoder_backend})"
+                    )
+                    self.model_state = "loading"
+                    start = time.perf_counter()
+                    try:
+                        if self.encoder_workers > 0:
+                            model = EncoderPool(
+                                self.encoder_backend,
+                                self.model_name,
+                                self.encoder_workers,
+                            )
+                        else:
+                            model = create_encoder(
+                                self.encoder_backend, self.model_name
+                            )
+                    except Exception as e:
+                        self.model_state = "failed"
+                        self.model_error = str(e)
+                        raise
+                    self.model_load_seconds = time.perf_counter() - start
+                    self.model = model
+                    self.model_state = "ready"
+                    logger.info(
+                        f"Embedding model loaded: {self.model_name} "
+                        f"({self.model_load_seconds:.1f}s)"
+                    )
         return self.model
 
-    def index_skills(self, skills: list[Skill]) -> None:
-        """Index a list of skills by generating their embeddings.
+    def warm_up(self) -> threading.Thread:
+        """Load the embedding model in a background thread.
+
+        Lets the model load overlap with skill fetching, so the first batch
+        of skills can be encoded as soon as it arrives. One throwaway text
+        is encoded as well, so one-time runtime initialization is not paid
+        by the first real request.
+
+        Returns
+        -------
+        threading.Thread
+            The started (daemon) thread.
+        """
+
+        def load() -> None:
+            try:
+                self._ensure_model_loaded().encode(["warm-up"])
+            except Exception as e:
+                logger.error(f"Failed to load embedding model: {e}", exc_info=True)
+
+        thread = threading.Thread(target=load, name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def get_readiness(self) -> dict[str, Any]:
+        """Report the readiness of the model and of the index separately.
+
+        Returns
+        -------
+        dict[str, Any]
+            "model" (state, load time and last error), "index" (live
+            skills, collapsed duplicates, snapshot version and per-source
+            shards) and "search_mode" (see ``search_mode``) entries.
+        """
+        snapshot = self._snapshot
+        model: dict[str, Any] = {
+            "state": self.model_state,
+            "backend": self.encoder_backend,
+            "load_seconds": self.model_load_seconds,
+        }
+        if self.model_error and self.model_state != "ready":
+            model["error"] = self.model_error
+        return {
+            "model": model,
+            "index": {
+                "skills": snapshot.num_live,
+                "duplicates": sum(map(len, snapshot.duplicates.values())),
+                "version": snapshot.version,
+                "shards": self.shard_stats(),
+            },
+            "search_mode": self.search_mode,
+        }
+
+    @property
+    def search_mode(self) -> str:
+        """How a search issued now is ranked: "hybrid", "vector" or "keyword"."""
+        if self._keyword_snapshot() is not None:
+            return "keyword"
+        return "hybrid" if self.hybrid_search else "vector"
+
+    def _keyword_snapshot(self) -> IndexSnapshot | None:
+        """Pick the snapshot to rank by keywords, see ``keyword_snapshot``."""
+        return keyword_snapshot(
+            self._snapshot,
+            self._staged,
+            self.model_state == "ready",
+            self.degraded_search,
+        )
+
+    def stage_skills(self, skills: list[Skill]) -> None:
+        """Make skills keyword-searchable before they can be encoded.
+
+        Staged skills only get BM25 and filter entries, which need no model.
+        With ``degraded_search``, searches rank them while the model loads
+        and the index is empty, then switch to the index once both are
+        ready. Skills whose source is already staged are skipped.
 
         Parameters
         ----------
         skills : list[Skill]
-            Skills to index.
+            Parsed skills, usually also passed to ``add_skills`` later.
         """
-        with self._lock:
-            if not skills:
-                logger.warning("No skills to index")
-                self.skills = []
-                self.embeddings = None
+        with self._staged_lock:
+            staged = self._staged
+            new_staged = add_staged_skills(staged, skills)
+            if new_staged is None:
                 return
+            self._staged = new_staged
+        logger.info(
+            f"Staged {len(new_staged.skills) - len(staged.skills)} skills "
+            "for keyword search"
+        )
+
+    def discard_staged(self) -> None:
+        """Drop the staged skills once they are all indexed."""
+        with self._staged_lock:
+            self._staged = IndexSnapshot()
+
+    def shard_stats(self) -> dict[str, dict[str, int]]:
+        """Account the live skills and vector memory of each source shard.
+
+        Returns
+        -------
+        dict[str, dict[str, int]]
+            For each shard key (see ``Skill.shard``), its "skills", content
+            "chunks" and the in-memory "bytes" of their vectors (quantized
+            codes when a quantized storage mode is used).
+        """
+        snapshot = self._snapshot
+        if snapshot.embeddings is None:
+            return {}
+
+        def row_bytes(matrix: np.ndarray, quantized: QuantizedMatrix | None) -> float:
+            in_memory = matrix if quantized is None else quantized
+            return in_memory.nbytes / max(len(matrix), 1)
+
+        description_bytes = row_bytes(snapshot.embeddings, snapshot.quantized)
+        chunk_counts = None
+        chunk_bytes = 0.0
+        if snapshot.chunk_embeddings is not None:
+            chunk_counts = np.diff(snapshot.chunk_offsets)
+            chunk_bytes = row_bytes(
+                snapshot.chunk_embeddings, snapshot.quantized_chunks
+            )
+
+        stats: dict[str, dict[str, int]] = {}
+        for row in live_rows(snapshot).values():
+            shard = stats.setdefault(
+                snapshot.skills[row].shard, {"skills": 0, "chunks": 0, "bytes": 0}
+            )
+            chunks = 0 if chunk_counts is None else int(chunk_counts[row])
+            shard["skills"] += 1
+            shard["chunks"] += chunks
+            shard["bytes"] += round(description_bytes + chunks * chunk_bytes)
+        return stats
+
+    def _encode_texts(self, texts: list[str], label: str = "Embeddings") -> np.ndarray:
+        """Embed texts in bulk, reusing cached vectors when possible.
+
+        Parameters
+        ----------
+        texts : list[str]
+            Texts to embed.
+        label : str, optional
+            Prefix for the cache statistics log line, by default "Embeddings".
+
+        Returns
+        -------
+        np.ndarray
+            Embeddings matrix with one row per text.
+        """
+        if self.embedding_cache is None:
+            model = self._ensure_model_loaded()
+            return model.encode(texts)
 
-            logger.info(f"Indexing {len(skills)} skills...")
-            self.skills = skills
+        keys = [hash_text(text) for text in texts]
+        cached = self.embedding_cache.get_many(keys)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
 
-            # Generate embeddings from skill descriptions
-            descriptions = [skill.description for skill in skills]
+        if missing:
             model = self._ensure_model_loaded()
-            self.embeddings = model.encode(descriptions, convert_to_numpy=True)
+            new_embeddings = model.encode([texts[i] for i in missing])
+            for row, i in enumerate(missing):
+                cached[i] = new_embeddings[row]
+            self.embedding_cache.put_many([keys[i] for i in missing], new_embeddings)
 
-            logger.info(f"Successfully indexed {len(skills)} skills")
+        logger.info(
+            f"{label}: {len(texts) - len(missing)} from cache, {len(missing)} encoded"
+        )
+        return np.stack(cached).astype(np.float32, copy=False)
 
-    def add_skills(self, skills: list[Skill]) -> None:
-        """Add skills incrementally and update embeddings.
+    def _flush_embedding_cache(self, prune: bool = False) -> None:
+        """Write the embeddings encoded since the last flush to the cache.
+
+        Called once per load or sync rather than per encoded batch, so
+        saving stays linear in the number of new embeddings.
+
+        Parameters
+        ----------
+        prune : bool, optional
+            Also bound the cache to the texts of the live skills, by default
+            False. Use when the index holds the complete skill set.
+        """
+        if self.embedding_cache is None:
+            return
+        if not prune:
+            self.embedding_cache.save()
+            return
+
+        skills = self.skills
+        keys = {hash_text(skill.description) for skill in skills}
+        if self.chunk_content:
+            chunks, _ = chunk_skills(skills, self.chunk_size)
+            keys.update(hash_text(chunk) for chunk in chunks)
+        dropped = self.embedding_cache.prune(keys)
+        if dropped:
+            logger.info(f"Dropped {dropped} cached embeddings no skill uses")
+
+    def _encode_descriptions(self, skills: list[Skill]) -> np.ndarray:
+        """Generate description embeddings, reusing cached vectors when possible.
 
         Parameters
         ----------
         skills : list[Skill]
-            Skills to add to the index.
+            Skills whose descriptions should be embedded.
+
+        Returns
+        -------
+        np.ndarray
+            Embeddings matrix with one row per skill.
+        """
+        return self._encode_texts([skill.description for skill in skills])
+
+    def _load_or_store(
+        self, kind: str, keys: list[str], compute: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """Get a matrix from the vector store, see ``load_or_store``."""
+        return load_or_store(
+            self.vector_store, kind, keys, compute, stored_versions(self._snapshot)
+        )
+
+    def _encode_chunks(
+        self, skills: list[Skill], dimension: int, persist: bool = False
+    ) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """Chunk and embed skill content if content chunking is enabled.
+
+        Parameters
+        ----------
+        skills : list[Skill]
+            Skills whose content should be embedded.
+        dimension : int
+            Embedding dimension, used to shape an empty chunk matrix without
+            loading the model.
+        persist : bool, optional
+            Load and save the chunk matrix through the vector store, by
+            default False.
+
+        Returns
+        -------
+        tuple[np.ndarray | None, np.ndarray | None]
+            Normalized chunk embeddings and chunk offsets (relative to the
+            first skill), or (None, None) when chunking is disabled.
+        """
+        if not self.chunk_content:
+            return None, None
+
+        chunks, offsets = chunk_skills(skills, self.chunk_size)
+        if not chunks:
+            return np.empty((0, dimension), dtype=np.float32), offsets
+
+        def compute() -> np.ndarray:
+            return self._normalize_rows(
+                self._encode_texts(chunks, label="Chunk embeddings")
+            )
+
+        if not persist:
+            return compute(), offsets
+        return self._load_or_store(
+            f"chunks:{self.chunk_size}", content_keys(skills), compute
+        ), offsets
+
+    @staticmethod
+    def _content_hash(skill: Skill) -> str:
+        """Hash the SKILL.md payload (name, description and content) of a skill."""
+        return hash_text(
+            "\0".join((skill.name, skill.description, skill.content or ""))
+        )
+
+    def _collapse_duplicates(
+        self, skills: list[Skill], snapshot: IndexSnapshot, against_index: bool
+    ) -> tuple[list[Skill], dict[str, list[Skill]]]:
+        """Drop duplicate skills before they are encoded.
+
+        A skill is dropped when an earlier skill (in ``skills`` or, with
+        ``against_index``, a live skill of ``snapshot``) has the same name,
+        description and content, or when ``snapshot`` recorded it as a
+        near-duplicate and neither it nor its canonical skill changed.
+
+        Parameters
+        ----------
+        skills : list[Skill]
+            Skills to index, in priority order (the first copy is kept).
+        snapshot : IndexSnapshot
+            Current snapshot.
+        against_index : bool
+            Whether the live skills of ``snapshot`` stay indexed and are
+            canonical candidates (incremental adds).
+
+        Returns
+        -------
+        tuple[list[Skill], dict[str, list[Skill]]]
+            Skills to encode, and the dropped duplicates keyed by the source
+            of their canonical skill.
+        """
+        duplicates: dict[str, list[Skill]] = defaultdict(list)
+        if not self.deduplicate:
+            return list(skills), duplicates
+
+        rows_by_source = live_rows(snapshot)
+        # Content hash -> canonical source
+        canonical: dict[str, str] = {}
+        if against_index:
+            names = {skill.name.lower() for skill in skills}
+            for row in rows_by_source.values():
+                indexed = snapshot.skills[row]
+                if indexed.name.lower() in names:
+                    canonical.setdefault(self._content_hash(indexed), indexed.source)
+
+        # Near-duplicates collapsed earlier: source -> (canonical source,
+        # canonical content hash, own content hash)
+        known: dict[str, tuple[str, str, str]] = {}
+        for source, collapsed in snapshot.duplicates.items():
+            if source in rows_by_source:
+                indexed = snapshot.skills[rows_by_source[source]]
+                source_hash = self._content_hash(indexed)
+                for skill in collapsed:
+                    known[skill.source] = (
+                        source,
+                        source_hash,
+                        self._content_hash(skill),
+                    )
+
+        kept: list[Skill] = []
+        kept_hashes: dict[str, str] = {}
+        for skill in skills:
+            content_hash = self._content_hash(skill)
+            target = canonical.get(content_hash)
+            if target is None and skill.source in known:
+                source, source_hash, own_hash = known[skill.source]
+                if own_hash == content_hash and (
+                    kept_hashes.get(source) == source_hash
+                    or (against_index and source in rows_by_source)
+                ):
+                    target = source
+
+            if target is None:
+                canonical[content_hash] = skill.source
+                kept_hashes[skill.source] = content_hash
+                kept.append(skill)
+            elif target != skill.source:
+                duplicates[target].append(skill)
+
+        if len(kept) < len(skills):
+            logger.info(f"Collapsed {len(skills) - len(kept)} duplicate skills")
+        return kept, duplicates
+
+    def _collapse_near_duplicates(
+        self,
+        skills: list[Skill],
+        embeddings: np.ndarray,
+        duplicates: dict[str, list[Skill]],
+        snapshot: IndexSnapshot | None = None,
+    ) -> np.ndarray:
+        """Find skills whose description nearly matches a same-name skill.
+
+        Only skills with the same (case-insensitive) name and the same
+        content are compared, so a reworded description of a copied skill
+        is collapsed, while different skills that share a name and a
+        boilerplate description are not. This costs one dot product per
+        such pair.
+
+        Parameters
+        ----------
+        skills : list[Skill]
+            Encoded skills, in priority order.
+        embeddings : np.ndarray
+            Normalized description embeddings of ``skills``.
+        duplicates : dict[str, list[Skill]]
+            Dropped duplicates per canonical source; near-duplicates are
+            added to it.
+        snapshot : IndexSnapshot | None, optional
+            Snapshot whose live skills stay indexed and are canonical
+            candidates, by default none.
+
+        Returns
+        -------
+        np.ndarray
+            Rows of ``skills`` to keep.
+        """
+        if not self.deduplicate or self.duplicate_threshold is None:
+            return np.arange(len(skills))
+
+        def group_key(skill: Skill) -> tuple[str, str]:
+            return skill.name.lower(), hash_text(skill.content or "")
+
+        # (Name, content hash) -> (source, embedding) of the canonical
+        # skills so far
+        groups: dict[tuple[str, str], list[tuple[str, np.ndarray]]] = defaultdict(list)
+        if snapshot is not None and snapshot.embeddings is not None:
+            names = {skill.name.lower() for skill in skills}
+            for row in live_rows(snapshot).values():
+                indexed = snapshot.skills[row]
+                if indexed.name.lower() in names:
+                    groups[group_key(indexed)].append(
+                        (indexed.source, snapshot.embeddings[row])
+                    )
+
+        keep = np.ones(len(skills), dtype=bool)
+        for j, skill in enumerate(skills):
+            group = groups[group_key(skill)]
+            for source, vector in group:
+                if float(vector @ embeddings[j]) >= self.duplicate_threshold:
+                    keep[j] = False
+                    if source != skill.source:
+                        duplicates[source].append(skill)
+                    break
+            else:
+                group.append((skill.source, embeddings[j]))
+
+        if not keep.all():
+            logger.info(f"Collapsed {len(skills) - keep.sum()} near-duplicate skills")
+        return np.flatnonzero(keep)
+
+    def _gained_duplicates(
+        self, snapshot: IndexSnapshot, skills: list[Skill], embeddings: np.ndarray
+    ) -> bool:
+        """Check whether a snapshot now holds a duplicate of a deduplicated batch.
+
+        Parameters
+        ----------
+        snapshot : IndexSnapshot
+            Snapshot about to be appended to.
+        skills : list[Skill]
+            Skills that passed deduplication against an older snapshot.
+        embeddings : np.ndarray
+            Their normalized description embeddings.
+
+        Returns
+        -------
+        bool
+            True if a skill is an exact or near duplicate of a live skill of
+            ``snapshot``.
+        """
+        kept, _ = self._collapse_duplicates(skills, snapshot, against_index=True)
+        if len(kept) < len(skills):
+            return True
+        keep = self._collapse_near_duplicates(
+            skills, embeddings, defaultdict(list), snapshot
+        )
+        return len(keep) < len(skills)
+
+    @staticmethod
+    def _merge_duplicates(
+        current: Mapping[str, Sequence[Skill]], new: Mapping[str, Sequence[Skill]]
+    ) -> dict[str, tuple[Skill, ...]]:
+        """Copy a duplicates map with more duplicates (replacing by source)."""
+        merged = dict(current)
+        for source, skills in new.items():
+            by_source = {skill.source: skill for skill in merged.get(source, ())}
+            by_source.update((skill.source, skill) for skill in skills)
+            merged[source] = tuple(by_source.values())
+        return merged
+
+    @staticmethod
+    def _duplicate_sources(
+        duplicates: Mapping[str, Sequence[Skill]],
+    ) -> dict[str, list[str]]:
+        """Get the sources in a duplicates map, for comparing maps."""
+        return {
+            source: [skill.source for skill in skills]
+            for source, skills in duplicates.items()
+        }
+
+    @staticmethod
+    def _release_duplicates(
+        current: Mapping[str, tuple[Skill, ...]], sources: set[str]
+    ) -> tuple[dict[str, tuple[Skill, ...]], list[Skill], int]:
+        """Detach sources that are removed or replaced from a duplicates map.
+
+        Parameters
+        ----------
+        current : Mapping[str, tuple[Skill, ...]]
+            Duplicates map of the current snapshot.
+        sources : set[str]
+            Sources being removed or replaced.
+
+        Returns
+        -------
+        tuple[dict[str, tuple[Skill, ...]], list[Skill], int]
+            The new map, the duplicates whose canonical skill is in
+            ``sources`` (they must be indexed again on their own), and the
+            number of duplicates whose own source is in ``sources``.
+        """
+        released: dict[str, tuple[Skill, ...]] = {}
+        orphans: list[Skill] = []
+        detached = 0
+        for source, skills in current.items():
+            remaining = tuple(skill for skill in skills if skill.source not in sources)
+            detached += len(skills) - len(remaining)
+            if source in sources:
+                orphans.extend(remaining)
+            elif remaining:
+                released[source] = remaining
+        return released, orphans, detached
+
+    def index_skills(self, skills: list[Skill]) -> None:
+        """Index a list of skills by generating their embeddings.
+
+        The embeddings are computed without holding any lock; the new index
+        replaces the current one atomically once it is complete. Duplicate
+        skills are collapsed into the first copy (see ``deduplicate``).
+
+        Parameters
+        ----------
+        skills : list[Skill]
+            Skills to index.
         """
         if not skills:
+            logger.warning("No skills to index")
+            with self._write_lock:
+                self._publish([], None)
             return
 
-        with self._lock:
-            logger.info(f"Adding {len(skills)} skills to index...")
+        logger.info(f"Indexing {len(skills)} skills...")
+        skills, duplicates = self._collapse_duplicates(
+            skills, self._snapshot, against_index=False
+        )
 
-            # Generate embeddings for new skills
-            descriptions = [skill.description for skill in skills]
-            model = self._ensure_model_loaded()
-            new_embeddings = model.encode(descriptions, convert_to_numpy=True)
+        # Generate normalized embeddings from skill descriptions, or map them
+        # from the vector store if another process already computed them
+        embeddings = self._load_or_store(
+            "descriptions",
+            [hash_text(skill.description) for skill in skills],
+            lambda: self._normalize_rows(self._encode_descriptions(skills)),
+        )
+        keep = self._collapse_near_duplicates(skills, embeddings, duplicates)
+        skills, embeddings = self._select_rows(skills, embeddings, keep)
+        chunk_embeddings, chunk_offsets = self._encode_chunks(
+            skills, embeddings.shape[1], persist=True
+        )
 
-            # Append to existing skills and embeddings
-            self.skills.extend(skills)
+        self._publish_index(
+            skills, embeddings, chunk_embeddings, chunk_offsets, duplicates
+        )
+        self._flush_embedding_cache(prune=True)
+        logger.info(f"Successfully indexed {len(skills)} skills")
 
-            if self.embeddings is None:
-                # First batch of skills
-                self.embeddings = new_embeddings
-            else:
-                # Append to existing embeddings
-                self.embeddings = np.vstack([self.embeddings, new_embeddings])
+    def _select_rows(
+        self, skills: list[Skill], embeddings: np.ndarray, rows: np.ndarray
+    ) -> tuple[list[Skill], np.ndarray]:
+        """Keep only some skills and their description embeddings.
+
+        Parameters
+        ----------
+        skills : list[Skill]
+            Skills, one per row of ``embeddings``.
+        embeddings : np.ndarray
+            Normalized description embeddings.
+        rows : np.ndarray
+            Rows to keep, in order.
+
+        Returns
+        -------
+        tuple[list[Skill], np.ndarray]
+            The kept skills and their embeddings (stored in the vector store
+            under their own key when it is enabled).
+        """
+        if len(rows) == len(skills):
+            return skills, embeddings
+        kept = [skills[i] for i in rows]
+        return kept, self._load_or_store(
+            "descriptions",
+            [hash_text(skill.description) for skill in kept],
+            lambda: np.ascontiguousarray(embeddings[rows]),
+        )
+
+    def _publish_index(
+        self,
+        skills: list[Skill],
+        embeddings: np.ndarray,
+        chunk_embeddings: np.ndarray | None,
+        chunk_offsets: np.ndarray | None,
+        duplicates: Mapping[str, Sequence[Skill]],
+        graph: SkillGraph | None = None,
+    ) -> None:
+        """Build the derived indexes for a full set of skills and publish them.
+
+        Parameters
+        ----------
+        skills : list[Skill]
+            All skills of the new index.
+        embeddings : np.ndarray
+            Normalized description embeddings, one row per skill.
+        chunk_embeddings : np.ndarray | None
+            Normalized content chunk embeddings, if chunking is enabled.
+        chunk_offsets : np.ndarray | None
+            Chunk offsets per skill, if chunking is enabled.
+        duplicates : Mapping[str, Sequence[Skill]]
+            Skills collapsed into each canonical source.
+        graph : SkillGraph | None, optional
+            Similarity graph carried over from a previous index, by default
+            None (computed from ``embeddings``).
+        """
+        fields = self._build_index(
+            skills, embeddings, chunk_embeddings, chunk_offsets, graph=graph
+        )
+        fields["duplicates"] = self._merge_duplicates({}, duplicates)
+        with self._write_lock:
+            self._publish(list(skills), **fields)
+
+    def _build_index(
+        self,
+        skills: Sequence[Skill],
+        embeddings: np.ndarray,
+        chunk_embeddings: np.ndarray | None,
+        chunk_offsets: np.ndarray | None,
+        lexical: BM25Index | None = None,
+        graph: SkillGraph | None = None,
+    ) -> dict[str, Any]:
+        """Build the derived indexes for a full set of skills.
+
+        Parameters
+        ----------
+        skills : Sequence[Skill]
+            All skills of the new index.
+        embeddings : np.ndarray
+            Normalized description embeddings, one row per skill.
+        chunk_embeddings : np.ndarray | None
+            Normalized content chunk embeddings, if chunking is enabled.
+        chunk_offsets : np.ndarray | None
+            Chunk offsets per skill, if chunking is enabled.
+        lexical : BM25Index | None, optional
+            Prebuilt BM25 index over ``skills`` to use instead of building
+            one, if hybrid search is enabled.
+        graph : SkillGraph | None, optional
+            Prebuilt similarity graph over ``embeddings`` to use instead of
+            computing one, if it has ``graph_k`` neighbours per row.
+
+        Returns
+        -------
+        dict[str, Any]
+            Snapshot fields other than ``skills``, to pass to ``_publish``.
+        """
+        if not self.hybrid_search:
+            lexical = None
+        elif lexical is None:
+            lexical = BM25Index()
+            lexical.add_skills(skills)
+
+        metadata = MetadataIndex()
+        metadata.add_skills(skills)
+        names = NameIndex()
+        names.add_skills(skills)
+        attach_skill_sections(skills)
+
+        if self.graph_k <= 0:
+            graph = None
+        elif graph is None or graph.k != self.graph_k:
+            graph = SkillGraph.build(embeddings, self.graph_k)
 
+        ann = self._create_ann()
+        if ann is not None:
+            ann.extend(embeddings)
+
+        quantized = self._quantize(embeddings)
+        quantized_chunks = self._quantize(chunk_embeddings)
+
+        if quantized is not None:
+            scanned = quantized.nbytes + (
+                quantized_chunks.nbytes if quantized_chunks is not None else 0
+            )
             logger.info(
-                f"Successfully added {len(skills)} skills. Total: {len(self.skills)} skills"
+                f"Embedding storage: {self.embedding_storage}, "
+                f"{scanned / (1024 * 1024):.1f} MB in memory for the first-pass scan"
             )
 
-    def search(self, query: str, top_k: int = 3) -> list[dict[str, Any]]:
-        """Search for the most relevant skills based on a query.
+        return {
+            "embeddings": full_precision(embeddings, self.embedding_storage),
+            "lexical": lexical,
+            "chunk_embeddings": full_precision(
+                chunk_embeddings, self.embedding_storage
+            ),
+            "chunk_offsets": chunk_offsets,
+            "ann": ann,
+            "quantized": quantized,
+            "quantized_chunks": quantized_chunks,
+            "metadata": metadata,
+            "names": names,
+            "graph": graph,
+        }
+
+    def sync_skills(
+        self, skills: list[Skill], allow_clear: bool = False
+    ) -> dict[str, int]:
+        """Update the index to a freshly loaded skill list, encoding only changes.
+
+        Skills are matched to indexed ones by identity (``source``) and a
+        hash of their name, description and content. Unchanged skills keep
+        their embeddings; only added or modified skills are encoded, and
+        skills that disappeared are dropped. The result is published
+        atomically like ``index_skills``.
+
+        An empty list usually means the loader failed (rate limit, network
+        error) rather than that every skill was deleted, so it leaves a
+        non-empty index untouched unless ``allow_clear`` is set.
 
         Parameters
         ----------
-        query : str
-            The task description or query to search for.
-        top_k : int, optional
-            Number of top results to return, by default 3.
+        skills : list[Skill]
+            The complete new set of skills.
+        allow_clear : bool, optional
+            Clear the index when ``skills`` is empty, by default False.
 
         Returns
         -------
-        list[dict[str, Any]]
-            List of skill dictionaries with relevance scores, sorted by relevance.
+        dict[str, int]
+            Counts of "added", "modified", "removed" and "unchanged" skills.
         """
-        with self._lock:
-            if not self.skills or self.embeddings is None:
-                logger.warning("No skills indexed, returning empty results")
-                return []
+        current = self._snapshot
+        if not skills and current.num_live and not allow_clear:
+            logger.warning(
+                f"Sync got no skills, keeping the {current.num_live} indexed skills"
+            )
+            return {
+                "added": 0,
+                "modified": 0,
+                "removed": 0,
+                "unchanged": current.num_live,
+            }
+        if current.embeddings is None or not skills:
+            self.index_skills(skills)
+            return {
+                "added": len(skills),
+                "modified": 0,
+                "removed": current.num_live,
+                "unchanged": 0,
+            }
 
-            # Ensure top_k doesn't exceed available skills
-            top_k = min(top_k, len(self.skills))
+        skills, duplicates = self._collapse_duplicates(
+            skills, current, against_index=False
+        )
+        plan = plan_sync(current, skills)
+        stats = plan.stats
 
-            logger.info(f"Searching for: '{query}' (top_k={top_k})")
+        if plan.is_identity(current):
+            logger.info(f"Skills unchanged ({len(skills)}), keeping current index")
+            merged = self._merge_duplicates({}, duplicates)
+            if any(old is not new for old, new in zip(current.skills, skills)) or (
+                self._duplicate_sources(merged)
+                != self._duplicate_sources(current.duplicates)
+            ):
+                # Skills restored from an index bundle cannot fetch documents
+                # lazily; the freshly loaded copies can
+                self._refresh_skills(skills, duplicates=merged)
+            return stats
 
-            # Generate embedding for the query
-            model = self._ensure_model_loaded()
-            query_embedding = model.encode([query], convert_to_numpy=True)[0]
+        logger.info(
+            f"Syncing index: {stats['added']} added, {stats['modified']} modified, "
+            f"{stats['removed']} removed, {stats['unchanged']} unchanged"
+        )
+        changed_skills = [skills[j] for j in plan.changed]
+
+        def descriptions() -> np.ndarray:
+            new = None
+            if changed_skills:
+                new = self._normalize_rows(self._encode_descriptions(changed_skills))
+            return plan.gather(current.embeddings, new)
+
+        embeddings = self._load_or_store(
+            "descriptions",
+            [hash_text(skill.description) for skill in skills],
+            descriptions,
+        )
+        keep = self._collapse_near_duplicates(skills, embeddings, duplicates)
+        if len(keep) < len(skills):
+            skills, embeddings = self._select_rows(skills, embeddings, keep)
+            plan = plan.select(keep)
+            changed_skills = [skills[j] for j in plan.changed]
+
+        chunk_embeddings = chunk_offsets = None
+        if self.chunk_content and current.chunk_offsets is not None:
+            new_chunk_embeddings, new_offsets = None, np.zeros(1, dtype=np.int64)
+            if changed_skills:
+                new_chunk_embeddings, new_offsets = self._encode_chunks(
+                    changed_skills, embeddings.shape[1]
+                )
+            chunk_offsets = plan.chunk_offsets(current.chunk_offsets, new_offsets)
+            chunk_embeddings = self._load_or_store(
+                f"chunks:{self.chunk_size}",
+                content_keys(skills),
+                lambda: plan.gather_chunks(
+                    current.chunk_embeddings,
+                    current.chunk_offsets,
+                    new_chunk_embeddings,
+                    new_offsets,
+                    chunk_offsets,
+                ),
+            )
+        elif self.chunk_content:
+            chunk_embeddings, chunk_offsets = self._encode_chunks(
+                skills, embeddings.shape[1], persist=True
+            )
+        graph = None
+        if graph_usable(current, self.graph_k):
+            # Kept skills keep their neighbour lists (mapped to their new rows)
+            graph = current.graph.remap(plan.reuse, embeddings)
+        self._publish_index(
+            skills, embeddings, chunk_embeddings, chunk_offsets, duplicates, graph
+        )
+        self._flush_embedding_cache(prune=True)
+        logger.info(f"Successfully synced {len(skills)} skills")
+        return stats
 
-            # Compute cosine similarity
-            similarities = self._cosine_similarity(query_embedding, self.embeddings)
+    def add_skills(self, skills: list[Skill]) -> None:
+        """Add skills incrementally and update embeddings.
 
-            # Get top-k indices
-            top_indices = np.argsort(similarities)[::-1][:top_k]
+        New embeddings are written to the embedding cache by the next
+        ``persist`` (or sync), not per batch.
+
+        Parameters
+        ----------
+        skills : list[Skill]
+            Skills to add to the index.
+        """
+        if not skills:
+            return
 
-            # Build results
-            results = []
-            for idx in top_indices:
-                skill = self.skills[idx]
-                score = float(similarities[idx])
+        logger.info(f"Adding {len(skills)} skills to index...")
+        self._insert(skills, replace_existing=False)
 
-                result = skill.to_dict()
-                result["relevance_score"] = score
-                results.append(result)
+    def upsert_skills(self, skills: list[Skill]) -> dict[str, int]:
+        """Add skills, replacing indexed skills with the same ``source``.
 
-                logger.debug(f"Found skill: {skill.name} (score: {score:.4f})")
+        New rows are appended as in ``add_skills`` and the rows they replace
+        are tombstoned, so only the given skills are encoded and the rest
+        of the index is left untouched.
 
-            logger.info(f"Returning {len(results)} results")
-            return results
+        Parameters
+        ----------
+        skills : list[Skill]
+            Skills to insert or update.
 
-    @staticmethod
-    def _cosine_similarity(vec: np.ndarray, matrix: np.ndarray) -> np.ndarray:
-        """Compute cosine similarity between a vector and a matrix of vectors.
+        Returns
+        -------
+        dict[str, int]
+            Counts of "added" and "updated" skills.
+        """
+        if not skills:
+            return {"added": 0, "updated": 0}
+
+        logger.info(f"Upserting {len(skills)} skills...")
+        updated = self._insert(skills, replace_existing=True)
+        self._flush_embedding_cache()
+        self._maybe_compact()
+        return {"added": len(skills) - updated, "updated": updated}
+
+    def update_skill(self, skill: Skill) -> None:
+        """Replace the indexed skill with the same ``source``.
 
         Parameters
         ----------
-        vec : np.ndarray
-            Query vector.
-        matrix : np.ndarray
-            Matrix of vectors to compare against.
+        skill : Skill
+            New version of an indexed skill.
+
+        Raises
+        ------
+        KeyError
+            If no live skill (or collapsed duplicate) has the same source.
+        """
+        snapshot = self._snapshot
+        collapsed = {
+            duplicate.source
+            for duplicates in snapshot.duplicates.values()
+            for duplicate in duplicates
+        }
+        if skill.source not in live_rows(snapshot) and (skill.source not in collapsed):
+            raise KeyError(f"Skill not indexed: {skill.source}")
+        self.upsert_skills([skill])
+
+    def remove_skills(self, sources: list[str]) -> int:
+        """Remove skills by tombstoning their rows.
+
+        The rows stay in the matrices (and in the BM25 statistics) until
+        the next compaction, but searches no longer return them. Collapsed
+        duplicates with a removed source are dropped, and the duplicates of
+        a removed skill are indexed again on their own.
+
+        Parameters
+        ----------
+        sources : list[str]
+            Sources of the skills to remove; unknown sources are ignored.
 
         Returns
         -------
-        np.ndarray
-            Similarity scores.
+        int
+            Number of skills removed.
         """
-        # Normalize vectors
-        vec_norm = vec / np.linalg.norm(vec)
-        matrix_norm = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        with self._write_lock:
+            current = self._snapshot
+            rows_by_source = live_rows(current)
+            removed = set(sources)
+            rows = [
+                rows_by_source[source] for source in removed if source in rows_by_source
+            ]
+            duplicates, orphans, detached = self._release_duplicates(
+                current.duplicates, removed
+            )
+            if not rows and not detached:
+                return 0
 
-        # Compute dot product (cosine similarity for normalized vectors)
-        similarities = np.dot(matrix_norm, vec_norm)
+            tombstones = current.tombstones
+            if rows:
+                tombstones = tombstone(current, rows)
+            self._snapshot = replace(
+                current,
+                tombstones=tombstones,
+                num_dead=current.num_dead + len(rows),
+                version=current.version + 1,
+                duplicates=duplicates,
+            )
 
-        return similarities
+        logger.info(
+            f"Removed {len(rows) + detached} skills "
+            f"({current.num_live - len(rows)} left)"
+        )
+        if orphans:
+            self._insert(orphans, replace_existing=False)
+        self._maybe_compact()
+        return len(rows) + detached
+
+    def sync_shard(self, shard: str, skills: list[Skill]) -> dict[str, int]:
+        """Replace the skills of one source shard, leaving the others untouched.
+
+        Unlike ``sync_skills``, which rebuilds the whole index from the
+        complete skill list, only the given source is reconciled: its
+        skills that disappeared are tombstoned, changed ones are upserted
+        and new ones added (both collapsing duplicates), so only they are
+        encoded and the rows of every other shard stay where they are.
+
+        Parameters
+        ----------
+        shard : str
+            Shard key of the reloaded source (see ``source_key``).
+        skills : list[Skill]
+            The complete new set of skills of that source. They are indexed
+            with ``shard`` as their shard key (as copies if theirs differs,
+            so the given objects are not modified).
+
+        Returns
+        -------
+        dict[str, int]
+            Counts of "added", "modified", "removed" and "unchanged" skills.
+        """
+        plan = plan_shard_sync(self._snapshot, shard, skills)
+        stats = plan.stats
+        logger.info(
+            f"Syncing shard {shard}: {stats['added']} added, "
+            f"{stats['modified']} modified, {stats['removed']} removed, "
+            f"{stats['unchanged']} unchanged"
+        )
+
+        if plan.unchanged:
+            # Carry their shard and document fetcher into the index
+            self._refresh_skills(plan.unchanged)
+        if plan.stale:
+            self.remove_skills(plan.stale)
+        if plan.modified:
+            self.upsert_skills(plan.modified)
+        if plan.added:
+            self.add_skills(plan.added)
+        self._flush_embedding_cache(prune=True)
+        return stats
+
+    def _insert(self, skills: list[Skill], replace_existing: bool) -> int:
+        """Encode skills off-lock and append them to the current snapshot.
+
+        Skills that duplicate a live skill (other than the one they
+        replace) or an earlier skill of the batch are collapsed (see
+        ``deduplicate``) instead of being encoded and appended.
+
+        Parameters
+        ----------
+        skills : list[Skill]
+            Skills to append.
+        replace_existing : bool
+            Tombstone live rows with the same source as an appended skill,
+            and detach collapsed duplicates with that source.
+
+        Returns
+        -------
+        int
+            Number of indexed skills replaced.
+        """
+        sources = {skill.source for skill in skills} if replace_existing else set()
+        while True:
+            base = self._snapshot
+            # The rows being replaced are no canonical candidates for the new
+            # versions of their skills
+            candidates = mask_sources(base, sources)
+            new_skills, duplicates = self._collapse_duplicates(
+                skills, candidates, against_index=True
+            )
+
+            # Generate normalized embeddings and term counts for new skills
+            # (off-lock)
+            encoded = None
+            if new_skills:
+                new_embeddings = self._normalize_rows(
+                    self._encode_descriptions(new_skills)
+                )
+                keep = self._collapse_near_duplicates(
+                    new_skills, new_embeddings, duplicates, candidates
+                )
+                new_skills = [new_skills[i] for i in keep]
+                new_embeddings = new_embeddings[keep]
+            if new_skills:
+                new_chunk_embeddings, new_chunk_offsets = self._encode_chunks(
+                    new_skills, new_embeddings.shape[1]
+                )
+                encoded = EncodedSkills(
+                    new_embeddings,
+                    new_chunk_embeddings,
+                    new_chunk_offsets,
+                    self._quantize(new_embeddings),
+                    self._quantize(new_chunk_embeddings),
+                    [tokenize_skill(skill) for skill in new_skills],
+                )
+
+            with self._write_lock:
+                current = self._snapshot
+                if current is not base:
+                    rows_by_source = live_rows(current)
+                    if any(source not in rows_by_source for source in duplicates):
+                        # A canonical skill was removed meanwhile: start over
+                        # against the new snapshot
+                        continue
+                    if new_skills and self._gained_duplicates(
+                        mask_sources(current, sources), new_skills, new_embeddings
+                    ):
+                        # A concurrent add indexed a copy of one of these
+                        # skills: start over so it is collapsed, not appended
+                        continue
+
+                replaced: list[int] = []
+                detached = 0
+                orphans: list[Skill] = []
+                duplicate_map = current.duplicates
+                if replace_existing and current.skills:
+                    rows_by_source = live_rows(current)
+                    replaced = [
+                        rows_by_source[s] for s in sources if s in rows_by_source
+                    ]
+                    duplicate_map, orphans, detached = self._release_duplicates(
+                        current.duplicates, sources
+                    )
+                if duplicates:
+                    duplicate_map = self._merge_duplicates(duplicate_map, duplicates)
+
+                if encoded is None:
+                    tombstones = current.tombstones
+                    if replaced:
+                        # Every replacement was collapsed into another skill
+                        tombstones = tombstone(current, replaced)
+                    self._snapshot = replace(
+                        current,
+                        tombstones=tombstones,
+                        num_dead=current.num_dead + len(replaced),
+                        version=current.version + 1,
+                        duplicates=duplicate_map,
+                    )
+                else:
+                    self._append(current, new_skills, encoded, replaced, duplicate_map)
+                total = self._snapshot.num_live
+            break
+
+        logger.info(
+            f"Successfully indexed {len(new_skills)} skills, replacing "
+            f"{len(replaced)}. Total: {total} skills"
+        )
+        if orphans:
+            # Duplicates of a replaced skill are indexed on their own again
+            self._insert(orphans, replace_existing=False)
+        return len(replaced) + detached
+
+    def _append(
+        self,
+        current: IndexSnapshot,
+        skills: list[Skill],
+        encoded: EncodedSkills,
+        replaced: list[int],
+        duplicates: Mapping[str, tuple[Skill, ...]],
+    ) -> None:
+        """Publish ``current`` with encoded skills appended. Must hold ``_write_lock``.
+
+        Parameters
+        ----------
+        current : IndexSnapshot
+            Current snapshot.
+        skills : list[Skill]
+            Skills to append.
+        encoded : EncodedSkills
+            Their embeddings, quantized copies and term counts.
+        replaced : list[int]
+            Rows of ``current`` to tombstone.
+        duplicates : Mapping[str, tuple[Skill, ...]]
+            Duplicates map of the new snapshot.
+        """
+        lexical = current.lexical
+        if self.hybrid_search:
+            if lexical is None:
+                lexical = BM25Index()
+            # Appends are invisible to older snapshots, which only
+            # score their own prefix of documents
+            lexical.add_documents(encoded.documents)
+
+        metadata = current.metadata
+        if metadata is None:
+            metadata = MetadataIndex()
+        metadata.add_skills(skills)
+        names = current.names
+        if names is None:
+            names = NameIndex()
+        names.add_skills(skills)
+        attach_skill_sections(skills)
+
+        # Append into capacity-doubling buffers (amortized O(batch) per
+        # call instead of copying the whole index)
+        skill_view = self._buffers.append_skills(current.skills, skills)
+        embeddings = self._buffers.append_rows(
+            "embeddings", current.embeddings, encoded.embeddings
+        )
+        quantized = self._buffers.append_quantized(
+            "quantized", current.quantized, encoded.quantized
+        )
+
+        chunk_embeddings = chunk_offsets = quantized_chunks = None
+        if encoded.chunk_offsets is not None:
+            chunk_embeddings = self._buffers.append_rows(
+                "chunk_embeddings", current.chunk_embeddings, encoded.chunk_embeddings
+            )
+            if current.chunk_offsets is None:
+                chunk_offsets = self._buffers.append_rows(
+                    "chunk_offsets", None, encoded.chunk_offsets
+                )
+            else:
+                chunk_offsets = self._buffers.append_rows(
+                    "chunk_offsets",
+                    current.chunk_offsets,
+                    current.chunk_offsets[-1] + encoded.chunk_offsets[1:],
+                )
+            quantized_chunks = self._buffers.append_quantized(
+                "quantized_chunks",
+                current.quantized_chunks,
+                encoded.quantized_chunks,
+            )
+
+        ann = current.ann if current.skills else self._create_ann()
+        if ann is not None:
+            # Like the lexical index, older snapshots only see their prefix
+            ann.extend(embeddings)
+
+        graph = None
+        if graph_usable(current, self.graph_k):
+            graph = current.graph.extend(embeddings)
+        elif self.graph_k > 0:
+            graph = SkillGraph.build(embeddings, self.graph_k)
+
+        tombstones = None
+        if current.tombstones is not None or replaced:
+            tombstones = tombstone(current, replaced, len(skills))
+
+        self._publish(
+            skill_view,
+            embeddings,
+            lexical=lexical,
+            chunk_embeddings=chunk_embeddings,
+            chunk_offsets=chunk_offsets,
+            ann=ann,
+            quantized=quantized,
+            quantized_chunks=quantized_chunks,
+            tombstones=tombstones,
+            num_dead=current.num_dead + len(replaced),
+            metadata=metadata,
+            names=names,
+            duplicates=duplicates,
+            graph=graph,
+        )
+
+    def _refresh_skills(
+        self,
+        skills: Sequence[Skill],
+        duplicates: Mapping[str, tuple[Skill, ...]] | None = None,
+    ) -> None:
+        """Swap freshly loaded copies of unchanged skills into a new snapshot.
+
+        Published snapshots are never modified, so new copies (with their
+        shard, document fetcher and document list) replace the indexed
+        skills with the same source in a new snapshot; embeddings and the
+        other indexes are reused, and filter masks are rebuilt only if the
+        metadata of a skill changed.
+
+        Parameters
+        ----------
+        skills : Sequence[Skill]
+            Skills whose name, description and content match indexed ones
+            (live skills or collapsed duplicates).
+        duplicates : Mapping[str, tuple[Skill, ...]] | None, optional
+            Collapsed duplicates of the new snapshot, by default those of
+            the current snapshot with the given copies swapped in.
+        """
+        fresh = {skill.source: skill for skill in skills}
+        with self._write_lock:
+            current = self._snapshot
+            rows = {
+                row: fresh[source]
+                for source, row in live_rows(current).items()
+                if source in fresh and current.skills[row] is not fresh[source]
+            }
+            if duplicates is None:
+                duplicates = {
+                    source: tuple(fresh.get(copy.source, copy) for copy in copies)
+                    for source, copies in current.duplicates.items()
+                }
+            if not rows and duplicates == current.duplicates:
+                return
+
+            attach_skill_sections(rows.values())
+            new_skills = list(current.skills)
+            metadata = current.metadata
+            for row, skill in rows.items():
+                if skill_metadata(new_skills[row]) != skill_metadata(skill):
+                    metadata = None
+                new_skills[row] = skill
+            if metadata is None:
+                metadata = MetadataIndex()
+                metadata.add_skills(new_skills)
+
+            self._snapshot = replace(
+                current,
+                skills=new_skills,
+                metadata=metadata,
+                duplicates=duplicates,
+                version=current.version + 1,
+            )
+        logger.debug(f"Refreshed {len(rows)} unchanged skills")
+
+    def _maybe_compact(self) -> None:
+        """Start a background compaction if enough rows are tombstoned."""
+        if (
+            not needs_compaction(self._snapshot, self.compaction_threshold)
+            or self._compaction_lock.locked()
+        ):
+            return
+
+        self._compaction_thread = threading.Thread(
+            target=self.compact, name="skill-index-compaction", daemon=True
+        )
+        self._compaction_thread.start()
+
+    def compact(self) -> bool:
+        """Rewrite the index without its tombstoned rows.
+
+        The live rows are gathered (nothing is re-encoded) and the lexical,
+        ANN and quantized indexes rebuilt without holding the write lock.
+        If another write published a snapshot meanwhile, the result is
+        discarded and the next removal retries.
+
+        Returns
+        -------
+        bool
+            True if a compacted snapshot was published.
+        """
+        if not self._compaction_lock.acquire(blocking=False):
+            return False
+        try:
+            current = self._snapshot
+            if current.num_dead == 0:
+                return False
+
+            skills, embeddings, chunk_embeddings, chunk_offsets = live_arrays(current)
+            fields: dict[str, Any] = {"embeddings": None}
+            if skills:
+                fields = self._build_index(
+                    skills,
+                    embeddings,
+                    chunk_embeddings,
+                    chunk_offsets,
+                    graph=live_graph(current, embeddings, self.graph_k),
+                )
+
+            with self._write_lock:
+                if self._snapshot is not current:
+                    logger.info("Index changed during compaction, discarding it")
+                    return False
+                self._publish(skills, duplicates=current.duplicates, **fields)
+
+            logger.info(
+                f"Compacted index: dropped {current.num_dead} dead rows, "
+                f"{len(skills)} skills left"
+            )
+            return True
+        finally:
+            self._compaction_lock.release()
+
+    def persist(self) -> None:
+        """Save new cached embeddings and move matrices off the heap.
+
+        ``add_skills`` appends into heap buffers; call this once incremental
+        loading is finished. The embeddings encoded since the last save are
+        written to the embedding cache, which is pruned to the indexed
+        texts. With the vector store enabled, the process then maps the
+        same host-wide copy as other processes; with quantized storage,
+        full-precision rows move to a memory-mapped file.
+        """
+        self._flush_embedding_cache(prune=True)
+        if self.vector_store is None and self.embedding_storage == "float32":
+            return
+
+        while True:
+            current = self._snapshot
+            if current.embeddings is None:
+                return
+
+            # Write the matrices off-lock so writers are not blocked on I/O
+            embeddings, chunk_embeddings = persisted_matrices(
+                current, self.vector_store, self.embedding_storage, self.chunk_size
+            )
+
+            with self._write_lock:
+                if self._snapshot is not current:
+                    # A write happened meanwhile: store the new matrices
+                    continue
+                self._snapshot = replace(
+                    current,
+                    embeddings=embeddings,
+                    chunk_embeddings=chunk_embeddings,
+                    version=current.version + 1,
+                )
+                return
+
+    def save_bundle(self, path: str | Path) -> bool:
+        """Save the current index to a single-file bundle.
+
+        The bundle holds the live skills (with their collapsed duplicates),
+        the normalized description and chunk embeddings, the BM25 index, the
+        similarity graph and the model fingerprint, so ``load_bundle`` can
+        restore a searchable index without fetching, parsing or encoding
+        anything.
+
+        Parameters
+        ----------
+        path : str | Path
+            Bundle file, replaced atomically.
+
+        Returns
+        -------
+        bool
+            True if the bundle was written; False if the index is empty or
+            the file could not be written.
+        """
+        return save_index_bundle(
+            path,
+            self._snapshot,
+            model_fingerprint=self.model_fingerprint,
+            chunk_size=self.chunk_size,
+            hybrid_search=self.hybrid_search,
+            graph_k=self.graph_k,
+        )
+
+    def load_bundle(self, path: str | Path) -> bool:
+        """Replace the index with one saved by ``save_bundle``.
+
+        Embeddings and the similarity graph are mapped read-only from the
+        bundle and the BM25 index is rebuilt from its arrays; only the
+        metadata, ANN and quantized indexes are recomputed. The model is not
+        needed (nor loaded). Restored skills cannot fetch documents lazily
+        until a ``sync_skills`` with freshly loaded skills.
+
+        Parameters
+        ----------
+        path : str | Path
+            Bundle file.
+
+        Returns
+        -------
+        bool
+            True if the bundle was loaded; False if it is missing, invalid,
+            or was built with another model or chunking configuration.
+        """
+        start = time.perf_counter()
+        restored = load_index_bundle(
+            path,
+            model_fingerprint=self.model_fingerprint,
+            chunk_size=self.chunk_size if self.chunk_content else None,
+            hybrid_search=self.hybrid_search,
+        )
+        if restored is None:
+            return False
+
+        fields = self._build_index(
+            restored.skills,
+            restored.embeddings,
+            restored.chunk_embeddings,
+            restored.chunk_offsets,
+            lexical=restored.lexical,
+            graph=restored.graph,
+        )
+        fields["duplicates"] = restored.duplicates
+        with self._write_lock:
+            self._publish(restored.skills, **fields)
+        logger.info(
+            f"Loaded index bundle with {len(restored.skills)} skills from {path} "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+        return True
+
+    @staticmethod
+    def _find_row(snapshot: IndexSnapshot, skill_name: str) -> int | None:
+        """Find the row of a live skill of a snapshot by name."""
+        if snapshot.names is None:
+            return None
+        return snapshot.names.lookup(
+            skill_name, len(snapshot.skills), snapshot.tombstones
+        )
+
+    def _name_snapshots(self) -> list[IndexSnapshot]:
+        """Snapshots to look names up in: the index, then the staged skills."""
+        return [self._snapshot, self._staged]
+
+    def get_skill(self, skill_name: str) -> Skill | None:
+        """Find a skill by name.
+
+        A hash lookup in the name index of the current snapshot; while
+        the index is still being built, skills staged for keyword search
+        are found as well.
+
+        Parameters
+        ----------
+        skill_name : str
+            Exact name of the skill, or the name with different case or
+            separators (e.g. "pdf processing" for "PDF-Processing").
+
+        Returns
+        -------
+        Skill | None
+            The first live skill with that name (exact matches first), or
+            None if there is none.
+        """
+        for snapshot in self._name_snapshots():
+            row = self._find_row(snapshot, skill_name)
+            if row is not None:
+                return snapshot.skills[row]
+        return None
+
+    def suggest_skill_names(self, skill_name: str, limit: int = 3) -> list[str]:
+        """Suggest names of indexed skills similar to a name that matched none.
+
+        Parameters
+        ----------
+        skill_name : str
+            Possibly misspelled skill name.
+        limit : int, optional
+            Maximum number of suggestions, by default 3.
+
+        Returns
+        -------
+        list[str]
+            Names of live skills by decreasing trigram similarity; empty if
+            no name is similar enough.
+        """
+        for snapshot in self._name_snapshots():
+            if snapshot.names is None:
+                continue
+            rows = snapshot.names.suggest(
+                skill_name, limit, len(snapshot.skills), snapshot.tombstones
+            )
+            if rows:
+                return [snapshot.skills[row].name for row in rows]
+        return []
+
+    def related_skills(self, skill_name: str, k: int = 5) -> list[SkillResult]:
+        """Find the skills most similar to an indexed skill.
+
+        Answered from the precomputed similarity graph, without a model call
+        or a scan of the index. If tombstoned neighbours leave fewer than
+        ``k`` (or the graph is disabled or too small), the skill's stored
+        embedding is scored against the index instead, still without
+        encoding anything.
+
+        Parameters
+        ----------
+        skill_name : str
+            Name of an indexed skill (the first live one with that name).
+        k : int, optional
+            Number of related skills to return, by default 5.
+
+        Returns
+        -------
+        list[SkillResult]
+            Results like those of ``search``, most similar first;
+            "relevance_score" is the cosine similarity of the descriptions.
+
+        Raises
+        ------
+        ValueError
+            If no live skill is named ``skill_name``.
+        """
+        snapshot = self._snapshot
+        row = self._find_row(snapshot, skill_name)
+        if row is None:
+            raise ValueError(f"Unknown skill: {skill_name!r}")
+        k = min(k, snapshot.num_live - 1)
+        if k <= 0:
+            return []
+
+        rows = similarities = np.empty(0)
+        if snapshot.graph is not None:
+            rows, similarities = snapshot.graph.neighbors_of(row)
+            if snapshot.tombstones is not None:
+                live = ~snapshot.tombstones[rows]
+                rows, similarities = rows[live], similarities[live]
+        if len(rows) < k:
+            logger.debug(f"Scanning the index for skills related to {skill_name}")
+            scores = snapshot.embeddings @ snapshot.embeddings[row]
+            scores[row] = -np.inf
+            if snapshot.tombstones is not None:
+                scores[snapshot.tombstones] = -np.inf
+            rows = self._top_k_indices(scores, k)
+            similarities = scores[rows]
+
+        rows = rows[:k]
+        scores = np.zeros(len(snapshot.skills), dtype=np.float32)
+        scores[rows] = similarities[:k]
+        return build_results(snapshot, rows, scores)
+
+    def _encode_queries(self, queries: list[str]) -> np.ndarray:
+        """Encode queries, serving repeats from the query cache.
+
+        Cache misses are encoded together in a single model call, shared
+        with concurrent searches when micro-batching is enabled.
+
+        Parameters
+        ----------
+        queries : list[str]
+            Queries to encode.
+
+        Returns
+        -------
+        np.ndarray
+            Normalized query embeddings, one row per query.
+        """
+        cached = [
+            self.query_cache.get(self.model_fingerprint, query) for query in queries
+        ]
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+
+        if missing:
+            texts = [queries[i] for i in missing]
+            if self.query_batcher is not None:
+                encoded = self.query_batcher.encode(texts)
+            else:
+                encoded = self._ensure_model_loaded().encode(texts)
+            new_embeddings = self._normalize_rows(encoded)
+            for row, i in enumerate(missing):
+                cached[i] = new_embeddings[row]
+                self.query_cache.put(
+                    self.model_fingerprint, queries[i], new_embeddings[row]
+                )
+
+        return np.stack(cached)
+
+    def _rank(
+        self,
+        snapshot: IndexSnapshot,
+        query: str,
+        similarities: np.ndarray,
+        top_k: int,
+        allowed: np.ndarray | None = None,
+    ) -> list[SkillResult]:
+        """Rank the skills of a snapshot for one query and build results.
+
+        Without a lexical index, skills are ranked by cosine similarity.
+        Otherwise the vector and BM25 rankings are combined with reciprocal
+        rank fusion, and the fused score (scaled to 0-1) is reported as the
+        relevance score alongside the individual vector and lexical scores,
+        with "search_mode" "hybrid".
+
+        Parameters
+        ----------
+        snapshot : IndexSnapshot
+            Snapshot being searched.
+        query : str
+            Query text (used for lexical scoring).
+        similarities : np.ndarray
+            Cosine similarities for all rows of the snapshot (``-inf`` for
+            rows outside ``allowed`` and rows the ANN index did not probe).
+        top_k : int
+            Number of results to return (at most the allowed rows).
+        allowed : np.ndarray | None, optional
+            Bool mask of the rows that may be returned, by default all.
+
+        Returns
+        -------
+        list[SkillResult]
+            Skills with relevance scores, best first.
+        """
+        if snapshot.lexical is None:
+            top_indices = self._select_top_k(similarities, top_k)
+            return build_results(
+                snapshot, top_indices, similarities, search_mode="vector"
+            )
+
+        num_skills = len(snapshot.skills)
+        lexical_scores = snapshot.lexical.score(query, num_skills)
+        num_allowed = num_skills
+        if allowed is not None:
+            lexical_scores[~allowed] = 0.0
+            num_allowed = int(np.count_nonzero(allowed))
+
+        # Only the head of each ranking contributes to the fused score; the
+        # (-inf) rows that are tombstoned, filtered out or were not ANN
+        # candidates get no vector rank
+        depth = min(num_allowed, max(top_k, self.rrf_k))
+        fused = np.zeros(num_skills, dtype=np.float32)
+        rank_weights = 1.0 / (self.rrf_k + np.arange(1, depth + 1, dtype=np.float32))
+
+        vector_top = self._select_top_k(similarities, depth)
+        vector_top = vector_top[np.isfinite(similarities[vector_top])]
+        fused[vector_top] += rank_weights[: len(vector_top)]
+
+        lexical_top = self._select_top_k(lexical_scores, depth)
+        lexical_top = lexical_top[lexical_scores[lexical_top] > 0]
+        fused[lexical_top] += rank_weights[: len(lexical_top)]
+
+        # Scale so that ranking first in both lists scores 1.0
+        fused *= (self.rrf_k + 1) / 2.0
+
+        top_indices = self._select_top_k(fused, top_k)
+        return build_results(
+            snapshot,
+            top_indices,
+            fused,
+            vector_scores=similarities,
+            lexical_scores=lexical_scores,
+            search_mode="hybrid",
+        )
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 3,
+        source: str | None = None,
+        repo: str | None = None,
+        has_documents: bool | None = None,
+        tags: Sequence[str] | None = None,
+    ) -> list[SkillResult]:
+        """Search for the most relevant skills based on a query.
+
+        Searches run against the snapshot that is current when the call
+        starts and never block on concurrent indexing. Filters are combined
+        (all must match) from precomputed metadata masks and applied before
+        top-k selection, so a filtered search returns up to ``top_k``
+        matching skills and only scores the matching rows. With
+        ``degraded_search``, searches issued before the model is ready are
+        ranked by keywords alone (see ``search_mode``).
+
+        Parameters
+        ----------
+        query : str
+            The task description or query to search for.
+        top_k : int, optional
+            Number of top results to return, by default 3.
+        source : str | None, optional
+            Only return skills from "github" or "local" sources.
+        repo : str | None, optional
+            Only return skills from this GitHub repository ("owner/name"
+            or its URL).
+        has_documents : bool | None, optional
+            Only return skills with (True) or without (False) additional
+            documents.
+        tags : Sequence[str] | None, optional
+            Only return skills carrying all of these frontmatter tags
+            (case-insensitive).
+
+        Returns
+        -------
+        list[SkillResult]
+            Read-only views of the matching skills (usable like
+            ``Skill.to_dict`` dictionaries) with relevance scores, sorted by
+            relevance, each with the "search_mode" that ranked it.
+
+        Raises
+        ------
+        ValueError
+            If ``source`` or ``repo`` is invalid.
+        """
+        keys = filter_keys(source, repo, has_documents, tags)
+        keyword = self._keyword_snapshot()
+        if keyword is not None:
+            return keyword_search(keyword, [query], top_k, keys, self._select_top_k)[0]
+
+        snapshot = self._snapshot
+        if not snapshot.num_live or snapshot.embeddings is None:
+            logger.warning("No skills indexed, returning empty results")
+            return []
+
+        allowed, num_allowed = allowed_rows(snapshot, keys)
+        if not num_allowed:
+            logger.info(f"No skills match the filters for: '{query}'")
+            return []
+
+        # Ensure top_k doesn't exceed available skills
+        top_k = min(top_k, num_allowed)
+
+        logger.info(f"Searching for: '{query}' (top_k={top_k})")
+
+        query_embedding = self._encode_queries([query])[0]
+
+        similarities = self._similarities(snapshot, query_embedding, allowed)
+
+        results = self._rank(snapshot, query, similarities, top_k, allowed)
+
+        logger.info(f"Returning {len(results)} results")
+        return results
+
+    def search_many(
+        self,
+        queries: list[str],
+        top_k: int = 3,
+        source: str | None = None,
+        repo: str | None = None,
+        has_documents: bool | None = None,
+        tags: Sequence[str] | None = None,
+    ) -> list[list[SkillResult]]:
+        """Search for several queries at once.
+
+        All queries are encoded in one model call and scored against the
+        index with a single matrix-matrix product.
+
+        Parameters
+        ----------
+        queries : list[str]
+            Task descriptions or queries to search for.
+        top_k : int, optional
+            Number of top results to return per query, by default 3.
+        source, repo, has_documents, tags : optional
+            Filters applied to every query, see ``search``.
+
+        Returns
+        -------
+        list[list[SkillResult]]
+            One result list per query, in the same order as ``queries``.
+
+        Raises
+        ------
+        ValueError
+            If ``source`` or ``repo`` is invalid.
+        """
+        keys = filter_keys(source, repo, has_documents, tags)
+        if not queries:
+            return []
+
+        keyword = self._keyword_snapshot()
+        if keyword is not None:
+            return keyword_search(keyword, queries, top_k, keys, self._select_top_k)
+
+        snapshot = self._snapshot
+        if not snapshot.num_live or snapshot.embeddings is None:
+            logger.warning("No skills indexed, returning empty results")
+            return [[] for _ in queries]
+
+        allowed, num_allowed = allowed_rows(snapshot, keys)
+        if not num_allowed:
+            return [[] for _ in queries]
+
+        top_k = min(top_k, num_allowed)
+
+        logger.info(f"Searching for {len(queries)} queries (top_k={top_k})")
+
+        query_embeddings = self._encode_queries(queries)
+
+        # (num_queries, num_skills) cosine similarities
+        similarities = self._similarities(snapshot, query_embeddings, allowed)
+
+        if snapshot.lexical is None:
+            top_indices = self._top_k_indices(similarities, top_k)
+            return [
+                build_results(
+                    snapshot, top_indices[i], similarities[i], search_mode="vector"
+                )
+                for i in range(len(queries))
+            ]
+
+        return [
+            self._rank(snapshot, query, similarities[i], top_k, allowed)
+            for i, query in enumerate(queries)
+        ]
+
+    def _similarities(
+        self,
+        snapshot: IndexSnapshot,
+        query_embeddings: np.ndarray,
+        allowed: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Compute per-skill cosine similarities for one or more queries.
+
+        A skill scores the similarity of its description or, when content
+        chunks are indexed, of its best-matching chunk if that is higher.
+
+        Parameters
+        ----------
+        snapshot : IndexSnapshot
+            Snapshot being searched.
+        query_embeddings : np.ndarray
+            Normalized query embedding of shape (D,) or (Q, D).
+        allowed : np.ndarray | None, optional
+            Bool mask of the rows that may be returned, by default all.
+
+        Returns
+        -------
+        np.ndarray
+            Similarities of shape (N,) or (Q, N); ``-inf`` for rows outside
+            ``allowed``.
+        """
+        num_skills = len(snapshot.skills)
+        rows = None
+        if allowed is not None:
+            rows = np.flatnonzero(allowed)
+            # Gathering the rows costs a copy, so only narrow the scan to
+            # them when a filter leaves out most of the index
+            if 2 * len(rows) >= num_skills:
+                rows = None
+
+        exact = snapshot.ann is None or not snapshot.ann.is_trained
+        # Like a small index, a small filtered subset is scanned exactly
+        # even when an ANN index is trained
+        if rows is not None and (exact or len(rows) < self.ann_min_skills):
+            similarities = np.full(
+                query_embeddings.shape[:-1] + (num_skills,), -np.inf, dtype=np.float32
+            )
+            similarities[..., rows] = self._score_rows(
+                snapshot.embeddings, snapshot.quantized, query_embeddings, rows
+            )
+        elif exact:
+            similarities = self._scan(
+                snapshot.embeddings, snapshot.quantized, query_embeddings
+            )
+        elif query_embeddings.ndim == 1:
+            similarities = self._approximate_similarities(snapshot, query_embeddings)
+        else:
+            similarities = np.stack(
+                [self._approximate_similarities(snapshot, q) for q in query_embeddings]
+            )
+
+        if snapshot.chunk_embeddings is not None and len(snapshot.chunk_embeddings):
+            chunk_similarities = self._scan(
+                snapshot.chunk_embeddings, snapshot.quantized_chunks, query_embeddings
+            )
+            best_chunk = self._segment_max(chunk_similarities, snapshot.chunk_offsets)
+            similarities = np.maximum(similarities, best_chunk)
+
+        if allowed is not None:
+            # Dead and filtered-out rows rank below every allowed one
+            similarities[..., ~allowed] = -np.inf
+
+        return similarities
+
+    def _score_rows(
+        self,
+        matrix: np.ndarray,
+        quantized: QuantizedMatrix | None,
+        query_embeddings: np.ndarray,
+        rows: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Compute cosine similarities between queries and matrix rows.
+
+        With quantized storage, all rows are scored from the compact codes
+        and the top ``rescore_depth`` of each query are rescored exactly.
+
+        Parameters
+        ----------
+        matrix : np.ndarray
+            Full-precision normalized rows.
+        quantized : QuantizedMatrix | None
+            Quantized copy of ``matrix``, or None to score it directly.
+        query_embeddings : np.ndarray
+            Normalized queries of shape (D,) or (Q, D).
+        rows : np.ndarray | None, optional
+            Row indices to score, by default all rows.
+
+        Returns
+        -------
+        np.ndarray
+            Similarities of shape (R,) or (Q, R).
+        """
+        # Rows are pre-normalized, so the dot product is the cosine similarity
+        if quantized is None:
+            selected = matrix if rows is None else matrix[rows]
+            return query_embeddings @ selected.T
+
+        scores = quantized.dot(query_embeddings, rows)
+        shortlists = self._top_k_indices(scores, self.rescore_depth)
+        for query, query_scores, shortlist in zip(
+            np.atleast_2d(query_embeddings),
+            np.atleast_2d(scores),
+            np.atleast_2d(shortlists),
+        ):
+            exact_rows = shortlist if rows is None else rows[shortlist]
+            query_scores[shortlist] = matrix[exact_rows] @ query
+        return scores
+
+    def _partitions(self, num_rows: int) -> list[tuple[int, int]] | None:
+        """Split rows into contiguous partitions for the scoring threads.
+
+        Parameters
+        ----------
+        num_rows : int
+            Number of rows to split.
+
+        Returns
+        -------
+        list[tuple[int, int]] | None
+            (start, stop) of each partition, or None when the rows are too
+            few to be worth splitting (or parallel scoring is disabled).
+        """
+        if self._scoring_pool is None:
+            return None
+        count = min(self.search_threads, num_rows // _MIN_PARTITION_ROWS)
+        if count < 2:
+            return None
+        bounds = np.linspace(0, num_rows, count + 1).astype(int)
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    def _scan(
+        self,
+        matrix: np.ndarray,
+        quantized: QuantizedMatrix | None,
+        query_embeddings: np.ndarray,
+    ) -> np.ndarray:
+        """Score all rows of a matrix, in parallel partitions when it is large.
+
+        Each partition is scored like a matrix of its own (with quantized
+        storage, its own top ``rescore_depth`` rows are rescored exactly)
+        into its slice of one output array, so nothing is copied or merged.
+
+        Parameters
+        ----------
+        matrix : np.ndarray
+            Full-precision normalized rows.
+        quantized : QuantizedMatrix | None
+            Quantized copy of ``matrix``, or None to score it directly.
+        query_embeddings : np.ndarray
+            Normalized queries of shape (D,) or (Q, D).
+
+        Returns
+        -------
+        np.ndarray
+            Similarities of shape (N,) or (Q, N).
+        """
+        partitions = self._partitions(len(matrix))
+        if partitions is None:
+            return self._score_rows(matrix, quantized, query_embeddings)
+
+        similarities = np.empty(
+            query_embeddings.shape[:-1] + (len(matrix),), dtype=np.float32
+        )
+
+        def score(start: int, stop: int) -> None:
+            similarities[..., start:stop] = self._score_rows(
+                matrix[start:stop],
+                None if quantized is None else quantized.slice(start, stop),
+                query_embeddings,
+            )
+
+        # Consuming the results re-raises any exception of a partition
+        list(self._scoring_pool.map(lambda bounds: score(*bounds), partitions))
+        return similarities
+
+    def _select_top_k(self, scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Select the indices of the top-k scores of one query.
+
+        For a large index, every partition selects its own top-k in the
+        scoring threads and the sorted lists are combined with a k-way
+        merge, which only touches ``top_k`` entries per partition.
+
+        Parameters
+        ----------
+        scores : np.ndarray
+            Scores of shape (N,).
+        top_k : int
+            Number of indices to select (at most N).
+
+        Returns
+        -------
+        np.ndarray
+            Indices of shape (k,), ordered by descending score.
+        """
+        partitions = self._partitions(len(scores))
+        if partitions is None or top_k <= 0:
+            return self._top_k_indices(scores, top_k)
+
+        def select(bounds: tuple[int, int]) -> list[tuple[float, int]]:
+            start, stop = bounds
+            local = self._top_k_indices(scores[start:stop], top_k) + start
+            return list(zip((-scores[local]).tolist(), local.tolist()))
+
+        # Ties keep the lower row first, as in a single stable sort
+        merged = heapq.merge(*self._scoring_pool.map(select, partitions))
+        return np.fromiter(
+            (row for _, row in merged), dtype=np.intp, count=min(top_k, len(scores))
+        )
+
+    def _approximate_similarities(
+        self, snapshot: IndexSnapshot, query_embedding: np.ndarray
+    ) -> np.ndarray:
+        """Score only the ANN candidates of a query.
+
+        Parameters
+        ----------
+        snapshot : IndexSnapshot
+            Snapshot with a trained ``ann`` index.
+        query_embedding : np.ndarray
+            Normalized query embedding of shape (D,).
+
+        Returns
+        -------
+        np.ndarray
+            Similarities of shape (N,); ``-inf`` for skills outside the
+            probed clusters, so they never rank above a scored skill.
+        """
+        num_skills = len(snapshot.skills)
+        candidates = snapshot.ann.search(query_embedding, num_skills)
+        similarities = np.full(num_skills, -np.inf, dtype=np.float32)
+        similarities[candidates] = self._score_rows(
+            snapshot.embeddings, snapshot.quantized, query_embedding, candidates
+        )
+        return similarities
+
+    @staticmethod
+    def _segment_max(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Compute the maximum of each segment along the last axis.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Values of shape (M,) or (Q, M).
+        offsets : np.ndarray
+            Segment boundaries of length S + 1, with ``offsets[-1] == M``.
+
+        Returns
+        -------
+        np.ndarray
+            Segment maxima of shape (S,) or (Q, S); ``-inf`` for empty segments.
+        """
+        starts = offsets[:-1]
+        non_empty = np.diff(offsets) > 0
+        result = np.full(
+            values.shape[:-1] + (len(starts),), -np.inf, dtype=values.dtype
+        )
+        if non_empty.any():
+            # Empty segments have no length, so reducing from each non-empty
+            # start to the next one covers exactly that segment
+            result[..., non_empty] = np.maximum.reduceat(
+                values, starts[non_empty], axis=-1
+            )
+        return result
+
+    @staticmethod
+    def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Select the indices of the top-k scores along the last axis.
+
+        Uses ``argpartition`` (O(N)) and only sorts the k selected items.
+
+        Parameters
+        ----------
+        scores : np.ndarray
+            Scores of shape (N,) or (Q, N).
+        top_k : int
+            Number of indices to select (at most N).
+
+        Returns
+        -------
+        np.ndarray
+            Indices of shape (k,) or (Q, k), ordered by descending score.
+        """
+        n = scores.shape[-1]
+        top_k = min(top_k, n)
+        if top_k <= 0:
+            return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+
+        if top_k < n:
+            candidates = np.argpartition(-scores, top_k - 1, axis=-1)[..., :top_k]
+        else:
+            candidates = np.broadcast_to(np.arange(n), scores.shape)
+
+        candidate_scores = np.take_along_axis(scores, candidates, axis=-1)
+        order = np.argsort(-candidate_scores, axis=-1, kind="stable")
+        return np.take_along_axis(candidates, order, axis=-1)
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize the rows of a matrix into a contiguous float32 array.
+
+        Parameters
+        ----------
+        matrix : np.ndarray
+            Matrix of vectors (one per row).
+
+        Returns
+        -------
+        np.ndarray
+            C-contiguous float32 matrix with unit-length rows. All-zero rows
+            are left as zeros.
+        """
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.maximum(norms, np.finfo(np.float32).tiny, out=norms)
+        return matrix / norms
@@ -0,0 +1,242 @@
+"""Lightweight search hits that view indexed skills instead of copying them."""
+
+import logging
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+import numpy as np
+
+from .index_snapshot import IndexSnapshot
+from .skill_loader import Skill
+
+logger = logging.getLogger(__name__)
+
+# Keys read straight from the skill, as in ``Skill.to_dict``
+_SKILL_FIELDS = (
+    "name",
+    "description",
+    "content",
+    "source",
+    "documents",
+    "tags",
+    "shard",
+)
+# Keys held by the result; the optional ones are absent while None
+_RESULT_FIELDS = (
+    "alternate_sources",
+    "relevance_score",
+    "vector_score",
+    "lexical_score",
+    "search_mode",
+)
+
+
+def render_skill_sections(skill: Skill | Mapping[str, Any]) -> tuple[str, str]:
+    """Render the parts of a search result that only depend on the skill.
+
+    Parameters
+    ----------
+    skill : Skill | Mapping[str, Any]
+        Skill, or skill dictionary as returned by ``Skill.to_dict``.
+
+    Returns
+    -------
+    tuple[str, str]
+        Description block (description and document count) and document
+        listing, the latter empty for skills without documents.
+    """
+    if isinstance(skill, Skill):
+        skill = skill.to_dict()
+    parts = [f"\nDescription: {skill['description']}"]
+    documents = skill.get("documents") or {}
+    if not documents:
+        return "\n".join(parts), ""
+
+    parts.append(f"\nAdditional Documents: {len(documents)} file(s)")
+    listing = ["\nAvailable Documents:"]
+    for doc_path in sorted(documents):
+        doc_info = documents[doc_path]
+        doc_type = doc_info.get("type", "unknown")
+        size_kb = doc_info.get("size", 0) / 1024
+        listing.append(f"  - {doc_path} ({doc_type}, {size_kb:.1f} KB)")
+    return "\n".join(parts), "\n".join(listing)
+
+
+def attach_skill_sections(skills: Iterable[Skill]) -> None:
+    """Render the result sections of skills entering the index.
+
+    Each skill's ``result_sections`` is replaced, so a skill re-indexed
+    after an in-place change is rendered again.
+
+    Parameters
+    ----------
+    skills : Iterable[Skill]
+        Skills about to be published in a snapshot.
+    """
+    for skill in skills:
+        skill.result_sections = render_skill_sections(skill)
+
+
+class SkillResult(Mapping[str, Any]):
+    """Read-only search hit over one row of an index snapshot.
+
+    Behaves like the dictionary ``Skill.to_dict`` returns, extended with the
+    scores of the hit, but only stores a reference to the skill and the
+    scores: skill fields are read from the skill on access, so building a
+    result copies no content or document mapping.
+
+    Attributes
+    ----------
+    skill : Skill
+        The indexed skill.
+    row : int
+        Row of the skill in the snapshot that produced the result.
+    version : int
+        Version of that snapshot.
+    alternate_sources : list[str]
+        Sources of duplicates collapsed into the skill.
+    relevance_score : float
+        Score the results are ranked by: the cosine similarity in vector
+        search, the scaled reciprocal rank fusion score in hybrid search
+        and the BM25 score relative to the best match in keyword search.
+    vector_score : float | None
+        Cosine similarity, reported separately in hybrid search.
+    lexical_score : float | None
+        BM25 score, reported separately in hybrid and keyword search.
+    search_mode : str | None
+        "hybrid", "vector" or "keyword" for search results, None for other
+        lookups.
+    """
+
+    __slots__ = (
+        "skill",
+        "row",
+        "version",
+        "alternate_sources",
+        "relevance_score",
+        "vector_score",
+        "lexical_score",
+        "search_mode",
+    )
+
+    def __init__(
+        self,
+        skill: Skill,
+        row: int,
+        version: int,
+        relevance_score: float,
+        alternate_sources: list[str] | None = None,
+        vector_score: float | None = None,
+        lexical_score: float | None = None,
+        search_mode: str | None = None,
+    ):
+        self.skill = skill
+        self.row = row
+        self.version = version
+        self.alternate_sources = alternate_sources or []
+        self.relevance_score = relevance_score
+        self.vector_score = vector_score
+        self.lexical_score = lexical_score
+        self.search_mode = search_mode
+
+    def __getitem__(self, key: str) -> Any:
+        """Get a skill field or a score by name."""
+        if key in _SKILL_FIELDS:
+            return getattr(self.skill, key)
+        if key in _RESULT_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the skill fields, then the scores that are set."""
+        yield from _SKILL_FIELDS
+        for key in _RESULT_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return (
+            f"SkillResult(name={self.skill.name!r}, "
+            f"relevance_score={self.relevance_score:.4f})"
+        )
+
+
+def build_results(
+    snapshot: IndexSnapshot,
+    indices: np.ndarray,
+    scores: np.ndarray,
+    vector_scores: np.ndarray | None = None,
+    lexical_scores: np.ndarray | None = None,
+    search_mode: str | None = None,
+) -> list[SkillResult]:
+    """Build result views of the selected skills.
+
+    Parameters
+    ----------
+    snapshot : IndexSnapshot
+        Snapshot the indices refer to.
+    indices : np.ndarray
+        Row indices of the selected skills, best first.
+    scores : np.ndarray
+        Relevance scores for all rows of the snapshot.
+    vector_scores : np.ndarray | None, optional
+        Cosine similarities to report separately (hybrid search).
+    lexical_scores : np.ndarray | None, optional
+        BM25 scores to report separately (hybrid search).
+    search_mode : str | None, optional
+        How the results were ranked, by default not reported.
+
+    Returns
+    -------
+    list[SkillResult]
+        Views of the skills with relevance scores and the sources of
+        collapsed duplicates ("alternate_sources"); no skill field is
+        copied. Rows without a score (``-inf``) are left out, and a
+        skill that was not scored by the vector search has no vector
+        score.
+    """
+    indices = np.asarray(indices)
+    indices = indices[np.isfinite(scores[indices])]
+    rows = indices.tolist()
+    relevance = scores[indices].tolist()
+    vector = [None] * len(rows)
+    if vector_scores is not None:
+        vector = [
+            score if np.isfinite(score) else None
+            for score in vector_scores[indices].tolist()
+        ]
+    lexical = [None] * len(rows)
+    if lexical_scores is not None:
+        lexical = lexical_scores[indices].tolist()
+
+    results = []
+    for row, score, vector_score, lexical_score in zip(
+        rows, relevance, vector, lexical
+    ):
+        skill = snapshot.skills[row]
+        duplicates = snapshot.duplicates.get(skill.source)
+        results.append(
+            SkillResult(
+                skill,
+                row,
+                snapshot.version,
+                score,
+                alternate_sources=(
+                    [duplicate.source for duplicate in duplicates]
+                    if duplicates
+                    else None
+                ),
+                vector_score=vector_score,
+                lexical_score=lexical_score,
+                search_mode=search_mode,
+            )
+        )
+        logger.debug(f"Found skill: {skill.name} (score: {score:.4f})")
+
+    return results
@@ -0,0 +1,268 @@
+"""Sparse k-nearest-neighbour graph over skill description embeddings."""
+
+import numpy as np
+
+# Rows scored per matrix product, bounding temporary memory to
+# block_size x num_rows floats
+_BLOCK_SIZE = 1024
+
+
+def _top_k(
+    scores: np.ndarray, ids: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Select the ``k`` best-scoring ids of every row, best first.
+
+    Parameters
+    ----------
+    scores : np.ndarray
+        Float32 scores of shape (rows, candidates); -inf marks no candidate.
+    ids : np.ndarray
+        Int32 candidate ids, of shape (candidates,) or (rows, candidates).
+    k : int
+        Number of neighbours to keep.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Neighbour ids and similarities of shape (rows, k), padded with -1
+        and -inf where fewer than ``k`` candidates exist.
+    """
+    num_rows, num_candidates = scores.shape
+    neighbors = np.full((num_rows, k), -1, dtype=np.int32)
+    similarities = np.full((num_rows, k), -np.inf, dtype=np.float32)
+    kept = min(k, num_candidates)
+    if kept == 0 or num_rows == 0:
+        return neighbors, similarities
+
+    if kept < num_candidates:
+        columns = np.argpartition(-scores, kept - 1, axis=1)[:, :kept]
+    else:
+        columns = np.broadcast_to(np.arange(num_candidates), scores.shape)
+    selected = np.take_along_axis(scores, columns, axis=1)
+    order = np.argsort(-selected, axis=1, kind="stable")
+    columns = np.take_along_axis(columns, order, axis=1)
+    similarities[:, :kept] = np.take_along_axis(selected, order, axis=1)
+    if ids.ndim == 1:
+        neighbors[:, :kept] = ids[columns]
+    else:
+        neighbors[:, :kept] = np.take_along_axis(ids, columns, axis=1)
+    neighbors[similarities == -np.inf] = -1
+    return neighbors, similarities
+
+
+class SkillGraph:
+    """Immutable k-nearest-neighbour lists of every skill in an index.
+
+    Row ``i`` lists the ``k`` rows whose description embeddings have the
+    highest cosine similarity with row ``i``'s, best first. Updates return a
+    new graph: rows that are added (or whose lists lost a neighbour) are
+    scored exactly against all rows, and every other row only considers the
+    added rows as new candidates, so adding ``m`` skills to ``n`` costs an
+    ``n x m`` product instead of a rebuild. Like the tombstone bitmap, a
+    graph is never modified once published.
+
+    Attributes
+    ----------
+    neighbors : np.ndarray
+        Read-only int32 array of shape (num_rows, k); -1 pads rows with
+        fewer than ``k`` other rows.
+    similarities : np.ndarray
+        Read-only float32 cosine similarities matching ``neighbors``, in
+        descending order per row; -inf where ``neighbors`` is -1.
+    """
+
+    def __init__(self, neighbors: np.ndarray, similarities: np.ndarray):
+        """Wrap precomputed neighbour lists.
+
+        Parameters
+        ----------
+        neighbors : np.ndarray
+            Int32 neighbour rows of shape (num_rows, k).
+        similarities : np.ndarray
+            Float32 similarities of shape (num_rows, k).
+
+        Raises
+        ------
+        ValueError
+            If the shapes of the two arrays differ.
+        """
+        if neighbors.shape != similarities.shape or neighbors.ndim != 2:
+            raise ValueError(
+                f"Neighbour shape {neighbors.shape} does not match "
+                f"similarity shape {similarities.shape}"
+            )
+        self.neighbors = neighbors
+        self.similarities = similarities
+        for array in (neighbors, similarities):
+            if array.flags.writeable:
+                array.flags.writeable = False
+
+    @property
+    def num_rows(self) -> int:
+        """Number of rows covered by the graph."""
+        return len(self.neighbors)
+
+    @property
+    def k(self) -> int:
+        """Neighbours stored per row."""
+        return self.neighbors.shape[1]
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, k: int) -> "SkillGraph":
+        """Compute the exact graph of a set of embeddings.
+
+        Parameters
+        ----------
+        embeddings : np.ndarray
+            L2-normalized embeddings, one row per skill.
+        k : int
+            Neighbours to store per row.
+
+        Returns
+        -------
+        SkillGraph
+            Graph over all rows of ``embeddings``.
+        """
+        num_rows = len(embeddings)
+        rows = np.arange(num_rows)
+        return cls._update(
+            np.full((num_rows, k), -1, dtype=np.int32),
+            np.full((num_rows, k), -np.inf, dtype=np.float32),
+            embeddings,
+            fresh=rows,
+            added=rows,
+        )
+
+    def extend(self, embeddings: np.ndarray) -> "SkillGraph":
+        """Add the rows of ``embeddings`` beyond ``num_rows``.
+
+        Parameters
+        ----------
+        embeddings : np.ndarray
+            Normalized embeddings of all rows, the first ``num_rows`` being
+            the ones this graph was computed from.
+
+        Returns
+        -------
+        SkillGraph
+            New graph over all rows of ``embeddings``.
+        """
+        num_rows = len(embeddings)
+        added = np.arange(self.num_rows, num_rows)
+        neighbors = np.full((num_rows, self.k), -1, dtype=np.int32)
+        similarities = np.full((num_rows, self.k), -np.inf, dtype=np.float32)
+        neighbors[: self.num_rows] = self.neighbors
+        similarities[: self.num_rows] = self.similarities
+        return self._update(
+            neighbors, similarities, embeddings, fresh=added, added=added
+        )
+
+    def remap(self, old_rows: np.ndarray, embeddings: np.ndarray) -> "SkillGraph":
+        """Carry the graph over to a reordered index (after a sync or compaction).
+
+        Parameters
+        ----------
+        old_rows : np.ndarray
+            For each row of the new index, its row in this graph, or -1 for
+            a new or changed skill.
+        embeddings : np.ndarray
+            Normalized embeddings of the new index.
+
+        Returns
+        -------
+        SkillGraph
+            New graph over all rows of ``embeddings``. Kept rows keep their
+            lists unless a neighbour was dropped, in which case they are
+            recomputed.
+        """
+        old_rows = np.asarray(old_rows, dtype=np.int64)
+        num_rows = len(old_rows)
+        kept = np.flatnonzero(old_rows >= 0)
+        mapping = np.full(self.num_rows, -1, dtype=np.int32)
+        mapping[old_rows[kept]] = kept
+
+        old_neighbors = self.neighbors[old_rows[kept]]
+        moved = np.where(old_neighbors >= 0, mapping[old_neighbors], -1)
+        lost = (moved < 0) & (old_neighbors >= 0)
+
+        neighbors = np.full((num_rows, self.k), -1, dtype=np.int32)
+        similarities = np.full((num_rows, self.k), -np.inf, dtype=np.float32)
+        neighbors[kept] = moved
+        similarities[kept] = np.where(
+            moved >= 0, self.similarities[old_rows[kept]], -np.inf
+        )
+        added = np.flatnonzero(old_rows < 0)
+        fresh = np.union1d(added, kept[lost.any(axis=1)])
+        return self._update(
+            neighbors, similarities, embeddings, fresh=fresh, added=added
+        )
+
+    def neighbors_of(self, row: int) -> tuple[np.ndarray, np.ndarray]:
+        """Get the stored neighbours of a row.
+
+        Parameters
+        ----------
+        row : int
+            Row index.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Neighbour rows and their similarities, best first.
+        """
+        neighbors = self.neighbors[row]
+        valid = neighbors >= 0
+        return neighbors[valid], self.similarities[row][valid]
+
+    @classmethod
+    def _update(
+        cls,
+        neighbors: np.ndarray,
+        similarities: np.ndarray,
+        embeddings: np.ndarray,
+        fresh: np.ndarray,
+        added: np.ndarray,
+    ) -> "SkillGraph":
+        """Recompute some rows exactly and offer added rows to all others.
+
+        Parameters
+        ----------
+        neighbors : np.ndarray
+            Writable neighbour lists of all rows (fresh rows are ignored).
+        similarities : np.ndarray
+            Writable similarities matching ``neighbors``.
+        embeddings : np.ndarray
+            Normalized embeddings of all rows.
+        fresh : np.ndarray
+            Rows whose lists are computed from scratch.
+        added : np.ndarray
+            Rows that may enter the lists of the other rows (a subset of
+            ``fresh``).
+
+        Returns
+        -------
+        SkillGraph
+            The updated graph.
+        """
+        k = neighbors.shape[1]
+        all_rows = np.arange(len(embeddings), dtype=np.int32)
+        for start in range(0, len(fresh), _BLOCK_SIZE):
+            rows = fresh[start : start + _BLOCK_SIZE]
+            scores = embeddings[rows] @ embeddings.T
+            scores[np.arange(len(rows)), rows] = -np.inf
+            neighbors[rows], similarities[rows] = _top_k(scores, all_rows, k)
+
+        stale = np.setdiff1d(all_rows, fresh, assume_unique=True)
+        if len(added) and len(stale):
+            added_embeddings = embeddings[added]
+            added_ids = added.astype(np.int32)
+            for start in range(0, len(stale), _BLOCK_SIZE):
+                rows = stale[start : start + _BLOCK_SIZE]
+                candidates = embeddings[rows] @ added_embeddings.T
+                candidate_ids = np.broadcast_to(added_ids, candidates.shape)
+                neighbors[rows], similarities[rows] = _top_k(
+                    np.concatenate([similarities[rows], candidates], axis=1),
+                    np.concatenate([neighbors[rows], candidate_ids], axis=1),
+                    k,
+                )
+        return cls(neighbors, similarities)
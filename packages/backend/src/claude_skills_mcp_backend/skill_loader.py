@@ -33,6 +33,15 @@ class Skill:
     documents : dict[str, dict[str, Any]]
         Additional documents from the skill directory.
         Keys are relative paths, values contain metadata and content.
+    tags : list[str]
+        Lowercase tags from the ``tags`` frontmatter field.
+    shard : str
+        Key of the configured source the skill was loaded from (see
+        ``source_key``), or "" if unknown.
+    result_sections : tuple[str, str] | None
+        Rendered description block and document listing of the skill's
+        search results, set when the skill is indexed (see
+        ``render_skill_sections``), or None before.
     _document_fetcher : Callable | None
         Function to fetch document content on-demand.
     _document_cache : dict[str, dict[str, Any]]
@@ -47,12 +56,17 @@ class Skill:
         source: str,
         documents: dict[str, dict[str, Any]] | None = None,
         document_fetcher: Callable | None = None,
+        tags: list[str] | None = None,
+        shard: str = "",
     ):
         self.name = name
         self.description = description
         self.content = content
         self.source = source
         self.documents = documents or {}
+        self.tags = tags or []
+        self.shard = shard
+        self.result_sections: tuple[str, str] | None = None
         self._document_fetcher = document_fetcher
         self._document_cache = {}
 
@@ -106,8 +120,71 @@ class Skill:
             "content": self.content,
             "source": self.source,
             "documents": self.documents,
+            "tags": self.tags,
+            "shard": self.shard,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Skill":
+        """Create a skill from its dictionary representation.
+
+        Parameters
+        ----------
+        data : dict[str, Any]
+            Dictionary as returned by ``to_dict``.
+
+        Returns
+        -------
+        Skill
+            Skill without a document fetcher, so documents whose content was
+            not loaded eagerly cannot be fetched.
+        """
+        return cls(
+            name=data["name"],
+            description=data["description"],
+            content=data["content"],
+            source=data["source"],
+            documents=data.get("documents"),
+            tags=data.get("tags"),
+            shard=data.get("shard", ""),
+        )
+
+
+def _parse_tags(frontmatter_text: str) -> list[str]:
+    """Extract the ``tags`` field from YAML frontmatter.
+
+    Supports flow lists (``tags: [a, b]``), comma-separated strings
+    (``tags: a, b``) and block lists (``tags:`` followed by ``- a`` lines).
+
+    Parameters
+    ----------
+    frontmatter_text : str
+        Text between the ``---`` markers.
+
+    Returns
+    -------
+    list[str]
+        Lowercase tags without duplicates, in order of appearance.
+    """
+    tags_match = re.search(
+        r"^tags:[ \t]*(.*)$((?:\n[ \t]*-[ \t]*.+$)*)", frontmatter_text, re.MULTILINE
+    )
+    if not tags_match:
+        return []
+
+    inline, block = tags_match.groups()
+    if inline.strip():
+        values = inline.strip().strip("[]").split(",")
+    else:
+        values = [line.strip()[1:] for line in block.splitlines() if line.strip()]
+
+    tags = []
+    for value in values:
+        tag = value.strip().strip("\"'").lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
 
 def parse_skill_md(content: str, source: str) -> Skill | None:
     """Parse a SKILL.md file and extract skill information.
@@ -157,6 +234,7 @@ def parse_skill_md(content: str, source: str) -> Skill | None:
             description=description,
             content=markdown_body.strip(),  # Store only the markdown body, not the frontmatter
             source=source,
+            tags=_parse_tags(frontmatter_text),
         )
 
     except Exception as e:
@@ -979,6 +1057,70 @@ def load_from_github(
     return skills
 
 
+def source_key(source_config: dict[str, Any]) -> str:
+    """Get the shard key of a configured skill source.
+
+    Parameters
+    ----------
+    source_config : dict[str, Any]
+        Skill source configuration.
+
+    Returns
+    -------
+    str
+        "github:<url>" (with "#<subpath>" if one is configured) or
+        "local:<path>", stable across restarts so a reloaded source
+        replaces exactly the skills it was loaded with.
+    """
+    source_type = source_config.get("type")
+    if source_type == "github":
+        key = f"github:{source_config.get('url', '')}"
+        subpath = source_config.get("subpath", "")
+        return f"{key}#{subpath}" if subpath else key
+    return f"{source_type}:{source_config.get('path', '')}"
+
+
+def load_source(
+    source_config: dict[str, Any], config: dict[str, Any] | None = None
+) -> list[Skill]:
+    """Load the skills of one configured source.
+
+    Parameters
+    ----------
+    source_config : dict[str, Any]
+        Skill source configuration.
+    config : dict[str, Any] | None
+        Configuration dictionary with document loading settings.
+
+    Returns
+    -------
+    list[Skill]
+        Loaded skills, tagged with the ``source_key`` of the source as
+        their ``shard``.
+    """
+    source_type = source_config.get("type")
+    skills: list[Skill] = []
+
+    if source_type == "github":
+        url = source_config.get("url")
+        subpath = source_config.get("subpath", "")
+        if url:
+            skills = load_from_github(url, subpath, config)
+
+    elif source_type == "local":
+        path = source_config.get("path")
+        if path:
+            skills = load_from_local(path, config)
+
+    else:
+        logger.warning(f"Unknown source type: {source_type}")
+
+    shard = source_key(source_config)
+    for skill in skills:
+        skill.shard = shard
+    return skills
+
+
 def load_all_skills(
     skill_sources: list[dict[str, Any]], config: dict[str, Any] | None = None
 ) -> list[Skill]:
@@ -999,23 +1141,7 @@ def load_all_skills(
     all_skills: list[Skill] = []
 
     for source_config in skill_sources:
-        source_type = source_config.get("type")
-
-        if source_type == "github":
-            url = source_config.get("url")
-            subpath = source_config.get("subpath", "")
-            if url:
-                skills = load_from_github(url, subpath, config)
-                all_skills.extend(skills)
-
-        elif source_type == "local":
-            path = source_config.get("path")
-            if path:
-                skills = load_from_local(path, config)
-                all_skills.extend(skills)
-
-        else:
-            logger.warning(f"Unknown source type: {source_type}")
+        all_skills.extend(load_source(source_config, config))
 
     logger.info(f"Total skills loaded: {len(all_skills)}")
     return all_skills
@@ -1055,30 +1181,11 @@ def load_skills_in_batches(
             current_batch.clear()
 
     for source_config in skill_sources:
-        source_type = source_config.get("type")
-
         try:
-            if source_type == "github":
-                url = source_config.get("url")
-                subpath = source_config.get("subpath", "")
-                if url:
-                    skills = load_from_github(url, subpath, config)
-                    for skill in skills:
-                        current_batch.append(skill)
-                        if len(current_batch) >= batch_size:
-                            process_batch()
-
-            elif source_type == "local":
-                path = source_config.get("path")
-                if path:
-                    skills = load_from_local(path, config)
-                    for skill in skills:
-                        current_batch.append(skill)
-                        if len(current_batch) >= batch_size:
-                            process_batch()
-
-            else:
-                logger.warning(f"Unknown source type: {source_type}")
+            for skill in load_source(source_config, config):
+                current_batch.append(skill)
+                if len(current_batch) >= batch_size:
+                    process_batch()
 
         except Exception as e:
             logger.error(f"Error loading from source {source_config}: {e}")
@@ -0,0 +1,208 @@
+"""Memory-mapped embedding matrices shared by all backend processes on a host."""
+
+import hashlib
+import logging
+import os
+import tempfile
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _get_vector_store_dir() -> Path:
+    """Get vector store directory.
+
+    Returns
+    -------
+    Path
+        Path to vector store directory.
+    """
+    store_dir = Path(tempfile.gettempdir()) / "claude_skills_mcp_cache" / "vectors"
+    store_dir.mkdir(parents=True, exist_ok=True)
+    return store_dir
+
+
+class VectorStore:
+    """Content-addressed, read-only ``.npy`` files opened with ``np.memmap``.
+
+    Each version of a matrix is named after a hash of the model and of the
+    content it was computed from, so every process that indexes the same
+    skills with the same model maps the same file and the host keeps a
+    single page-cache copy. Versions are written to a temporary file and
+    renamed into place, so a reader never maps a partially written matrix,
+    and a re-index simply maps a different file. File names start with a
+    hash of the model and kind, so each (model, kind) pair keeps its own
+    most recent versions.
+
+    Attributes
+    ----------
+    model_fingerprint : str
+        Identifier of the embedding model.
+    store_dir : Path
+        Directory holding the versioned ``.npy`` files.
+    max_versions : int
+        Number of most recently used versions kept on disk per model and
+        kind.
+    """
+
+    def __init__(
+        self,
+        model_fingerprint: str,
+        store_dir: Path | None = None,
+        max_versions: int = 8,
+    ):
+        """Initialize the vector store.
+
+        Parameters
+        ----------
+        model_fingerprint : str
+            Identifier of the embedding model.
+        store_dir : Path | None, optional
+            Directory for matrix files, by default the shared temp cache.
+        max_versions : int, optional
+            Versions kept on disk per model and kind, by default 8.
+        """
+        self.model_fingerprint = model_fingerprint
+        self.store_dir = Path(store_dir) if store_dir else _get_vector_store_dir()
+        self.max_versions = max_versions
+
+    def version_key(self, kind: str, content_keys: list[str]) -> str:
+        """Compute the version identifier of a matrix.
+
+        Parameters
+        ----------
+        kind : str
+            What the matrix holds (e.g. "descriptions"), including any
+            parameters that change its rows.
+        content_keys : list[str]
+            Hashes of the texts behind each row (or group of rows), in order.
+
+        Returns
+        -------
+        str
+            Hex SHA-256 digest of the model and kind (shortened), a hyphen
+            and a hex SHA-256 digest identifying the matrix.
+        """
+        header = f"{self.model_fingerprint}\n{kind}\n".encode()
+        digest = hashlib.sha256(header)
+        for key in content_keys:
+            digest.update(key.encode())
+            digest.update(b"\n")
+        group = hashlib.sha256(header).hexdigest()[:16]
+        return f"{group}-{digest.hexdigest()}"
+
+    def _path(self, version: str) -> Path:
+        return self.store_dir / f"{version}.npy"
+
+    def open(self, version: str) -> np.ndarray | None:
+        """Map a stored matrix read-only.
+
+        Parameters
+        ----------
+        version : str
+            Version identifier from ``version_key``.
+
+        Returns
+        -------
+        np.ndarray | None
+            Read-only memory-mapped matrix, or None if it is not stored.
+        """
+        path = self._path(version)
+        if not path.exists():
+            return None
+
+        try:
+            matrix = np.load(path, mmap_mode="r", allow_pickle=False)
+            # Mark as recently used so pruning keeps it
+            os.utime(path)
+        except Exception as e:
+            logger.warning(f"Failed to open stored vectors {path}: {e}")
+            return None
+
+        logger.debug(f"Mapped {matrix.shape[0]} stored vectors from {path}")
+        return matrix
+
+    def save(
+        self, version: str, matrix: np.ndarray, keep: Iterable[str] = ()
+    ) -> np.ndarray:
+        """Store a matrix (unless already stored) and map it read-only.
+
+        Parameters
+        ----------
+        version : str
+            Version identifier from ``version_key``.
+        matrix : np.ndarray
+            Float32 matrix to store.
+        keep : Iterable[str], optional
+            Versions still in use (e.g. by the published index) that pruning
+            must not delete, by default none.
+
+        Returns
+        -------
+        np.ndarray
+            Read-only memory-mapped matrix, or ``matrix`` itself if it could
+            not be stored.
+        """
+        stored = self.open(version)
+        if stored is not None:
+            return stored
+
+        path = self._path(version)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp.npy")
+        try:
+            np.save(tmp_path, np.ascontiguousarray(matrix, dtype=np.float32))
+            os.replace(tmp_path, path)
+            logger.info(f"Stored {len(matrix)} vectors in {path}")
+        except Exception as e:
+            logger.warning(f"Failed to store vectors in {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return matrix
+
+        self.prune(keep={version, *keep})
+        stored = self.open(version)
+        return stored if stored is not None else matrix
+
+    def prune(self, keep: Iterable[str] = ()) -> None:
+        """Delete all but the ``max_versions`` most recently used versions.
+
+        Versions are counted per model and kind, so storing many versions of
+        one matrix never evicts another model's or kind's matrices.
+        Processes that still map a deleted version keep reading it; the
+        space is reclaimed once the last mapping is closed.
+
+        Parameters
+        ----------
+        keep : Iterable[str], optional
+            Versions never deleted, even if they are not among the most
+            recently used, by default none.
+        """
+        keep = set(keep)
+        groups: dict[str, list[tuple[float, Path]]] = defaultdict(list)
+        try:
+            for path in self.store_dir.glob("*.npy"):
+                if ".tmp." in path.name:
+                    continue
+                # Files from before versions were grouped share one group
+                group = path.stem.rpartition("-")[0]
+                groups[group].append((path.stat().st_mtime, path))
+        except OSError as e:
+            logger.debug(f"Failed to list vector store: {e}")
+            return
+
+        stale = []
+        for files in groups.values():
+            files.sort(reverse=True)
+            stale.extend(
+                path for _, path in files[self.max_versions :] if path.stem not in keep
+            )
+        for path in stale:
+            try:
+                path.unlink()
+                logger.debug(f"Pruned stored vectors {path}")
+            except OSError as e:
+                # Files mapped by another process cannot be deleted on Windows
+                logger.debug(f"Failed to prune {path}: {e}")
@@ -0,0 +1,135 @@
+"""Tests for the approximate nearest-neighbour index."""
+
+import numpy as np
+import pytest
+
+from claude_skills_mcp_backend.ann_index import IVFFlatIndex, create_ann_index
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+from claude_skills_mcp_backend.skill_loader import Skill
+
+
+def _clustered(n: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((20, dim))
+    vectors = centers[rng.integers(0, 20, n)] + 0.3 * rng.standard_normal((n, dim))
+    return SkillSearchEngine._normalize_rows(vectors)
+
+
+def test_untrained_index_defers_to_exact_search():
+    """Test that search returns None below the training threshold."""
+    index = IVFFlatIndex(min_train_size=100)
+    embeddings = _clustered(50)
+    index.extend(embeddings)
+
+    assert not index.is_trained
+    assert index.num_vectors == 50
+    assert index.search(embeddings[0], 50) is None
+
+
+def test_ivf_recall_against_exact_search():
+    """Test that probed clusters contain nearly all exact top-10 neighbours."""
+    embeddings = _clustered(2000)
+    index = IVFFlatIndex(n_probe=8, min_train_size=0)
+    index.extend(embeddings)
+
+    hits = 0
+    for query in embeddings[:50]:
+        truth = SkillSearchEngine._top_k_indices(embeddings @ query, 10)
+        candidates = index.search(query, len(embeddings))
+        hits += len(np.intersect1d(truth, candidates))
+
+    assert hits / 500 >= 0.9
+
+
+def test_probing_all_lists_is_exact():
+    """Test that probing every cluster returns every vector."""
+    embeddings = _clustered(500)
+    index = IVFFlatIndex(n_probe=10_000, min_train_size=0)
+    index.extend(embeddings)
+
+    assert np.array_equal(index.search(embeddings[0], 500), np.arange(500))
+
+
+def test_incremental_insertion_respects_prefix():
+    """Test that appended rows are searchable but hidden from older prefixes."""
+    embeddings = _clustered(1200)
+    index = IVFFlatIndex(n_probe=10_000, min_train_size=100)
+    index.extend(embeddings, 300)
+    index.extend(embeddings, 400)
+
+    assert np.array_equal(index.search(embeddings[0], 400), np.arange(400))
+    assert np.array_equal(index.search(embeddings[0], 300), np.arange(300))
+    assert index.get_stats()["n_lists"] == int(np.sqrt(300))
+
+    # Growing fourfold past the training size retrains the clusters
+    index.extend(embeddings, 1200)
+    assert index.get_stats()["n_lists"] == int(np.sqrt(1200))
+    assert np.array_equal(index.search(embeddings[0], 1200), np.arange(1200))
+
+
+def test_create_ann_index():
+    """Test backend selection by name."""
+    assert create_ann_index("exact") is None
+    assert isinstance(create_ann_index("ivf", n_probe=4), IVFFlatIndex)
+    with pytest.raises(ValueError):
+        create_ann_index("hnsw")
+
+
+def test_engine_with_ivf_backend_matches_exact(mock_skills):
+    """Test that a fully probed IVF index returns the exact ranking."""
+    exact = SkillSearchEngine("all-MiniLM-L6-v2", hybrid_search=False)
+    exact.index_skills(mock_skills)
+
+    approximate = SkillSearchEngine(
+        "all-MiniLM-L6-v2",
+        hybrid_search=False,
+        ann_backend="ivf",
+        ann_n_probe=10_000,
+        ann_min_skills=1,
+    )
+    approximate.add_skills(mock_skills[:2])
+    approximate.add_skills(mock_skills[2:])
+
+    assert approximate.get_snapshot().ann.is_trained
+    query = "analyze RNA sequencing data"
+    assert [r["name"] for r in approximate.search(query, top_k=3)] == [
+        r["name"] for r in exact.search(query, top_k=3)
+    ]
+    assert [r["name"] for r in approximate.search_many([query], top_k=3)[0]] == [
+        r["name"] for r in exact.search(query, top_k=3)
+    ]
+
+
+def test_unprobed_skills_get_no_vector_rank():
+    """Test that skills outside the probed clusters are not ranked by vector."""
+    skills = [
+        Skill(
+            name=f"Skill {i}",
+            description=f"Topic {i % 10} skill number {i}",
+            content=f"Content {i}",
+            source=f"test://{i}",
+        )
+        for i in range(100)
+    ]
+    query = "topic 3 skill"
+    for hybrid_search in (True, False):
+        engine = SkillSearchEngine(
+            "all-MiniLM-L6-v2",
+            encoder_backend="hashing",
+            hybrid_search=hybrid_search,
+            ann_backend="ivf",
+            ann_n_probe=1,
+            ann_min_skills=1,
+        )
+        engine.index_skills(skills)
+        query_embedding = engine._encode_queries([query])[0]
+        candidates = set(engine.get_snapshot().ann.search(query_embedding, 100))
+        assert 0 < len(candidates) < 100
+
+        results = engine.search(query, top_k=100)
+        vector_ranked = {r.row for r in results if r.vector_score is not None}
+        if hybrid_search:
+            assert vector_ranked <= candidates
+            assert all(r.lexical_score > 0 for r in results if r.vector_score is None)
+        else:
+            assert {r.row for r in results} == candidates
@@ -4,7 +4,11 @@ import asyncio
 import time
 import pytest
 from claude_skills_mcp_backend.search_engine import SkillSearchEngine
-from claude_skills_mcp_backend.mcp_handlers import SkillsMCPServer, LoadingState
+from claude_skills_mcp_backend.mcp_handlers import (
+    SkillsMCPServer,
+    LoadingState,
+    handle_search_skills,
+)
 from claude_skills_mcp_backend.skill_loader import load_skills_in_batches, Skill
 
 
@@ -208,6 +212,26 @@ def test_background_loading_with_server():
     print("✓ Loading status removed after completion")
 
 
+def test_keyword_search_while_model_loads():
+    """Test that staged skills are searchable by keywords before the model loads."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", degraded_search=True)
+    engine.stage_skills(
+        [
+            Skill(f"Skill {i}", f"Description {i}", f"Content {i}", f"source{i}")
+            for i in range(5)
+        ]
+    )
+
+    result = asyncio.run(
+        handle_search_skills({"task_description": "Description 3"}, engine, None)
+    )
+
+    text = result[0].text
+    assert "KEYWORD SEARCH" in text
+    assert "Skill 1: Skill 3" in text
+    assert engine.model is None
+
+
 @pytest.mark.integration
 def test_startup_time_comparison():
     """Compare startup time with background loading vs synchronous loading."""
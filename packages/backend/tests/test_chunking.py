@@ -0,0 +1,113 @@
+"""Tests for content chunking and chunk-level skill scoring."""
+
+import numpy as np
+
+from claude_skills_mcp_backend.chunking import chunk_skills, chunk_text
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+from claude_skills_mcp_backend.skill_loader import Skill
+
+
+def test_chunk_text_packs_small_sections():
+    """Test that short sections are packed into one chunk."""
+    content = "# Title\n\nIntro.\n\n## Usage\n\nRun it."
+
+    assert chunk_text(content, max_chars=1000) == [
+        "# Title\n\nIntro.\n\n## Usage\n\nRun it."
+    ]
+
+
+def test_chunk_text_splits_at_headings():
+    """Test that sections are split when they do not fit together."""
+    content = "# A\n\n" + "alpha " * 20 + "\n\n# B\n\n" + "beta " * 20
+
+    chunks = chunk_text(content, max_chars=150)
+
+    assert len(chunks) == 2
+    assert chunks[0].startswith("# A")
+    assert chunks[1].startswith("# B")
+
+
+def test_chunk_text_ignores_headings_in_code_blocks():
+    """Test that comment lines inside fenced code do not start sections."""
+    content = "# Usage\n\n```bash\n# install\npip install x\n```"
+
+    assert chunk_text(content, max_chars=1000) == [content]
+
+
+def test_chunk_text_windows_long_sections():
+    """Test that oversized sections are split into bounded windows."""
+    content = " ".join(f"word{i}" for i in range(500))
+
+    chunks = chunk_text(content, max_chars=200)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert "word0" in chunks[0]
+    assert "word499" in chunks[-1]
+
+
+def test_chunk_skills_offsets():
+    """Test that offsets map chunks back to skills, including empty content."""
+    skills = [
+        Skill(name="A", description="a", content="# One\n\nx", source="test://a"),
+        Skill(name="B", description="b", content="", source="test://b"),
+        Skill(name="C", description="c", content="y " * 300, source="test://c"),
+    ]
+
+    chunks, offsets = chunk_skills(skills, max_chars=200)
+
+    assert offsets[0] == 0
+    assert offsets[1] == 1
+    assert offsets[2] == 1
+    assert offsets[3] == len(chunks)
+
+
+def test_segment_max_handles_empty_segments():
+    """Test the vectorized segment-max against a per-segment loop."""
+    values = np.array([[0.1, 0.5, 0.3, 0.9, 0.2], [0.4, 0.0, 0.8, 0.1, 0.7]])
+    offsets = np.array([0, 2, 2, 4, 5])
+
+    result = SkillSearchEngine._segment_max(values, offsets)
+
+    expected = np.array([[0.5, -np.inf, 0.9, 0.2], [0.4, -np.inf, 0.8, 0.7]])
+    assert np.array_equal(result, expected)
+
+
+def test_content_chunks_make_body_searchable(mock_skills):
+    """Test that a skill is found through text only present in its content."""
+    engine = SkillSearchEngine(
+        "all-MiniLM-L6-v2", hybrid_search=False, chunk_content=True, chunk_size=200
+    )
+    hidden = Skill(
+        name="Lab Utilities",
+        description="Miscellaneous laboratory helpers",
+        content="# Overview\n\nGeneral helpers.\n\n## Protein folding\n\n"
+        "Predict protein folding structures from amino acid sequences.",
+        source="test://lab-utilities",
+    )
+    engine.index_skills(mock_skills + [hidden])
+
+    snapshot = engine.get_snapshot()
+    assert snapshot.chunk_offsets[-1] == len(snapshot.chunk_embeddings)
+    assert len(snapshot.chunk_offsets) == len(snapshot.skills) + 1
+
+    results = engine.search(
+        "predict protein folding from amino acid sequences", top_k=1
+    )
+    assert results[0]["name"] == "Lab Utilities"
+
+
+def test_add_skills_appends_chunks(mock_skills):
+    """Test that incremental adds extend the chunk matrix and offsets."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", chunk_content=True)
+    engine.add_skills(mock_skills[:2])
+    engine.add_skills(mock_skills[2:])
+
+    incremental = engine.get_snapshot()
+
+    bulk_engine = SkillSearchEngine("all-MiniLM-L6-v2", chunk_content=True)
+    bulk_engine.index_skills(mock_skills)
+    bulk = bulk_engine.get_snapshot()
+
+    assert np.array_equal(incremental.chunk_offsets, bulk.chunk_offsets)
+    assert np.allclose(incremental.chunk_embeddings, bulk.chunk_embeddings, atol=1e-6)
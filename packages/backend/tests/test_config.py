@@ -1,5 +1,6 @@
 """Tests for configuration management."""
 
+import inspect
 import json
 import tempfile
 from pathlib import Path
@@ -11,6 +12,7 @@ from claude_skills_mcp_backend.config import (
     get_example_config,
     DEFAULT_CONFIG,
 )
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
 
 
 def test_load_default_config():
@@ -103,3 +105,22 @@ def test_config_with_different_top_k(top_k):
         assert config["default_top_k"] == top_k
     finally:
         Path(config_path).unlink()
+
+
+@pytest.mark.parametrize("key", ["hybrid_search", "rrf_k", "degraded_search"])
+def test_search_mode_defaults_match_engine(key):
+    """Test that the server and the engine rank searches the same by default."""
+    parameters = inspect.signature(SkillSearchEngine).parameters
+
+    assert DEFAULT_CONFIG[key] == parameters[key].default
+
+
+@pytest.mark.parametrize(
+    "key", ["embedding_cache_enabled", "vector_store_enabled", "index_bundle_enabled"]
+)
+def test_disk_backed_features_are_opt_in(key):
+    """Test that features writing index files are off by default."""
+    example = json.loads(get_example_config())
+
+    assert DEFAULT_CONFIG[key] is False
+    assert example[key] is False
@@ -0,0 +1,236 @@
+"""Tests for the skill and query embedding caches."""
+
+import numpy as np
+
+from claude_skills_mcp_backend.embedding_cache import (
+    EmbeddingCache,
+    QueryEmbeddingCache,
+    hash_text,
+)
+
+
+def test_hash_text_is_stable():
+    """Test that identical text hashes identically and different text does not."""
+    assert hash_text("analyze RNA") == hash_text("analyze RNA")
+    assert hash_text("analyze RNA") != hash_text("analyze DNA")
+
+
+def test_cache_miss_returns_none(tmp_path):
+    """Test that unknown keys are reported as misses."""
+    cache = EmbeddingCache("test-model", cache_dir=tmp_path)
+
+    assert cache.get_many(["missing"]) == [None]
+    assert len(cache) == 0
+
+
+def test_cache_roundtrip_across_instances(tmp_path):
+    """Test that saved embeddings are visible to a fresh cache instance."""
+    vectors = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+
+    cache = EmbeddingCache("test-model", cache_dir=tmp_path)
+    cache.put_many(["a", "b"], vectors)
+    cache.save()
+
+    reloaded = EmbeddingCache("test-model", cache_dir=tmp_path)
+    cached = reloaded.get_many(["a", "b", "c"])
+
+    assert np.allclose(cached[0], vectors[0])
+    assert np.allclose(cached[1], vectors[1])
+    assert cached[2] is None
+    assert len(reloaded) == 2
+
+
+def test_cache_is_isolated_per_model(tmp_path):
+    """Test that embeddings from one model are never served for another."""
+    cache = EmbeddingCache("model-a", cache_dir=tmp_path)
+    cache.put_many(["a"], np.ones((1, 2), dtype=np.float32))
+    cache.save()
+
+    other = EmbeddingCache("model-b", cache_dir=tmp_path)
+
+    assert other.get_many(["a"]) == [None]
+
+
+def test_save_appends_only_new_entries(tmp_path):
+    """Test that each save writes a shard holding only its new entries."""
+    cache = EmbeddingCache("test-model", cache_dir=tmp_path)
+    cache.put_many(["a"], np.ones((1, 2), dtype=np.float32))
+    cache.save()
+    cache.put_many(["b"], np.zeros((1, 2), dtype=np.float32))
+    cache.save()
+    cache.save()
+
+    shards = sorted(tmp_path.glob("*.shard-*.npz"), key=lambda p: p.stat().st_mtime)
+    assert [list(np.load(path)["keys"]) for path in shards] == [["a"], ["b"]]
+    assert len(EmbeddingCache("test-model", cache_dir=tmp_path)) == 2
+
+
+def test_shards_are_merged(tmp_path, monkeypatch):
+    """Test that shards beyond the limit are merged into the base file."""
+    monkeypatch.setattr(EmbeddingCache, "_MAX_SHARDS", 2)
+    cache = EmbeddingCache("test-model", cache_dir=tmp_path)
+    for key in "abc":
+        cache.put_many([key], np.ones((1, 2), dtype=np.float32))
+        cache.save()
+
+    assert not list(tmp_path.glob("*.shard-*.npz"))
+    assert cache.cache_file.exists()
+    assert len(EmbeddingCache("test-model", cache_dir=tmp_path)) == 3
+
+
+def test_instances_keep_each_others_entries(tmp_path):
+    """Test that caches sharing a directory do not overwrite each other."""
+    first = EmbeddingCache("test-model", cache_dir=tmp_path)
+    second = EmbeddingCache("test-model", cache_dir=tmp_path)
+    assert len(first) == len(second) == 0
+
+    first.put_many(["a"], np.ones((1, 2), dtype=np.float32))
+    second.put_many(["b"], np.zeros((1, 2), dtype=np.float32))
+    first.save()
+    second.save()
+    first.prune(["a"])
+
+    reloaded = EmbeddingCache("test-model", cache_dir=tmp_path)
+    assert [vector is not None for vector in reloaded.get_many(["a", "b"])] == [
+        True,
+        True,
+    ]
+
+
+def test_prune_bounds_cache_to_used_keys(tmp_path):
+    """Test that unused entries leave memory, and disk once they are old."""
+    cache = EmbeddingCache("test-model", cache_dir=tmp_path)
+    cache.put_many(["a", "b"], np.ones((2, 2), dtype=np.float32))
+    cache.save()
+
+    assert cache.prune(["a"]) == 1
+    assert cache.get_many(["a", "b"])[1] is None
+    assert len(EmbeddingCache("test-model", cache_dir=tmp_path)) == 2
+
+    expired = EmbeddingCache("test-model", cache_dir=tmp_path, max_age_days=0)
+    expired.prune(["a"])
+    assert len(EmbeddingCache("test-model", cache_dir=tmp_path)) == 1
+    assert not list(tmp_path.glob("*.shard-*.npz"))
+
+
+def test_engine_saves_cache_once_loading_finishes(tmp_path, mock_skills):
+    """Test that batched adds write the cache once, on persist."""
+    from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", encoder_backend="hashing")
+    engine.embedding_cache = EmbeddingCache("hashing", cache_dir=tmp_path)
+    for skill in mock_skills:
+        engine.add_skills([skill])
+    assert not list(tmp_path.iterdir())
+
+    engine.persist()
+
+    assert len(EmbeddingCache("hashing", cache_dir=tmp_path)) == len(mock_skills)
+
+
+def test_engine_only_encodes_new_descriptions(tmp_path, mock_skills, monkeypatch):
+    """Test that re-indexing reuses cached embeddings for unchanged skills."""
+    from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+    from claude_skills_mcp_backend.skill_loader import Skill
+
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.embedding_cache = EmbeddingCache("all-MiniLM-L6-v2", cache_dir=tmp_path)
+    model = engine._ensure_model_loaded()
+
+    encoded: list[str] = []
+    original_encode = model.encode
+
+    def counting_encode(texts, **kwargs):
+        encoded.extend(texts)
+        return original_encode(texts, **kwargs)
+
+    monkeypatch.setattr(model, "encode", counting_encode)
+
+    engine.index_skills(mock_skills)
+    assert len(encoded) == 3
+    first_embeddings = engine.embeddings.copy()
+
+    # Re-index with one changed description
+    encoded.clear()
+    changed = Skill(
+        name="Drug Discovery",
+        description="Virtual screening of compound libraries",
+        content="Updated content",
+        source="test://drug-discovery",
+    )
+    engine.index_skills(mock_skills[:2] + [changed])
+
+    assert encoded == ["Virtual screening of compound libraries"]
+    assert np.allclose(engine.embeddings[:2], first_embeddings[:2], atol=1e-6)
+
+
+def test_query_cache_hits_normalized_queries():
+    """Test that whitespace variants of a query share one cache entry."""
+    cache = QueryEmbeddingCache(max_size=4)
+    cache.put("model", "analyze  RNA data ", np.ones(2))
+
+    assert cache.get("model", "analyze RNA data") is not None
+    assert cache.get("model", "analyze DNA data") is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_query_cache_evicts_least_recently_used():
+    """Test LRU eviction once the cache is full."""
+    cache = QueryEmbeddingCache(max_size=2)
+    cache.put("model", "a", np.zeros(2))
+    cache.put("model", "b", np.zeros(2))
+    cache.get("model", "a")  # "b" is now least recently used
+    cache.put("model", "c", np.zeros(2))
+
+    assert cache.get("model", "b") is None
+    assert cache.get("model", "a") is not None
+    assert cache.get("model", "c") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_query_cache_invalidated_on_model_change():
+    """Test that entries for another model are dropped."""
+    cache = QueryEmbeddingCache(max_size=4)
+    cache.put("model-a", "query", np.zeros(2))
+
+    assert cache.get("model-b", "query") is None
+    assert cache.get("model-a", "query") is None
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_query_cache_disabled():
+    """Test that a zero-sized cache never stores anything."""
+    cache = QueryEmbeddingCache(max_size=0)
+    cache.put("model", "query", np.zeros(2))
+
+    assert cache.get("model", "query") is None
+    assert cache.get_stats()["size"] == 0
+
+
+def test_engine_reuses_query_embeddings(mock_skills, monkeypatch):
+    """Test that repeated searches skip the model encode."""
+    from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", query_cache_size=8)
+    engine.index_skills(mock_skills)
+    model = engine._ensure_model_loaded()
+
+    encoded: list[str] = []
+    original_encode = model.encode
+
+    def counting_encode(texts, **kwargs):
+        encoded.extend(texts)
+        return original_encode(texts, **kwargs)
+
+    monkeypatch.setattr(model, "encode", counting_encode)
+
+    first = engine.search("RNA sequencing data", top_k=1)
+    second = engine.search("  RNA sequencing   data", top_k=1)
+
+    assert encoded == ["RNA sequencing data"]
+    assert first[0]["name"] == second[0]["name"]
+    assert engine.query_cache.get_stats()["hits"] == 1
@@ -0,0 +1,90 @@
+"""Tests for the process-pool encoder."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from claude_skills_mcp_backend.encoder_pool import EncoderPool
+from claude_skills_mcp_backend.encoders import HashingEncoder
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Two hashing encoder workers with small buffers."""
+    pool = EncoderPool("hashing", "unused", num_workers=2, capacity=16)
+    yield pool
+    pool.close()
+
+
+def test_pool_matches_in_process_encoder(pool):
+    """Test that requests larger than a buffer are split and reassembled."""
+    texts = [f"skill {i} for sequence analysis" for i in range(50)]
+
+    embeddings = pool.encode(texts)
+
+    assert pool.dimension == 384
+    assert embeddings.dtype == np.float32
+    assert np.array_equal(embeddings, HashingEncoder().encode(texts))
+    assert pool.encode([]).shape == (0, 384)
+
+
+def test_pool_serves_concurrent_callers(pool):
+    """Test that concurrent calls each get their own rows."""
+    texts = [f"query {i}" for i in range(20)]
+    results: dict[int, np.ndarray] = {}
+
+    def run(i: int) -> None:
+        results[i] = pool.encode([texts[i]])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    expected = HashingEncoder().encode(texts)
+    for i in range(len(texts)):
+        assert np.array_equal(results[i], expected[i : i + 1])
+
+
+def test_pool_reports_worker_startup_errors():
+    """Test that a replica that cannot load fails the pool start."""
+    with pytest.raises(RuntimeError, match="Unknown encoder backend"):
+        EncoderPool("tensorflow", "unused", num_workers=1)
+
+
+def test_engine_with_encoder_workers(mock_skills):
+    """Test indexing and searching through encoder worker processes."""
+    engine = SkillSearchEngine(
+        "all-MiniLM-L6-v2", encoder_backend="hashing", encoder_workers=2
+    )
+    try:
+        engine.index_skills(mock_skills)
+        results = engine.search("protein structure prediction", top_k=1)
+
+        assert isinstance(engine.model, EncoderPool)
+        assert results[0]["name"] == "Protein Folding"
+    finally:
+        engine.model.close()
+
+
+def test_pool_replaces_dead_worker():
+    """Test that a killed worker fails its request and is replaced."""
+    pool = EncoderPool("hashing", "unused", num_workers=1, capacity=16)
+    try:
+        worker = pool._workers[0]
+        worker.process.kill()
+        worker.process.join(timeout=10)
+
+        with pytest.raises(RuntimeError, match="died"):
+            pool.encode(["first"])
+
+        assert pool._workers[0] is not worker
+        assert pool._workers[0].process.is_alive()
+        assert np.array_equal(
+            pool.encode(["second"]), HashingEncoder().encode(["second"])
+        )
+    finally:
+        pool.close()
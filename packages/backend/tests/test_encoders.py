@@ -0,0 +1,92 @@
+"""Tests for encoder backends."""
+
+import numpy as np
+import pytest
+
+from claude_skills_mcp_backend.encoders import (
+    Encoder,
+    HashingEncoder,
+    create_encoder,
+    encoder_fingerprint,
+)
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+
+def test_hashing_encoder_is_deterministic():
+    """Test that the hashing encoder maps equal texts to equal vectors."""
+    first = HashingEncoder(dimension=64).encode(["RNA sequencing", "protein folding"])
+    second = HashingEncoder(dimension=64).encode(["RNA sequencing", "protein folding"])
+
+    assert first.shape == (2, 64)
+    assert first.dtype == np.float32
+    assert np.array_equal(first, second)
+    assert HashingEncoder().encode([]).shape == (0, 384)
+
+
+def test_encoder_requires_encode():
+    """Test that a backend must implement encode."""
+
+    class Incomplete(Encoder):
+        dimension = 8
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_hashing_encoder_similarity_follows_shared_words():
+    """Test that texts sharing words are closer than unrelated texts."""
+    vectors = SkillSearchEngine._normalize_rows(
+        HashingEncoder().encode(
+            [
+                "single cell RNA sequencing analysis",
+                "RNA sequencing differential expression analysis",
+                "molecular docking of small molecules",
+            ]
+        )
+    )
+
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_create_encoder_unknown_backend():
+    """Test that unknown backends are rejected."""
+    with pytest.raises(ValueError, match="Unknown encoder backend"):
+        create_encoder("tensorflow", "all-MiniLM-L6-v2")
+    with pytest.raises(ValueError, match="Unknown encoder backend"):
+        SkillSearchEngine("all-MiniLM-L6-v2", encoder_backend="tensorflow")
+
+
+def test_encoder_fingerprint_keeps_torch_caches():
+    """Test that only non-reference backends change the cache key."""
+    assert encoder_fingerprint("torch", "all-MiniLM-L6-v2") == "all-MiniLM-L6-v2"
+    assert encoder_fingerprint("onnx-int8", "all-MiniLM-L6-v2") != encoder_fingerprint(
+        "onnx", "all-MiniLM-L6-v2"
+    )
+
+
+def test_engine_with_hashing_encoder(mock_skills):
+    """Test indexing and searching with the hashing backend."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", encoder_backend="hashing")
+    engine.index_skills(mock_skills)
+
+    assert isinstance(engine.model, HashingEncoder)
+    assert engine.embeddings.shape == (3, 384)
+    results = engine.search("protein structure prediction", top_k=1)
+    assert results[0]["name"] == "Protein Folding"
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("backend", ["onnx", "onnx-int8"])
+def test_onnx_encoder_matches_torch(backend):
+    """Test that ONNX embeddings agree with the PyTorch model."""
+    pytest.importorskip("onnxruntime")
+    texts = ["Analyze RNA sequencing data", "Predict protein structure"]
+
+    reference = SkillSearchEngine._normalize_rows(
+        create_encoder("torch", "all-MiniLM-L6-v2").encode(texts)
+    )
+    onnx = SkillSearchEngine._normalize_rows(
+        create_encoder(backend, "all-MiniLM-L6-v2").encode(texts)
+    )
+
+    assert np.all(np.sum(reference * onnx, axis=1) > 0.95)
@@ -0,0 +1,65 @@
+"""Tests for the growable buffers behind incremental indexing."""
+
+import numpy as np
+
+from claude_skills_mcp_backend.growable import GrowableArray, SkillTable
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+
+def test_growable_array_doubles_capacity():
+    """Test that capacity grows geometrically, not per append."""
+    buffer = GrowableArray((2,), capacity=4)
+    reallocations = 0
+    capacity = buffer.capacity
+    for i in range(100):
+        buffer.append(np.full((1, 2), i, dtype=np.float32))
+        if buffer.capacity != capacity:
+            reallocations += 1
+            capacity = buffer.capacity
+
+    assert len(buffer) == 100
+    assert reallocations == 5  # 4 -> 8 -> 16 -> 32 -> 64 -> 128
+    assert np.array_equal(buffer.last_view[:, 0], np.arange(100))
+
+
+def test_growable_array_views_survive_appends():
+    """Test that earlier views are unchanged by later appends and growth."""
+    buffer = GrowableArray((), dtype=np.int64, capacity=2)
+    first = buffer.append(np.array([1, 2]))
+    buffer.append(np.array([3, 4, 5]))
+
+    assert first.tolist() == [1, 2]
+    assert buffer.last_view.tolist() == [1, 2, 3, 4, 5]
+
+
+def test_skill_table_views(mock_skills):
+    """Test that skill table views behave like fixed-length lists."""
+    table = SkillTable(mock_skills[:1])
+    first = table.last_view
+    second = table.append(mock_skills[1:])
+
+    assert len(first) == 1
+    assert list(second) == mock_skills
+    assert second == mock_skills
+    assert second[-1] is mock_skills[-1]
+    assert second[1:] == mock_skills[1:]
+
+
+def test_add_skills_shares_buffers(mock_skills):
+    """Test that consecutive adds extend one buffer instead of copying."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    for skill in mock_skills:
+        engine.add_skills([skill])
+
+    snapshot = engine.get_snapshot()
+    buffer = engine._buffers.arrays["embeddings"]
+    assert snapshot.embeddings is buffer.last_view
+    assert not snapshot.embeddings.flags.writeable
+    assert len(snapshot.skills) == len(mock_skills)
+    assert [s.name for s in snapshot.skills] == [s.name for s in mock_skills]
+
+    # A full re-index followed by an add starts fresh buffers seeded once
+    engine.index_skills(mock_skills[:2])
+    engine.add_skills(mock_skills[2:])
+    assert [s.name for s in engine.skills] == [s.name for s in mock_skills]
+    assert len(engine.embeddings) == len(mock_skills)
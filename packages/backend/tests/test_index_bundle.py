@@ -0,0 +1,171 @@
+"""Tests for single-file index bundles."""
+
+import numpy as np
+import pytest
+
+from claude_skills_mcp_backend.index_bundle import (
+    BUNDLE_MAGIC,
+    read_bundle,
+    write_bundle,
+)
+from claude_skills_mcp_backend.lexical_index import BM25Index
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+from claude_skills_mcp_backend.skill_loader import Skill
+
+
+def test_write_and_read_roundtrip(tmp_path):
+    """Test that arrays come back mapped read-only, aligned and unchanged."""
+    path = tmp_path / "index.bundle"
+    arrays = {
+        "matrix": np.arange(15, dtype=np.float32).reshape(5, 3),
+        "offsets": np.array([0, 2, 7], dtype=np.int64),
+        "empty": np.empty((0, 3), dtype=np.float32),
+    }
+
+    write_bundle(path, {"note": "test"}, arrays)
+    header, mapped = read_bundle(path)
+
+    assert header["note"] == "test"
+    assert mapped.keys() == arrays.keys()
+    for name, array in arrays.items():
+        assert mapped[name].dtype == array.dtype
+        assert np.array_equal(mapped[name], array)
+        if array.size:
+            assert isinstance(mapped[name], np.memmap)
+            assert not mapped[name].flags.writeable
+            assert mapped[name].ctypes.data % 64 == 0
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_read_rejects_invalid_files(tmp_path):
+    """Test that foreign, newer and truncated files raise ValueError."""
+    path = tmp_path / "index.bundle"
+    path.write_bytes(b"not a bundle at all, just some bytes")
+    with pytest.raises(ValueError, match="Not an index bundle"):
+        read_bundle(path)
+
+    write_bundle(path, {}, {"matrix": np.ones((4, 4), dtype=np.float32)})
+    data = path.read_bytes()
+    path.write_bytes(BUNDLE_MAGIC + (99).to_bytes(4, "little") + data[12:])
+    with pytest.raises(ValueError, match="format version 99"):
+        read_bundle(path)
+
+    path.write_bytes(data[:-16])
+    with pytest.raises(ValueError, match="Truncated"):
+        read_bundle(path)
+
+    with pytest.raises(FileNotFoundError):
+        read_bundle(tmp_path / "missing.bundle")
+
+
+def test_bm25_arrays_roundtrip(mock_skills):
+    """Test that an exported BM25 index scores like the original and can grow."""
+    index = BM25Index()
+    index.add_skills(mock_skills)
+    terms, arrays = index.to_arrays()
+    restored = BM25Index.from_arrays(terms, arrays)
+
+    for query in ("protein structure", "drug compounds", "rna genes"):
+        assert np.allclose(restored.score(query), index.score(query))
+
+    index.add_skills(mock_skills[:1])
+    restored.add_skills(mock_skills[:1])
+    assert np.allclose(restored.score("rna"), index.score("rna"))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"chunk_content": True, "chunk_size": 20},
+        {"embedding_storage": "int8", "hybrid_search": False},
+    ],
+)
+def test_engine_bundle_restores_search(mock_skills, tmp_path, monkeypatch, options):
+    """Test that a restored engine ranks like the original without encoding skills."""
+    path = tmp_path / "index.bundle"
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", **options)
+    engine.index_skills(mock_skills)
+    assert engine.save_bundle(path)
+
+    # Compare semantic rankings rather than keyword ranking while loading
+    restored = SkillSearchEngine("all-MiniLM-L6-v2", degraded_search=False, **options)
+    encoded = []
+    monkeypatch.setattr(
+        restored, "_encode_descriptions", lambda skills: encoded.extend(skills)
+    )
+    assert restored.load_bundle(path)
+
+    assert encoded == []
+    assert [s.source for s in restored.skills] == [s.source for s in mock_skills]
+    assert np.array_equal(
+        restored.get_snapshot().graph.neighbors, engine.get_snapshot().graph.neighbors
+    )
+    for query in ("protein structure prediction", "screen drug compounds"):
+        expected = engine.search(query, top_k=3)
+        results = restored.search(query, top_k=3)
+        assert [r["source"] for r in results] == [r["source"] for r in expected]
+        assert [r["relevance_score"] for r in results] == pytest.approx(
+            [r["relevance_score"] for r in expected], abs=1e-5
+        )
+
+
+def test_engine_bundle_skips_removed_and_keeps_duplicates(mock_skills, tmp_path):
+    """Test that tombstoned rows are dropped and alternate sources kept."""
+    path = tmp_path / "index.bundle"
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=None)
+    vendored = Skill.from_dict(
+        {**mock_skills[0].to_dict(), "source": "test://vendored/rna"}
+    )
+    engine.index_skills([*mock_skills, vendored])
+    engine.remove_skills([mock_skills[1].source])
+    assert engine.save_bundle(path)
+
+    restored = SkillSearchEngine("all-MiniLM-L6-v2")
+    assert restored.load_bundle(path)
+
+    assert [s.source for s in restored.skills] == [
+        mock_skills[0].source,
+        mock_skills[2].source,
+    ]
+    assert restored.get_snapshot().num_dead == 0
+    results = restored.search("RNA sequencing differential expression", top_k=1)
+    assert results[0]["alternate_sources"] == [vendored.source]
+
+
+def test_engine_bundle_rejects_incompatible(mock_skills, tmp_path):
+    """Test that bundles of another model or chunking setup are not loaded."""
+    path = tmp_path / "index.bundle"
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    assert not engine.save_bundle(path)
+    engine.index_skills(mock_skills)
+    assert engine.save_bundle(path)
+
+    other_model = SkillSearchEngine("all-MiniLM-L6-v2", encoder_backend="hashing")
+    assert not other_model.load_bundle(path)
+    chunked = SkillSearchEngine("all-MiniLM-L6-v2", chunk_content=True)
+    assert not chunked.load_bundle(path)
+    assert not engine.load_bundle(tmp_path / "missing.bundle")
+
+
+def test_sync_after_restore_adopts_document_fetchers(mock_skills, tmp_path):
+    """Test that an unchanged refresh gives restored skills their fetchers."""
+    path = tmp_path / "index.bundle"
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills)
+    engine.save_bundle(path)
+    restored = SkillSearchEngine("all-MiniLM-L6-v2")
+    restored.load_bundle(path)
+
+    def fetcher(doc_path):
+        return {"type": "text", "content": doc_path}
+
+    for skill in mock_skills:
+        skill._document_fetcher = fetcher
+    before = restored.get_snapshot()
+    stats = restored.sync_skills(mock_skills)
+
+    assert stats["unchanged"] == len(mock_skills)
+    assert all(skill._document_fetcher is fetcher for skill in restored.skills)
+    assert all(skill._document_fetcher is None for skill in before.skills)
+    assert restored.get_snapshot().embeddings is before.embeddings
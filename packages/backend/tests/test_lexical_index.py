@@ -0,0 +1,126 @@
+"""Tests for the BM25 lexical index and hybrid search."""
+
+import numpy as np
+
+from claude_skills_mcp_backend.lexical_index import BM25Index, tokenize, tokenize_skill
+from claude_skills_mcp_backend.skill_loader import Skill
+
+
+def _skill(name: str, description: str, content: str = "") -> Skill:
+    return Skill(
+        name=name,
+        description=description,
+        content=content,
+        source=f"test://{name.lower().replace(' ', '-')}",
+    )
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    """Test tokenization of mixed-case text with punctuation."""
+    assert tokenize("Use RDKit for the SMILES-parsing of molecules") == [
+        "rdkit",
+        "smiles",
+        "parsing",
+        "molecules",
+    ]
+
+
+def test_tokenize_skill_weights_name_highest():
+    """Test that name terms outweigh description and content terms."""
+    counts = tokenize_skill(_skill("RDKit", "Cheminformatics toolkit", "rdkit"))
+
+    assert counts["rdkit"] == 3 + 1
+    assert counts["cheminformatics"] == 2
+
+
+def test_bm25_ranks_exact_term_match_first():
+    """Test that documents containing the rare query term score highest."""
+    index = BM25Index()
+    index.add_skills(
+        [
+            _skill("Molecules", "Work with chemical structures"),
+            _skill("RDKit", "Cheminformatics toolkit for molecules"),
+            _skill("Plotting", "Create charts and figures"),
+        ]
+    )
+
+    scores = index.score("rdkit molecules")
+
+    assert scores.dtype == np.float32
+    assert int(np.argmax(scores)) == 1
+    assert scores[2] == 0.0
+
+
+def test_bm25_incremental_add_matches_bulk_build():
+    """Test that appending in batches gives the same scores as one build."""
+    skills = [
+        _skill(f"Skill {i}", f"description term{i % 3} shared") for i in range(40)
+    ]
+
+    bulk = BM25Index()
+    bulk.add_skills(skills)
+
+    incremental = BM25Index()
+    for start in range(0, len(skills), 7):
+        incremental.add_skills(skills[start : start + 7])
+
+    assert incremental.num_docs == 40
+    assert np.allclose(
+        bulk.score("term1 shared"), incremental.score("term1 shared"), atol=1e-6
+    )
+
+
+def test_bm25_scores_prefix_of_documents():
+    """Test that a reader limited to num_docs ignores later appends."""
+    index = BM25Index()
+    index.add_skills([_skill("Alpha", "first"), _skill("Beta", "second")])
+    before = index.score("alpha beta gamma", num_docs=2)
+
+    index.add_skills([_skill("Gamma", "third")])
+
+    assert np.allclose(index.score("alpha beta gamma", num_docs=2), before)
+    assert index.score("alpha beta gamma").shape == (3,)
+
+
+def test_hybrid_search_ranks_exact_name_first(mock_skills):
+    """Test that a query naming a tool returns that skill first."""
+    from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", hybrid_search=True)
+    engine.index_skills(
+        mock_skills + [_skill("RDKit", "Cheminformatics toolkit", "SMILES parsing")]
+    )
+
+    results = engine.search("rdkit", top_k=2)
+
+    assert results[0]["name"] == "RDKit"
+    assert results[0]["lexical_score"] > 0
+    assert "vector_score" in results[0]
+    assert 0.0 < results[0]["relevance_score"] <= 1.0
+
+
+def test_hybrid_search_follows_add_skills(mock_skills):
+    """Test that skills added incrementally are visible to lexical matching."""
+    from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", hybrid_search=True)
+    engine.add_skills(mock_skills[:2])
+    old_snapshot = engine.get_snapshot()
+    engine.add_skills([_skill("Scanpy", "Single-cell analysis")])
+
+    assert engine.search("scanpy", top_k=1)[0]["name"] == "Scanpy"
+    # The earlier snapshot still scores only its own skills
+    assert old_snapshot.lexical.score("scanpy", len(old_snapshot.skills)).shape == (2,)
+
+
+def test_vector_only_search_when_hybrid_disabled(mock_skills):
+    """Test that disabling hybrid search omits lexical scoring."""
+    from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", hybrid_search=False)
+    engine.index_skills(mock_skills)
+
+    results = engine.search("RNA sequencing", top_k=1)
+
+    assert engine.get_snapshot().lexical is None
+    assert "lexical_score" not in results[0]
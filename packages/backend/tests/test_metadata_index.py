@@ -0,0 +1,112 @@
+"""Tests for the metadata filter masks."""
+
+import numpy as np
+import pytest
+
+from claude_skills_mcp_backend.metadata_index import (
+    MetadataIndex,
+    filter_keys,
+    normalize_repo,
+    skill_metadata,
+    source_kind,
+)
+from claude_skills_mcp_backend.skill_loader import Skill
+
+
+def _skill(source: str, tags: list[str] | None = None, documents=None) -> Skill:
+    return Skill(
+        name=source,
+        description="d",
+        content="c",
+        source=source,
+        documents=documents,
+        tags=tags,
+    )
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("https://github.com/K-Dense-AI/skills/tree/main/rna/SKILL.md", "github"),
+        ("/home/user/.claude/skills/rna/SKILL.md", "local"),
+        ("C:\\skills\\rna\\SKILL.md", "local"),
+        ("test://rna-analysis", "test"),
+    ],
+)
+def test_source_kind(source, expected):
+    """Test classification of skill sources."""
+    assert source_kind(source) == expected
+
+
+def test_normalize_repo():
+    """Test that repositories are normalized from names and URLs."""
+    for repo in [
+        "K-Dense-AI/Skills",
+        "https://github.com/K-Dense-AI/skills.git",
+        "https://github.com/K-Dense-AI/skills/tree/main/rna/SKILL.md",
+    ]:
+        assert normalize_repo(repo) == "k-dense-ai/skills"
+    assert normalize_repo("skills") == ""
+
+
+def test_skill_metadata_keys():
+    """Test the metadata keys of a GitHub skill with documents and tags."""
+    skill = _skill(
+        "https://github.com/owner/repo/tree/main/rna/SKILL.md",
+        tags=["Genomics"],
+        documents={"scripts/run.py": {}},
+    )
+    assert skill_metadata(skill) == {
+        ("source", "github"),
+        ("repo", "owner/repo"),
+        ("has_documents", "true"),
+        ("tag", "genomics"),
+    }
+
+
+def test_filter_keys_validation():
+    """Test that invalid filters are rejected and empty ones are dropped."""
+    assert filter_keys() == []
+    assert filter_keys(source="GitHub", tags=["RNA"]) == [
+        ("source", "github"),
+        ("tag", "rna"),
+    ]
+    with pytest.raises(ValueError, match="Unknown source filter"):
+        filter_keys(source="gitlab")
+    with pytest.raises(ValueError, match="Invalid repo filter"):
+        filter_keys(repo="skills")
+
+
+def test_select_combines_masks_across_appends():
+    """Test that masks are ANDed and stay aligned when keys appear later."""
+    index = MetadataIndex()
+    index.add_skills(
+        [
+            _skill("https://github.com/a/one/tree/main/x", tags=["rna"]),
+            _skill("/local/y"),
+        ]
+    )
+    index.add_skills([_skill("https://github.com/b/two/tree/main/z", tags=["new"])])
+
+    assert index.num_rows == 3
+    assert index.select([("source", "github")]).tolist() == [True, False, True]
+    assert index.select([("source", "github"), ("tag", "rna")]).tolist() == [
+        True,
+        False,
+        False,
+    ]
+    # A key first seen in a later batch does not match earlier rows
+    assert index.select([("tag", "new")]).tolist() == [False, False, True]
+    assert not index.select([("tag", "unknown")]).any()
+
+
+def test_select_reads_snapshot_prefix():
+    """Test that older snapshots only see their own rows."""
+    index = MetadataIndex()
+    index.add_skills([_skill("/local/a")])
+    index.add_skills([_skill("/local/b")] * 100)
+
+    selected = index.select([("source", "local")], num_rows=1)
+
+    assert selected.shape == (1,)
+    assert np.array_equal(selected, [True])
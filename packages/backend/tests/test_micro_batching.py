@@ -0,0 +1,104 @@
+"""Tests for micro-batching of concurrent encodes."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from claude_skills_mcp_backend.encoders import HashingEncoder
+from claude_skills_mcp_backend.micro_batching import MicroBatcher
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+
+class _RecordingEncoder:
+    """Hashing encoder that records batch sizes and can hold a batch."""
+
+    def __init__(self):
+        self.encoder = HashingEncoder(dimension=16)
+        self.batches: list[int] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.release.wait(timeout=10)
+        self.batches.append(len(texts))
+        return self.encoder.encode(texts)
+
+
+def test_concurrent_requests_share_batches():
+    """Test that requests queued during an encode are flushed together."""
+    encoder = _RecordingEncoder()
+    batcher = MicroBatcher(encoder, max_batch_size=64, max_wait_ms=50)
+    texts = [f"query number {i}" for i in range(10)]
+    results: dict[int, np.ndarray] = {}
+
+    def run(i: int) -> None:
+        results[i] = batcher.encode([texts[i]])
+
+    # Hold the first batch in the encoder while the other requests queue up
+    encoder.release.clear()
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    encoder.release.set()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert sum(encoder.batches) == len(texts)
+    assert len(encoder.batches) <= 2
+    expected = HashingEncoder(dimension=16).encode(texts)
+    for i in range(len(texts)):
+        assert np.array_equal(results[i], expected[i : i + 1])
+
+
+def test_batch_flushes_at_max_size():
+    """Test that a batch is flushed once it holds max_batch_size texts."""
+    encoder = _RecordingEncoder()
+    batcher = MicroBatcher(encoder, max_batch_size=4, max_wait_ms=10000)
+
+    result = batcher.encode(["a", "b", "c", "d", "e"])
+
+    assert result.shape == (5, 16)
+    assert encoder.batches == [5]
+
+
+def test_encode_errors_reach_every_caller():
+    """Test that a failing batch raises in each waiting caller."""
+
+    def failing(texts):
+        raise RuntimeError("encoder crashed")
+
+    batcher = MicroBatcher(failing, max_wait_ms=0)
+    with pytest.raises(RuntimeError, match="encoder crashed"):
+        batcher.encode(["query"])
+
+
+def test_stats_report_latency_and_throughput():
+    """Test the latency percentiles, batch size and throughput metrics."""
+    batcher = MicroBatcher(_RecordingEncoder(), max_wait_ms=0)
+    assert batcher.get_stats()["p50_ms"] is None
+
+    for i in range(5):
+        batcher.encode([f"query {i}", "shared"])
+
+    stats = batcher.get_stats()
+    assert stats["requests"] == 5
+    assert stats["texts"] == 10
+    assert 0 <= stats["p50_ms"] <= stats["p99_ms"]
+    assert stats["mean_batch_size"] >= 2
+
+
+def test_engine_search_uses_batcher(mock_skills):
+    """Test that engine searches encode queries through the batcher."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", query_batch_size=8)
+    engine.index_skills(mock_skills)
+
+    results = engine.search("protein structure prediction", top_k=1)
+
+    assert results[0]["name"] == "Protein Folding"
+    assert engine.query_batcher.get_stats()["requests"] == 1
+    assert (
+        SkillSearchEngine("all-MiniLM-L6-v2", query_batch_size=1).query_batcher is None
+    )
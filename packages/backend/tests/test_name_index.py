@@ -0,0 +1,95 @@
+"""Tests for skill name lookup and suggestions."""
+
+import asyncio
+
+import numpy as np
+
+from claude_skills_mcp_backend.mcp_handlers import handle_read_skill_document
+from claude_skills_mcp_backend.name_index import NameIndex, normalize_name
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+from claude_skills_mcp_backend.skill_loader import Skill
+
+
+def _skills(*names: str) -> list[Skill]:
+    return [
+        Skill(
+            name=name,
+            description=f"Description of {name}",
+            content=f"Content of {name}",
+            source=f"test://{i}",
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+def test_normalize_name():
+    """Test that case and separators do not matter."""
+    assert normalize_name("PDF-Processing") == "pdf processing"
+    assert normalize_name("  pdf__processing ") == "pdf processing"
+    assert normalize_name("Äpfel: Ölsaaten") == "äpfel ölsaaten"
+
+
+def test_lookup_prefers_exact_and_live_rows():
+    """Test exact, normalized, bounded and tombstoned lookups."""
+    index = NameIndex()
+    index.add_skills(_skills("pdf-processing", "PDF Processing", "RNA Analysis"))
+    index.add_skills(_skills("RNA Analysis"))
+
+    assert index.lookup("PDF Processing") == 1
+    assert index.lookup("pdf processing") == 0
+    assert index.lookup("rna_analysis") == 2
+    assert index.lookup("Missing") is None
+
+    tombstones = np.array([False, False, True, False])
+    assert index.lookup("RNA Analysis", tombstones=tombstones) == 3
+    assert index.lookup("RNA Analysis", num_rows=2) is None
+
+
+def test_suggest_ranks_similar_names():
+    """Test that misspelled names suggest the closest live names first."""
+    index = NameIndex()
+    index.add_skills(
+        _skills("Protein Folding", "Protein Design", "RNA Analysis", "Drug Discovery")
+    )
+
+    assert index.suggest("protien folding") == [0]
+    assert index.suggest("protein", limit=2) == [1, 0]
+    assert index.suggest("rna analyses") == [2]
+    assert index.suggest("completely unrelated") == []
+    tombstones = np.array([False, True, False, False])
+    assert index.suggest("protein", tombstones=tombstones) == [0]
+
+
+def test_engine_lookup_follows_updates():
+    """Test that lookups see replaced, removed and staged skills."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", encoder_backend="hashing")
+    skills = _skills("Protein Folding", "RNA Analysis")
+    engine.index_skills(skills)
+
+    updated = Skill.from_dict({**skills[0].to_dict(), "content": "New content"})
+    engine.update_skill(updated)
+    assert engine.get_skill("protein-folding") is updated
+
+    engine.remove_skills([skills[1].source])
+    assert engine.get_skill("RNA Analysis") is None
+    assert engine.suggest_skill_names("RNA Analysis") == []
+
+    engine.stage_skills(_skills("Drug Discovery"))
+    assert engine.get_skill("Drug Discovery").name == "Drug Discovery"
+    assert engine.suggest_skill_names("drug discovry") == ["Drug Discovery"]
+
+
+def test_read_document_suggests_names():
+    """Test that a misspelled skill name is answered with suggestions."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", encoder_backend="hashing")
+    engine.index_skills(_skills("Protein Folding", "RNA Analysis"))
+
+    response = asyncio.run(
+        handle_read_skill_document({"skill_name": "Protein Foldng"}, engine)
+    )
+    assert "Did you mean: 'Protein Folding'?" in response[0].text
+
+    response = asyncio.run(
+        handle_read_skill_document({"skill_name": "protein folding"}, engine)
+    )
+    assert response[0].text == "Skill 'protein folding' has no additional documents."
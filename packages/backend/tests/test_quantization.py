@@ -0,0 +1,92 @@
+"""Tests for quantized embedding storage."""
+
+import numpy as np
+import pytest
+
+from claude_skills_mcp_backend.quantization import QuantizedMatrix, file_backed
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+
+
+def _normalized(n: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return SkillSearchEngine._normalize_rows(rng.standard_normal((n, dim)))
+
+
+@pytest.mark.parametrize("mode,atol", [("float16", 1e-3), ("int8", 2e-2)])
+def test_quantized_dot_approximates_float32(mode, atol):
+    """Test that quantized scores stay close to exact scores."""
+    matrix = _normalized(200)
+    queries = _normalized(3, seed=1)
+    quantized = QuantizedMatrix.quantize(matrix, mode)
+
+    assert np.allclose(quantized.dot(queries), queries @ matrix.T, atol=atol)
+    rows = np.array([5, 17, 42])
+    assert np.allclose(
+        quantized.dot(queries[0], rows), matrix[rows] @ queries[0], atol=atol
+    )
+
+
+def test_int8_uses_quarter_of_float32_memory():
+    """Test the memory footprint of int8 codes plus per-row scales."""
+    matrix = _normalized(1000, dim=384)
+    quantized = QuantizedMatrix.quantize(matrix, "int8")
+
+    assert quantized.codes.dtype == np.int8
+    assert quantized.nbytes == 1000 * 384 + 1000 * 4
+    assert quantized.nbytes < matrix.nbytes / 3.9
+
+
+def test_appended_rows_match_quantizing_all_rows():
+    """Test that rows quantized separately keep their own scales."""
+    matrix = _normalized(50)
+    whole = QuantizedMatrix.quantize(matrix, "int8")
+    appended = QuantizedMatrix.quantize(matrix[20:], "int8")
+
+    assert np.array_equal(whole.slice(20, 50).codes, appended.codes)
+    assert np.array_equal(whole.slice(20, 50).scales, appended.scales)
+
+
+def test_file_backed_matrix_is_read_only_copy():
+    """Test that the memory-mapped copy has the same contents."""
+    matrix = _normalized(10)
+    mapped = file_backed(matrix)
+
+    assert isinstance(mapped, np.memmap)
+    assert not mapped.flags.writeable
+    assert np.array_equal(mapped, matrix)
+
+
+def test_unknown_storage_mode_rejected():
+    """Test that an invalid storage mode fails at construction."""
+    with pytest.raises(ValueError):
+        SkillSearchEngine("all-MiniLM-L6-v2", embedding_storage="int4")
+
+
+@pytest.mark.parametrize("mode", ["float16", "int8"])
+def test_quantized_engine_rescores_exactly(mock_skills, mode):
+    """Test that top results carry exact full-precision scores."""
+    exact = SkillSearchEngine("all-MiniLM-L6-v2", hybrid_search=False)
+    exact.index_skills(mock_skills)
+
+    engine = SkillSearchEngine(
+        "all-MiniLM-L6-v2", hybrid_search=False, embedding_storage=mode
+    )
+    engine.add_skills(mock_skills[:1])
+    engine.add_skills(mock_skills[1:])
+    # Full-precision rows leave the heap once incremental loading is done
+    engine.persist()
+
+    snapshot = engine.get_snapshot()
+    assert snapshot.quantized.mode == mode
+    assert len(snapshot.quantized) == len(mock_skills)
+    assert isinstance(snapshot.embeddings, np.memmap)
+
+    query = "analyze RNA sequencing data"
+    expected = exact.search(query, top_k=3)
+    results = engine.search(query, top_k=3)
+    assert [r["name"] for r in results] == [r["name"] for r in expected]
+    assert np.allclose(
+        [r["relevance_score"] for r in results],
+        [r["relevance_score"] for r in expected],
+        atol=1e-6,
+    )
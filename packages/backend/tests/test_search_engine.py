@@ -1,8 +1,16 @@
 """Tests for search engine functionality."""
 
+import asyncio
+import threading
+
+import numpy as np
 import pytest
 
+from claude_skills_mcp_backend.chunking import chunk_text
+from claude_skills_mcp_backend import search_engine
+from claude_skills_mcp_backend.mcp_handlers import handle_related_skills
 from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+from claude_skills_mcp_backend.skill_loader import Skill
 
 
 def test_search_engine_initialization():
@@ -127,19 +135,832 @@ def test_search_finds_relevant_skills(mock_skills, query, expected_top_skill):
     assert results[0]["name"] == expected_top_skill
 
 
-def test_cosine_similarity():
-    """Test cosine similarity computation."""
+def test_normalize_rows():
+    """Test that rows are L2-normalized into a contiguous float32 matrix."""
+    import numpy as np
+
+    matrix = np.array([[3.0, 4.0], [0.0, 0.0]], dtype=np.float64)
+
+    normalized = SkillSearchEngine._normalize_rows(matrix)
+
+    assert normalized.dtype == np.float32
+    assert normalized.flags["C_CONTIGUOUS"]
+    assert np.allclose(normalized[0], [0.6, 0.8])
+    assert np.allclose(normalized[1], [0.0, 0.0])  # zero rows stay zero
+
+
+def test_indexed_embeddings_are_normalized(mock_skills):
+    """Test that the engine stores a unit-length float32 matrix."""
+    import numpy as np
+
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills[:2])
+    engine.add_skills(mock_skills[2:])
+
+    assert engine.embeddings.dtype == np.float32
+    assert engine.embeddings.flags["C_CONTIGUOUS"]
+    assert np.allclose(np.linalg.norm(engine.embeddings, axis=1), 1.0, atol=1e-5)
+
+
+def test_snapshot_version_increments(mock_skills):
+    """Test that every index update publishes a new, read-only snapshot."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    initial = engine.get_snapshot()
+
+    engine.index_skills(mock_skills[:2])
+    first = engine.get_snapshot()
+    engine.add_skills(mock_skills[2:])
+    second = engine.get_snapshot()
+
+    assert initial.version < first.version < second.version
+    assert len(first.skills) == 2  # Old snapshot is unchanged by the append
+    assert len(second.skills) == 3
+    assert not second.embeddings.flags.writeable
+
+
+def test_search_not_blocked_by_indexing(mock_skills, monkeypatch):
+    """Test that searches are served from the current snapshot while a batch
+    is still being encoded."""
+    import threading
+
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills)
+    model = engine._ensure_model_loaded()
+
+    encoding_started = threading.Event()
+    release_encoding = threading.Event()
+    original_encode = model.encode
+
+    def slow_encode(texts, **kwargs):
+        if "Slow batch description" in texts:
+            encoding_started.set()
+            release_encoding.wait(timeout=10)
+        return original_encode(texts, **kwargs)
+
+    monkeypatch.setattr(model, "encode", slow_encode)
+
+    writer = threading.Thread(
+        target=engine.add_skills,
+        args=([Skill("Slow", "Slow batch description", "Content", "test://slow")],),
+    )
+    writer.start()
+    assert encoding_started.wait(timeout=10)
+
+    try:
+        # The writer is mid-encode; the search must still complete
+        results = engine.search("RNA sequencing data", top_k=5)
+        assert len(results) == 3
+    finally:
+        release_encoding.set()
+        writer.join(timeout=10)
+
+    assert len(engine.skills) == 4
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 10, 50])
+def test_top_k_indices_matches_full_sort(top_k):
+    """Test that argpartition-based selection matches a full descending sort."""
     import numpy as np
-    from claude_skills_mcp_backend.search_engine import SkillSearchEngine
 
-    vec1 = np.array([1.0, 0.0, 0.0])
-    vec2 = np.array([1.0, 0.0, 0.0])
-    vec3 = np.array([0.0, 1.0, 0.0])
+    rng = np.random.default_rng(42)
+    scores = rng.standard_normal(50).astype(np.float32)
+    batch = rng.standard_normal((4, 50)).astype(np.float32)
+
+    expected = np.argsort(-scores)[:top_k]
+    assert np.array_equal(SkillSearchEngine._top_k_indices(scores, top_k), expected)
+
+    expected_batch = np.argsort(-batch, axis=1)[:, :top_k]
+    assert np.array_equal(
+        SkillSearchEngine._top_k_indices(batch, top_k), expected_batch
+    )
+
+
+def test_search_many_matches_search(mock_skills):
+    """Test that batched search returns the same rankings as single searches."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills)
+
+    queries = ["RNA sequencing data", "protein structure prediction"]
+    batched = engine.search_many(queries, top_k=2)
+
+    assert len(batched) == 2
+    for query, results in zip(queries, batched):
+        single = engine.search(query, top_k=2)
+        assert [r["name"] for r in results] == [r["name"] for r in single]
+        for r_batch, r_single in zip(results, single):
+            assert abs(r_batch["relevance_score"] - r_single["relevance_score"]) < 1e-5
+
+
+def test_search_many_empty_index():
+    """Test batched search with no indexed skills."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+
+    assert engine.search_many(["a", "b"], top_k=3) == [[], []]
+    assert engine.search_many([], top_k=3) == []
+
+
+def _count_encodes(engine: SkillSearchEngine, monkeypatch) -> list[str]:
+    """Record every text passed to the engine's model."""
+    model = engine._ensure_model_loaded()
+    encoded: list[str] = []
+    original_encode = model.encode
+
+    def counting_encode(texts, **kwargs):
+        encoded.extend(texts)
+        return original_encode(texts, **kwargs)
+
+    monkeypatch.setattr(model, "encode", counting_encode)
+    return encoded
+
+
+@pytest.mark.parametrize("chunk_content", [False, True])
+def test_sync_skills_encodes_only_changes(mock_skills, monkeypatch, chunk_content):
+    """Test that a sync encodes added and modified skills and drops removed ones."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", chunk_content=chunk_content)
+    engine.index_skills(mock_skills)
+    encoded = _count_encodes(engine, monkeypatch)
+
+    modified = Skill(
+        name=mock_skills[1].name,
+        description="Updated description for sequence analysis",
+        content=mock_skills[1].content,
+        source=mock_skills[1].source,
+    )
+    added = Skill(
+        name="Scanpy",
+        description="Single-cell RNA-seq analysis",
+        content="# Scanpy\n\nClustering of single cells.",
+        source="test://scanpy",
+    )
+    stats = engine.sync_skills([added, mock_skills[0], modified])
+
+    assert stats == {"added": 1, "modified": 1, "removed": 1, "unchanged": 1}
+    assert sorted(encoded[:2]) == sorted([added.description, modified.description])
+    expected_encodes = 2
+    if chunk_content:
+        expected_encodes += len(chunk_text(added.content)) + len(
+            chunk_text(modified.content)
+        )
+    assert len(encoded) == expected_encodes
+    assert [s.name for s in engine.skills] == [
+        "Scanpy",
+        mock_skills[0].name,
+        modified.name,
+    ]
+
+    # Kept and new rows match a full re-index
+    fresh = SkillSearchEngine("all-MiniLM-L6-v2", chunk_content=chunk_content)
+    fresh.index_skills([added, mock_skills[0], modified])
+    assert np.allclose(engine.embeddings, fresh.embeddings, atol=1e-6)
+    if chunk_content:
+        snapshot, expected = engine.get_snapshot(), fresh.get_snapshot()
+        assert np.array_equal(snapshot.chunk_offsets, expected.chunk_offsets)
+        assert np.allclose(
+            snapshot.chunk_embeddings, expected.chunk_embeddings, atol=1e-6
+        )
+
+
+def test_sync_skills_without_changes_keeps_snapshot(mock_skills, monkeypatch):
+    """Test that an unchanged skill list neither encodes nor republishes."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills)
+    encoded = _count_encodes(engine, monkeypatch)
+    version = engine.get_snapshot().version
+
+    stats = engine.sync_skills(list(mock_skills))
+
+    assert stats["unchanged"] == len(mock_skills)
+    assert encoded == []
+    assert engine.get_snapshot().version == version
+
+
+def test_sync_skills_ignores_empty_reload(mock_skills):
+    """Test that an empty reload keeps the index unless clearing is allowed."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills)
+    version = engine.get_snapshot().version
+
+    stats = engine.sync_skills([])
+
+    assert stats["removed"] == 0
+    assert engine.get_snapshot().version == version
+    assert len(engine.skills) == len(mock_skills)
+
+    stats = engine.sync_skills([], allow_clear=True)
+    assert stats["removed"] == len(mock_skills)
+    assert engine.skills == []
+
+
+@pytest.mark.parametrize("hybrid_search", [False, True])
+def test_remove_skills_masks_search(mock_skills, hybrid_search):
+    """Test that removed skills are never returned but keep their rows."""
+    engine = SkillSearchEngine(
+        "all-MiniLM-L6-v2", hybrid_search=hybrid_search, compaction_threshold=None
+    )
+    engine.index_skills(mock_skills)
+
+    removed = engine.remove_skills([mock_skills[0].source, "test://unknown"])
+
+    assert removed == 1
+    snapshot = engine.get_snapshot()
+    assert len(snapshot.skills) == 3
+    assert snapshot.num_dead == 1
+    assert [s.name for s in engine.skills] == [s.name for s in mock_skills[1:]]
+
+    results = engine.search("RNA sequencing gene expression", top_k=3)
+    assert len(results) == 2
+    assert mock_skills[0].name not in {r["name"] for r in results}
+    assert engine.remove_skills([mock_skills[0].source]) == 0
+
+
+def test_update_skill_replaces_row(mock_skills, monkeypatch):
+    """Test that updating a skill encodes only it and hides the old version."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=None)
+    engine.index_skills(mock_skills)
+    encoded = _count_encodes(engine, monkeypatch)
+
+    updated = Skill(
+        name="Protein Design",
+        description="Design novel protein sequences",
+        content="Full content for protein design skill...",
+        source=mock_skills[1].source,
+    )
+    engine.update_skill(updated)
+
+    assert encoded == [updated.description]
+    assert [s.name for s in engine.skills] == [
+        mock_skills[0].name,
+        mock_skills[2].name,
+        "Protein Design",
+    ]
+    names = {r["name"] for r in engine.search("protein", top_k=3)}
+    assert "Protein Folding" not in names
+
+    with pytest.raises(KeyError):
+        engine.update_skill(
+            Skill(name="X", description="x", content="", source="test://unknown")
+        )
+
+
+def test_upsert_skills_counts(mock_skills):
+    """Test that upsert adds unknown skills and replaces known ones."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=None)
+    engine.index_skills(mock_skills[:2])
+
+    stats = engine.upsert_skills([mock_skills[1], mock_skills[2]])
+
+    assert stats == {"added": 1, "updated": 1}
+    assert len(engine.skills) == 3
+    assert engine.get_snapshot().num_dead == 1
+
+
+@pytest.mark.parametrize("chunk_content", [False, True])
+def test_compact_matches_full_index(mock_skills, chunk_content):
+    """Test that compaction drops dead rows and matches a fresh index."""
+    engine = SkillSearchEngine(
+        "all-MiniLM-L6-v2", chunk_content=chunk_content, compaction_threshold=None
+    )
+    engine.index_skills(mock_skills)
+    engine.remove_skills([mock_skills[1].source])
+
+    assert engine.compact()
+
+    snapshot = engine.get_snapshot()
+    assert snapshot.tombstones is None
+    assert len(snapshot.skills) == 2
+
+    fresh = SkillSearchEngine("all-MiniLM-L6-v2", chunk_content=chunk_content)
+    fresh.index_skills([mock_skills[0], mock_skills[2]])
+    assert np.allclose(snapshot.embeddings, fresh.embeddings, atol=1e-6)
+    if chunk_content:
+        expected = fresh.get_snapshot()
+        assert np.array_equal(snapshot.chunk_offsets, expected.chunk_offsets)
+        assert np.allclose(
+            snapshot.chunk_embeddings, expected.chunk_embeddings, atol=1e-6
+        )
+    assert not engine.compact()
+
+
+def test_compaction_runs_in_background(mock_skills):
+    """Test that crossing the dead fraction threshold compacts the index."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=0.5)
+    engine.index_skills(mock_skills)
+
+    engine.remove_skills([mock_skills[0].source])
+    assert engine._compaction_thread is None
+
+    engine.remove_skills([mock_skills[1].source])
+    engine._compaction_thread.join(timeout=10)
+
+    snapshot = engine.get_snapshot()
+    assert snapshot.num_dead == 0
+    assert list(snapshot.skills) == [mock_skills[2]]
+
+
+def test_warm_up_loads_model_once(mock_skills, monkeypatch):
+    """Test that indexing during a warm-up waits for it instead of reloading."""
+    from claude_skills_mcp_backend import search_engine as search_engine_module
+
+    loads = []
+    started = threading.Event()
+    release = threading.Event()
+    original_create = search_engine_module.create_encoder
+
+    def slow_create(backend, model_name):
+        loads.append(model_name)
+        started.set()
+        release.wait(timeout=10)
+        return original_create(backend, model_name)
+
+    monkeypatch.setattr(search_engine_module, "create_encoder", slow_create)
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    assert engine.get_readiness()["model"]["state"] == "not_loaded"
+
+    thread = engine.warm_up()
+    assert started.wait(timeout=10)
+    assert engine.model_state == "loading"
+
+    indexer = threading.Thread(target=engine.index_skills, args=(mock_skills,))
+    indexer.start()
+    release.set()
+    indexer.join(timeout=10)
+    thread.join(timeout=10)
+
+    assert loads == ["all-MiniLM-L6-v2"]
+    readiness = engine.get_readiness()
+    assert readiness["model"]["state"] == "ready"
+    assert readiness["model"]["load_seconds"] is not None
+    assert readiness["index"]["skills"] == len(mock_skills)
+
+
+def test_failed_model_load_is_reported(monkeypatch):
+    """Test that a failing model load is reported instead of raising in warm-up."""
+    from claude_skills_mcp_backend import search_engine as search_engine_module
+
+    def failing_create(backend, model_name):
+        raise OSError("model not found")
+
+    monkeypatch.setattr(search_engine_module, "create_encoder", failing_create)
+    engine = SkillSearchEngine("missing-model")
+    engine.warm_up().join(timeout=10)
+
+    model = engine.get_readiness()["model"]
+    assert model["state"] == "failed"
+    assert model["error"] == "model not found"
+    assert engine.model is None
+
+
+def _filter_skills() -> list[Skill]:
+    """Skills from two repositories and a local directory, with tags."""
+    return [
+        Skill(
+            name="RNA Analysis",
+            description="Analyze RNA sequencing data and gene expression",
+            content="RNA-seq differential expression",
+            source="https://github.com/lab/bio-skills/tree/main/rna/SKILL.md",
+            tags=["genomics"],
+        ),
+        Skill(
+            name="Single Cell RNA",
+            description="Cluster single cell RNA sequencing data",
+            content="scRNA-seq clustering",
+            source="https://github.com/other/skills/tree/main/scrna/SKILL.md",
+            documents={"scripts/cluster.py": {"type": "text"}},
+            tags=["genomics", "single-cell"],
+        ),
+        Skill(
+            name="Local RNA Notes",
+            description="Notes on RNA sequencing quality control",
+            content="RNA QC",
+            source="/home/user/.claude/skills/rna-notes/SKILL.md",
+        ),
+    ]
+
+
+@pytest.mark.parametrize("hybrid_search", [False, True])
+@pytest.mark.parametrize(
+    "filters,expected",
+    [
+        ({}, {"RNA Analysis", "Single Cell RNA", "Local RNA Notes"}),
+        ({"source": "local"}, {"Local RNA Notes"}),
+        ({"repo": "lab/bio-skills"}, {"RNA Analysis"}),
+        ({"has_documents": True}, {"Single Cell RNA"}),
+        ({"tags": ["Genomics"]}, {"RNA Analysis", "Single Cell RNA"}),
+        (
+            {"source": "github", "tags": ["genomics", "single-cell"]},
+            {"Single Cell RNA"},
+        ),
+        ({"source": "local", "tags": ["genomics"]}, set()),
+    ],
+)
+def test_search_filters(hybrid_search, filters, expected):
+    """Test that filters restrict results before top-k selection."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", hybrid_search=hybrid_search)
+    engine.index_skills(_filter_skills())
+
+    results = engine.search("RNA sequencing", top_k=3, **filters)
+
+    assert {r["name"] for r in results} == expected
+    many = engine.search_many(["RNA sequencing"], top_k=3, **filters)
+    assert [r["name"] for r in many[0]] == [r["name"] for r in results]
+
+
+def test_search_filters_after_add_and_remove():
+    """Test that filter masks follow appended and removed skills."""
+    skills = _filter_skills()
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=None)
+    engine.index_skills(skills[:2])
+    engine.add_skills(skills[2:])
+
+    assert [r["name"] for r in engine.search("RNA", source="local")] == [
+        "Local RNA Notes"
+    ]
+    engine.remove_skills([skills[0].source])
+    names = {r["name"] for r in engine.search("RNA", top_k=3, tags=["genomics"])}
+    assert names == {"Single Cell RNA"}
+
+    with pytest.raises(ValueError):
+        engine.search("RNA", source="gitlab")
+
+
+def _copy(skill: Skill, source: str, description: str | None = None) -> Skill:
+    """Copy a skill under another source, optionally rewording its description."""
+    return Skill(
+        name=skill.name,
+        description=description or skill.description,
+        content=skill.content,
+        source=source,
+    )
+
+
+def test_exact_duplicates_are_collapsed(mock_skills, monkeypatch):
+    """Test that identical skills are encoded once and listed as alternates."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", query_batch_size=1)
+    encoded = _count_encodes(engine, monkeypatch)
+    fork = _copy(mock_skills[0], "test://fork/rna-analysis")
+
+    engine.index_skills([*mock_skills, fork])
+
+    assert encoded == [skill.description for skill in mock_skills]
+    assert len(engine.skills) == 3
+    results = engine.search("RNA sequencing differential expression", top_k=3)
+    assert len(results) == 3
+    assert results[0]["source"] == mock_skills[0].source
+    assert results[0]["alternate_sources"] == [fork.source]
+    assert engine.get_readiness()["index"]["duplicates"] == 1
+
+
+def test_near_duplicates_are_collapsed_on_add(mock_skills):
+    """Test that a reworded same-name copy added later joins the indexed skill."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=None)
+    engine.add_skills(mock_skills)
+    reworded = _copy(
+        mock_skills[1], "test://fork/protein", mock_skills[1].description + "."
+    )
+    renamed = Skill(
+        name="Structure Prediction",
+        description=mock_skills[1].description,
+        content="",
+        source="test://structure",
+    )
+
+    engine.add_skills([reworded, renamed])
+
+    assert [s.name for s in engine.skills] == [
+        *(s.name for s in mock_skills),
+        "Structure Prediction",
+    ]
+    duplicates = engine.get_snapshot().duplicates[mock_skills[1].source]
+    assert [s.source for s in duplicates] == [reworded.source]
+
+
+def test_same_name_skills_with_other_content_are_kept(mock_skills):
+    """Test that a same-name skill with similar description but new content stays."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    variant = Skill(
+        name=mock_skills[1].name,
+        description=mock_skills[1].description + ".",
+        content="Use Rosetta instead of AlphaFold.",
+        source="test://variant/protein",
+    )
+
+    engine.index_skills([*mock_skills, variant])
+
+    assert variant.source in {s.source for s in engine.skills}
+    assert engine.get_snapshot().duplicates == {}
+
+
+def test_concurrent_adds_of_same_skill_index_it_once(mock_skills, monkeypatch):
+    """Test that a copy indexed while a batch is encoded is not appended twice."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills[:1])
+    fork = _copy(mock_skills[1], "test://fork/protein")
+    encode = engine._encode_texts
+    writers = []
+
+    def encode_while_adding(texts, *args, **kwargs):
+        if not writers:
+            # Another writer publishes the same skill meanwhile
+            writers.append(fork)
+            engine.add_skills([fork])
+        return encode(texts, *args, **kwargs)
+
+    monkeypatch.setattr(engine, "_encode_texts", encode_while_adding)
+    engine.add_skills([mock_skills[1]])
+
+    assert [s.source for s in engine.skills] == [mock_skills[0].source, fork.source]
+    duplicates = engine.get_snapshot().duplicates[fork.source]
+    assert [s.source for s in duplicates] == [mock_skills[1].source]
+
+
+def test_sync_keeps_duplicates_without_encoding(mock_skills, monkeypatch):
+    """Test that a sync recognizes collapsed near-duplicates without re-encoding."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    reworded = _copy(
+        mock_skills[2], "test://fork/drug", mock_skills[2].description + "!"
+    )
+    engine.index_skills([*mock_skills, reworded])
+    encoded = _count_encodes(engine, monkeypatch)
+    version = engine.get_snapshot().version
+
+    stats = engine.sync_skills([*mock_skills, reworded])
+
+    assert stats["unchanged"] == 3
+    assert encoded == []
+    assert engine.get_snapshot().version == version
+    assert engine.get_snapshot().duplicates.keys() == {mock_skills[2].source}
+
+
+def test_removing_canonical_skill_reindexes_duplicates(mock_skills):
+    """Test that duplicates survive the removal of their canonical skill."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=None)
+    forks = [_copy(mock_skills[0], f"test://fork-{i}/rna") for i in range(2)]
+    engine.index_skills([*mock_skills, *forks])
+
+    assert engine.remove_skills([mock_skills[0].source]) == 1
+
+    assert forks[0].source in {s.source for s in engine.skills}
+    duplicates = engine.get_snapshot().duplicates
+    assert [s.source for s in duplicates[forks[0].source]] == [forks[1].source]
+    assert engine.remove_skills([forks[1].source]) == 1
+    assert engine.get_snapshot().duplicates == {}
+
+
+def test_deduplication_can_be_disabled(mock_skills):
+    """Test that every copy is indexed when deduplication is off."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", deduplicate=False)
+    engine.index_skills([*mock_skills, _copy(mock_skills[0], "test://fork/rna")])
+
+    assert len(engine.skills) == 4
+
+
+@pytest.mark.parametrize("graph_k", [10, 0])
+def test_related_skills_without_model_call(mock_skills, monkeypatch, graph_k):
+    """Test that related skills come from stored embeddings, most similar first."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", graph_k=graph_k)
+    engine.index_skills(mock_skills)
+    encoded = _count_encodes(engine, monkeypatch)
+
+    results = engine.related_skills("RNA Analysis", k=5)
+
+    assert encoded == []
+    assert {r["source"] for r in results} == {s.source for s in mock_skills[1:]}
+    scores = [r["relevance_score"] for r in results]
+    assert scores == sorted(scores, reverse=True)
+    embeddings = engine.embeddings
+    rows = {skill.source: i for i, skill in enumerate(mock_skills)}
+    for result in results:
+        expected = embeddings[0] @ embeddings[rows[result["source"]]]
+        assert result["relevance_score"] == pytest.approx(float(expected), abs=1e-5)
+    with pytest.raises(ValueError, match="Unknown skill"):
+        engine.related_skills("Missing Skill")
+
+
+def test_related_skills_follow_updates(mock_skills):
+    """Test that the graph tracks added, replaced and removed skills."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=None)
+    engine.add_skills(mock_skills[:2])
+    engine.add_skills(mock_skills[2:])
+    twin = _copy(mock_skills[1], "test://protein-twin", mock_skills[1].description)
+    twin.name = "Protein Twin"
+    engine.upsert_skills([twin])
+
+    assert engine.related_skills("Protein Folding", k=1)[0]["name"] == "Protein Twin"
+
+    engine.remove_skills([twin.source])
+    related = engine.related_skills("Protein Folding", k=3)
+    assert {r["name"] for r in related} == {"RNA Analysis", "Drug Discovery"}
+    engine.compact()
+    snapshot = engine.get_snapshot()
+    assert snapshot.graph.num_rows == len(snapshot.skills) == 3
+
+
+def test_related_skills_handler_validates_k(mock_skills, monkeypatch):
+    """Test that the tool handler rejects k outside the schema and runs off-loop."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills)
+    calls = []
+    related_skills = engine.related_skills
+
+    def recording(skill_name, k):
+        calls.append((k, threading.current_thread() is threading.main_thread()))
+        return related_skills(skill_name, k)
+
+    monkeypatch.setattr(engine, "related_skills", recording)
+    for k in (0, -3, 100, "two", 2.5, True):
+        response = asyncio.run(
+            handle_related_skills({"skill_name": "RNA Analysis", "k": k}, engine, None)
+        )
+        assert response[0].text == (
+            f"Invalid k: {k!r}. k must be an integer from 1 to 20."
+        )
+    for k in (None, 1, 20):
+        asyncio.run(
+            handle_related_skills({"skill_name": "RNA Analysis", "k": k}, engine, None)
+        )
+
+    assert calls == [(5, False), (1, False), (20, False)]
+
+
+def _shard_skills(mock_skills: list[Skill]) -> list[Skill]:
+    """Copies of the mock skills, the first two from shard "a", the last from "b"."""
+    skills = [_copy(skill, skill.source) for skill in mock_skills]
+    for skill, shard in zip(skills, ("a", "a", "b")):
+        skill.shard = shard
+    return skills
+
+
+def test_sync_shard_only_touches_its_source(mock_skills, monkeypatch):
+    """Test that reloading one shard encodes and drops only its own skills."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=None)
+    skills = _shard_skills(mock_skills)
+    engine.index_skills(skills)
+    encoded = _count_encodes(engine, monkeypatch)
+    shard_b = engine.skills[2]
+
+    modified = _copy(skills[1], skills[1].source, "Updated protein description")
+    added = _copy(skills[0], "test://scanpy", "Single-cell clustering")
+    stats = engine.sync_shard("a", [modified, added])
+
+    assert stats == {"added": 1, "modified": 1, "removed": 1, "unchanged": 0}
+    assert sorted(encoded) == sorted([modified.description, added.description])
+    assert engine.skills[0] is shard_b
+    assert {s.source: s.shard for s in engine.skills} == {
+        shard_b.source: "b",
+        modified.source: "a",
+        added.source: "a",
+    }
+    assert engine.sync_shard("a", [modified, added])["unchanged"] == 2
+    assert len(encoded) == 2
+
+
+def test_sync_shard_leaves_published_skills_unchanged(mock_skills):
+    """Test that reloaded unchanged skills are swapped in, not modified."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills)
+    before = engine.get_snapshot()
+
+    def fetcher(doc_path):
+        return {"type": "text", "content": doc_path}
+
+    reloaded = [_copy(skill, skill.source) for skill in mock_skills[:2]]
+    for skill in reloaded:
+        skill._document_fetcher = fetcher
+    stats = engine.sync_shard("a", reloaded)
+
+    after = engine.get_snapshot()
+    assert stats["unchanged"] == 2
+    assert [(s.shard, s._document_fetcher) for s in before.skills] == [("", None)] * 3
+    # The reloaded skills are indexed as copies carrying the shard key
+    assert [s.shard for s in reloaded] == ["", ""]
+    assert [(s.source, s.shard, s._document_fetcher) for s in after.skills] == [
+        (reloaded[0].source, "a", fetcher),
+        (reloaded[1].source, "a", fetcher),
+        (mock_skills[2].source, "", None),
+    ]
+    assert after.embeddings is before.embeddings
+
+
+def test_sync_shard_collapses_modified_duplicates(mock_skills, monkeypatch):
+    """Test that a skill edited into a copy of another shard's skill is collapsed."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", compaction_threshold=None)
+    skills = _shard_skills(mock_skills)
+    engine.index_skills(skills)
+    encoded = _count_encodes(engine, monkeypatch)
+
+    # Skill 1 of shard "a" becomes a copy of the skill of shard "b"
+    copied = _copy(skills[2], skills[1].source)
+    stats = engine.sync_shard("a", [skills[0], copied])
+
+    assert stats["modified"] == 1
+    assert encoded == []
+    assert [s.source for s in engine.skills] == [skills[0].source, skills[2].source]
+    snapshot = engine.get_snapshot()
+    assert [s.source for s in snapshot.duplicates[skills[2].source]] == [copied.source]
+
+
+def test_shard_stats_account_rows_and_bytes(mock_skills):
+    """Test that each shard reports its live skills and their vector memory."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", embedding_storage="int8")
+    engine.index_skills(_shard_skills(mock_skills))
+    engine.remove_skills([mock_skills[0].source])
+
+    stats = engine.get_readiness()["index"]["shards"]
+
+    snapshot = engine.get_snapshot()
+    row_bytes = snapshot.quantized.nbytes // len(snapshot.skills)
+    assert stats == {
+        "a": {"skills": 1, "chunks": 0, "bytes": row_bytes},
+        "b": {"skills": 1, "chunks": 0, "bytes": row_bytes},
+    }
+
+
+@pytest.mark.parametrize("hybrid_search", [True, False])
+def test_parallel_scoring_matches_serial(monkeypatch, hybrid_search):
+    """Test that partitioned scoring and the k-way merge rank like a serial scan."""
+    monkeypatch.setattr(search_engine, "_MIN_PARTITION_ROWS", 8)
+    skills = [
+        Skill(
+            name=f"skill-{i}",
+            description=f"topic {i % 7} method {i % 11} data {i}",
+            content=f"# Skill {i}\n\nWorks with topic {i % 5}.",
+            source=f"test://skill-{i}",
+        )
+        for i in range(60)
+    ]
+    options = {"encoder_backend": "hashing", "hybrid_search": hybrid_search}
+    serial = SkillSearchEngine("all-MiniLM-L6-v2", search_threads=1, **options)
+    parallel = SkillSearchEngine("all-MiniLM-L6-v2", search_threads=4, **options)
+    serial.index_skills(skills)
+    parallel.index_skills(skills)
+    assert len(parallel._partitions(60)) == 4
+
+    for query in ("topic 3 method 5", "data 42"):
+        expected = serial.search(query, top_k=10)
+        results = parallel.search(query, top_k=10)
+        assert [r["relevance_score"] for r in results] == pytest.approx(
+            [r["relevance_score"] for r in expected]
+        )
+
+    scores = np.random.default_rng(0).standard_normal(60).astype(np.float32)
+    for top_k in (1, 7, 60):
+        assert np.array_equal(
+            parallel._select_top_k(scores, top_k), np.argsort(-scores)[:top_k]
+        )
+
+
+def test_degraded_search_ranks_staged_skills(mock_skills):
+    """Test keyword ranking of staged skills until the model and index are ready."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", degraded_search=True)
+    engine.stage_skills(mock_skills)
+    engine.stage_skills(mock_skills[:1])
+
+    results = engine.search("predict protein structure", top_k=3)
+
+    assert engine.search_mode == "keyword"
+    assert engine.get_readiness()["search_mode"] == "keyword"
+    assert [r["name"] for r in results] == ["Protein Folding"]
+    assert results[0]["relevance_score"] == 1.0
+    assert results[0]["search_mode"] == "keyword"
+    assert engine.search_many(["rna genes", "zzz"]) == [
+        engine.search("rna genes"),
+        [],
+    ]
+    # Searching never starts loading the model
+    assert engine.model is None
+    assert engine.model_state == "not_loaded"
+
+    engine.index_skills(mock_skills)
+    engine.discard_staged()
+    assert engine.search_mode == "vector"
+    results = engine.search("predict protein structure", top_k=3)
+    assert len(results) == 3
+    assert {r["search_mode"] for r in results} == {"vector"}
+
+
+def test_degraded_search_uses_restored_index(mock_skills, tmp_path):
+    """Test that a restored index is ranked by keywords without the model."""
+    path = tmp_path / "index.bundle"
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", hybrid_search=True)
+    engine.index_skills(mock_skills)
+    engine.save_bundle(path)
+
+    restored = SkillSearchEngine(
+        "all-MiniLM-L6-v2", hybrid_search=True, degraded_search=True
+    )
+    restored.load_bundle(path)
+    restored.remove_skills([mock_skills[2].source])
+
+    results = restored.search("drug compounds protein", top_k=3)
+
+    assert [r["name"] for r in results] == ["Protein Folding"]
+    assert restored.model is None
 
-    matrix = np.array([vec2, vec3])
 
-    similarities = SkillSearchEngine._cosine_similarity(vec1, matrix)
+def test_search_waits_for_model_without_degraded_search(mock_skills):
+    """Test that staged skills are ignored unless degraded search is enabled."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", degraded_search=False)
+    engine.stage_skills(mock_skills)
 
-    assert len(similarities) == 2
-    assert abs(similarities[0] - 1.0) < 0.001  # Same vector
-    assert abs(similarities[1] - 0.0) < 0.001  # Orthogonal
+    assert engine.search_mode == "vector"
+    assert engine.search("protein structure") == []
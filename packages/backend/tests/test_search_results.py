@@ -0,0 +1,101 @@
+"""Tests for search result views and their rendering."""
+
+import pytest
+
+from claude_skills_mcp_backend import mcp_handlers
+from claude_skills_mcp_backend.mcp_handlers import format_search_result
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+from claude_skills_mcp_backend.search_results import SkillResult
+from claude_skills_mcp_backend.skill_loader import Skill
+
+
+def _skill_with_documents() -> Skill:
+    return Skill(
+        name="Protein Folding",
+        description="Predict protein structure from sequence",
+        content="Use AlphaFold to predict protein structure.",
+        source="test://protein",
+        documents={
+            "scripts/fold.py": {"type": "text", "size": 2048},
+            "README.md": {"type": "text", "size": 100},
+        },
+        tags=["biology"],
+    )
+
+
+def test_results_view_indexed_skills(mock_skills):
+    """Test that results read like Skill.to_dict plus scores without copying."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills(mock_skills)
+
+    snapshot = engine.get_snapshot()
+    result = engine.search("protein structure prediction", top_k=1)[0]
+    assert result.version == snapshot.version
+    # Rows are only meaningful within the snapshot that produced them
+    skill = snapshot.skills[result.row]
+
+    assert isinstance(result, SkillResult)
+    assert result.skill is skill
+    assert result["documents"] is skill.documents
+    assert dict(result) == {
+        **skill.to_dict(),
+        "alternate_sources": [],
+        "relevance_score": result.relevance_score,
+        "search_mode": "vector",
+    }
+    with pytest.raises(KeyError):
+        result["missing"]
+    assert result.get("missing") is None
+
+
+def test_unset_scores_are_absent():
+    """Test that optional scores are not keys until set."""
+    result = SkillResult(_skill_with_documents(), row=0, version=1, relevance_score=0.5)
+
+    assert "vector_score" not in result
+    assert "search_mode" not in result
+    assert len(result) == len(list(result)) == 9
+
+
+def test_sections_are_rendered_when_indexed(monkeypatch):
+    """Test that hits reuse the sections rendered when their skill was indexed."""
+    skill = _skill_with_documents()
+    engine = SkillSearchEngine("all-MiniLM-L6-v2")
+    engine.index_skills([skill])
+    rendered = []
+    render = mcp_handlers.render_skill_sections
+    monkeypatch.setattr(
+        mcp_handlers,
+        "render_skill_sections",
+        lambda skill: rendered.append(skill) or render(skill),
+    )
+
+    result = engine.search("protein structure", top_k=1)[0]
+    text = "\n".join(format_search_result(1, result))
+    format_search_result(2, result, list_documents=False)
+
+    assert rendered == []
+    assert text.index("README.md") < text.index("scripts/fold.py")
+    assert "  - scripts/fold.py (text, 2.0 KB)" in text
+    assert "Tags:" not in text
+    assert text == "\n".join(format_search_result(1, dict(result)))
+
+    # Re-indexing a skill changed in place renders it again
+    skill.documents = {"data/input.csv": {"type": "text", "size": 512}}
+    engine.update_skill(skill)
+    result = engine.search("protein structure", top_k=1)[0]
+    text = "\n".join(format_search_result(1, result))
+    assert "  - data/input.csv (text, 0.5 KB)" in text
+    assert "scripts/fold.py" not in text
+
+
+def test_hybrid_scores_are_labelled():
+    """Test that a rank-fusion score is not presented as a similarity."""
+    skill = _skill_with_documents()
+    hybrid = SkillResult(skill, 0, 1, relevance_score=1.0, search_mode="hybrid")
+    vector = SkillResult(skill, 0, 1, relevance_score=0.8, search_mode="vector")
+
+    assert "Relevance Score: 1.0000 (rank fusion" in "".join(
+        format_search_result(1, hybrid)
+    )
+    assert "\nRelevance Score: 0.8000" in format_search_result(1, vector)
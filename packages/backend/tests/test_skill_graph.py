@@ -0,0 +1,68 @@
+"""Tests for the skill similarity graph."""
+
+import numpy as np
+import pytest
+
+from claude_skills_mcp_backend.skill_graph import SkillGraph
+
+
+def _normalized(rng: np.random.Generator, rows: int, dim: int = 16) -> np.ndarray:
+    vectors = rng.standard_normal((rows, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _brute_force(embeddings: np.ndarray, k: int) -> np.ndarray:
+    """Exact top-k similarities of every row, excluding itself."""
+    scores = embeddings @ embeddings.T
+    np.fill_diagonal(scores, -np.inf)
+    return -np.sort(-scores, axis=1)[:, :k]
+
+
+def test_build_matches_brute_force():
+    """Test that every row lists its k most similar other rows, best first."""
+    embeddings = _normalized(np.random.default_rng(0), 50)
+
+    graph = SkillGraph.build(embeddings, 5)
+
+    assert graph.neighbors.shape == (50, 5)
+    assert not graph.neighbors.flags.writeable
+    assert np.allclose(graph.similarities, _brute_force(embeddings, 5))
+    assert not np.any(graph.neighbors == np.arange(50)[:, None])
+    rows, similarities = graph.neighbors_of(7)
+    assert np.allclose(similarities, embeddings[rows] @ embeddings[7])
+
+
+def test_small_graph_is_padded():
+    """Test that rows with fewer than k other rows are padded with -1."""
+    graph = SkillGraph.build(_normalized(np.random.default_rng(0), 3), 5)
+
+    assert np.all(graph.neighbors[:, 2:] == -1)
+    assert len(graph.neighbors_of(0)[0]) == 2
+
+
+def test_extend_matches_rebuild():
+    """Test that appending rows in batches gives the exact graph."""
+    embeddings = _normalized(np.random.default_rng(1), 120)
+    graph = SkillGraph.build(embeddings[:2], 4)
+    for end in (10, 11, 60, 120):
+        graph = graph.extend(embeddings[:end])
+
+    assert np.allclose(graph.similarities, _brute_force(embeddings, 4))
+
+
+@pytest.mark.parametrize("changed_every", [5, 0])
+def test_remap_matches_rebuild(changed_every):
+    """Test that a reordered index with dropped and new rows gives the exact graph."""
+    rng = np.random.default_rng(2)
+    embeddings = _normalized(rng, 100)
+    graph = SkillGraph.build(embeddings, 6)
+
+    old_rows = rng.permutation(100)[:70]
+    if changed_every:
+        old_rows[::changed_every] = -1
+    new_embeddings = embeddings[old_rows]
+    new_embeddings[old_rows < 0] = _normalized(rng, int((old_rows < 0).sum()))
+    remapped = graph.remap(old_rows, new_embeddings)
+
+    assert remapped.num_rows == 70
+    assert np.allclose(remapped.similarities, _brute_force(new_embeddings, 6))
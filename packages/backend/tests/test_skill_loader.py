@@ -5,6 +5,8 @@ import pytest
 from claude_skills_mcp_backend.skill_loader import (
     parse_skill_md,
     load_from_local,
+    load_source,
+    source_key,
     Skill,
 )
 
@@ -116,6 +118,20 @@ def test_skill_to_dict():
     assert skill_dict["source"] == "test_source"
 
 
+def test_load_source_tags_skills_with_shard(temp_skill_dir):
+    """Test that skills of a configured source carry its shard key."""
+    source_config = {"type": "local", "path": str(temp_skill_dir)}
+
+    skills = load_source(source_config)
+
+    assert len(skills) == 2
+    assert {skill.shard for skill in skills} == {f"local:{temp_skill_dir}"}
+    assert Skill.from_dict(skills[0].to_dict()).shard == skills[0].shard
+    github = {"type": "github", "url": "https://github.com/o/r"}
+    assert source_key(github) == "github:https://github.com/o/r"
+    assert source_key({**github, "subpath": "skills"}).endswith("/o/r#skills")
+
+
 @pytest.mark.parametrize(
     "path_variation",
     [
@@ -129,3 +145,27 @@ def test_load_from_local_with_home_expansion(path_variation):
     # but it shouldn't crash
     skills = load_from_local(path_variation)
     assert isinstance(skills, list)
+
+
+@pytest.mark.parametrize(
+    "tags_field",
+    [
+        "tags: [RNA, genomics]",
+        "tags: rna, Genomics",
+        "tags:\n  - RNA\n  - genomics\n  - rna",
+    ],
+)
+def test_parse_skill_md_tags(tags_field):
+    """Test parsing frontmatter tags in flow, inline and block form."""
+    content = f"""---
+name: Test Skill
+description: A skill with tags
+{tags_field}
+---
+
+# Content
+"""
+    skill = parse_skill_md(content, "test_source")
+
+    assert skill.tags == ["rna", "genomics"]
+    assert skill.to_dict()["tags"] == ["rna", "genomics"]
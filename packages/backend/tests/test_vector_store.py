@@ -0,0 +1,166 @@
+"""Tests for the shared memory-mapped vector store."""
+
+import os
+
+import numpy as np
+
+from claude_skills_mcp_backend.search_engine import SkillSearchEngine
+from claude_skills_mcp_backend.skill_loader import Skill
+from claude_skills_mcp_backend.vector_store import VectorStore
+
+
+def test_save_and_open_roundtrip(tmp_path):
+    """Test that a stored matrix is mapped read-only with the same contents."""
+    store = VectorStore("test-model", store_dir=tmp_path)
+    matrix = np.arange(12, dtype=np.float32).reshape(3, 4)
+    version = store.version_key("descriptions", ["a", "b", "c"])
+
+    assert store.open(version) is None
+    mapped = store.save(version, matrix)
+
+    assert isinstance(mapped, np.memmap)
+    assert not mapped.flags.writeable
+    assert np.array_equal(mapped, matrix)
+    assert np.array_equal(VectorStore("test-model", tmp_path).open(version), matrix)
+    assert not list(tmp_path.glob("*.tmp.npy"))
+
+
+def test_version_key_depends_on_model_kind_and_content(tmp_path):
+    """Test that any change to model, kind or content gives a new version."""
+    store = VectorStore("model-a", store_dir=tmp_path)
+    base = store.version_key("descriptions", ["a", "b"])
+
+    assert base == store.version_key("descriptions", ["a", "b"])
+    assert base != store.version_key("descriptions", ["b", "a"])
+    assert base != store.version_key("chunks:1000", ["a", "b"])
+    assert base != VectorStore("model-b", tmp_path).version_key(
+        "descriptions", ["a", "b"]
+    )
+
+
+def test_prune_keeps_most_recent_versions(tmp_path):
+    """Test that old versions are deleted beyond max_versions."""
+    store = VectorStore("test-model", store_dir=tmp_path, max_versions=2)
+    versions = [store.version_key("descriptions", [str(i)]) for i in range(3)]
+    for i, version in enumerate(versions):
+        store.save(version, np.full((1, 2), i, dtype=np.float32))
+        path = tmp_path / f"{version}.npy"
+        os.utime(path, (1000 + i, 1000 + i))
+    store.prune()
+
+    assert store.open(versions[0]) is None
+    assert store.open(versions[2]) is not None
+
+
+def test_prune_counts_versions_per_model_and_kind(tmp_path):
+    """Test that pruning one kind keeps other kinds, models and kept versions."""
+    store = VectorStore("model-a", store_dir=tmp_path, max_versions=1)
+    other_model = VectorStore("model-b", store_dir=tmp_path, max_versions=1)
+    chunks = store.version_key("chunks:1000", ["a"])
+    other = other_model.version_key("descriptions", ["a"])
+    store.save(chunks, np.zeros((1, 2), dtype=np.float32))
+    other_model.save(other, np.zeros((1, 2), dtype=np.float32))
+
+    versions = [store.version_key("descriptions", [str(i)]) for i in range(3)]
+    for i, version in enumerate(versions):
+        matrix = np.full((1, 2), i, dtype=np.float32)
+        store.save(version, matrix, keep=[versions[0]])
+        os.utime(tmp_path / f"{version}.npy", (1000 + i, 1000 + i))
+
+    assert store.open(chunks) is not None
+    assert other_model.open(other) is not None
+    assert store.open(versions[0]) is not None
+    assert store.open(versions[1]) is None
+    assert store.open(versions[2]) is not None
+
+
+def test_second_engine_maps_without_encoding(tmp_path, mock_skills, monkeypatch):
+    """Test that a new process is searchable from the store without encoding."""
+    first = SkillSearchEngine("all-MiniLM-L6-v2", vector_store=True)
+    first.vector_store = VectorStore("all-MiniLM-L6-v2", store_dir=tmp_path)
+    first.index_skills(mock_skills)
+
+    second = SkillSearchEngine("all-MiniLM-L6-v2", vector_store=True)
+    second.vector_store = VectorStore("all-MiniLM-L6-v2", store_dir=tmp_path)
+    model = second._ensure_model_loaded()
+    encoded: list[str] = []
+    original_encode = model.encode
+
+    def counting_encode(texts, **kwargs):
+        encoded.extend(texts)
+        return original_encode(texts, **kwargs)
+
+    monkeypatch.setattr(model, "encode", counting_encode)
+    second.index_skills(mock_skills)
+
+    assert encoded == []
+    assert isinstance(second.embeddings, np.memmap)
+    assert second.embeddings.filename == first.embeddings.filename
+    assert (
+        second.search("RNA sequencing", top_k=1)[0]["name"]
+        == (first.search("RNA sequencing", top_k=1)[0]["name"])
+    )
+
+
+def test_skills_without_content_map_without_loading_model(tmp_path, mock_skills):
+    """Test that an empty chunk matrix does not force a model load."""
+    skills = [Skill.from_dict({**s.to_dict(), "content": ""}) for s in mock_skills]
+    engines = []
+    for _ in range(2):
+        engine = SkillSearchEngine(
+            "all-MiniLM-L6-v2", vector_store=True, chunk_content=True
+        )
+        engine.vector_store = VectorStore("all-MiniLM-L6-v2", store_dir=tmp_path)
+        engine.index_skills(skills)
+        engines.append(engine)
+
+    first, second = engines
+    assert second.model is None
+    dimension = first.embeddings.shape[1]
+    assert second.get_snapshot().chunk_embeddings.shape == (0, dimension)
+
+
+def test_persist_after_incremental_loading(tmp_path, mock_skills):
+    """Test that persist swaps heap matrices for the shared mapped copy."""
+    engine = SkillSearchEngine(
+        "all-MiniLM-L6-v2", vector_store=True, chunk_content=True
+    )
+    engine.vector_store = VectorStore("all-MiniLM-L6-v2", store_dir=tmp_path)
+    engine.add_skills(mock_skills[:2])
+    engine.add_skills(mock_skills[2:])
+    before = engine.get_snapshot()
+
+    engine.persist()
+    after = engine.get_snapshot()
+
+    assert after.version == before.version + 1
+    assert isinstance(after.embeddings, np.memmap)
+    assert np.allclose(after.embeddings, before.embeddings)
+    assert isinstance(after.chunk_embeddings, np.memmap)
+
+    # A full re-index of the same skills maps the same files
+    engine.index_skills(mock_skills)
+    assert engine.embeddings.filename == after.embeddings.filename
+
+
+def test_persist_writes_without_blocking_writers(tmp_path, mock_skills, monkeypatch):
+    """Test that persist stores off-lock and maps skills added meanwhile."""
+    engine = SkillSearchEngine("all-MiniLM-L6-v2", vector_store=True)
+    engine.vector_store = VectorStore("all-MiniLM-L6-v2", store_dir=tmp_path)
+    engine.add_skills(mock_skills[:2])
+    save = engine.vector_store.save
+    saved = []
+
+    def add_while_saving(version, matrix, keep=()):
+        if not saved:
+            # Runs under the lock if persist still held it while writing
+            engine.add_skills(mock_skills[2:])
+        saved.append(len(matrix))
+        return save(version, matrix, keep)
+
+    monkeypatch.setattr(engine.vector_store, "save", add_while_saving)
+    engine.persist()
+
+    assert saved == [2, 3]
+    assert isinstance(engine.embeddings, np.memmap)
+    assert [s.name for s in engine.skills] == [s.name for s in mock_skills]
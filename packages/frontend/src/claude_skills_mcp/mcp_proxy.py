@@ -53,6 +53,24 @@ TOOL_SCHEMAS = [
                     "description": "Include a list of available documents (scripts, references, assets) for each skill (default: True)",
                     "default": True,
                 },
+                "source": {
+                    "type": "string",
+                    "enum": ["github", "local"],
+                    "description": "Only return skills loaded from GitHub or from the local filesystem",
+                },
+                "repo": {
+                    "type": "string",
+                    "description": "Only return skills from this GitHub repository (e.g., 'anthropics/skills')",
+                },
+                "has_documents": {
+                    "type": "boolean",
+                    "description": "Only return skills with (true) or without (false) additional documents (scripts, references, assets)",
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only return skills whose frontmatter tags include all of these tags",
+                },
             },
             "required": ["task_description"],
         },
@@ -92,6 +110,33 @@ TOOL_SCHEMAS = [
             "required": ["skill_name"],
         },
     ),
+    Tool(
+        name="related_skills",
+        title="Find skills related to a skill",
+        description=(
+            "Use after finding a relevant skill to discover adjacent skills (complementary tools, "
+            "alternative approaches, next steps). Answered from precomputed similarities, so it is much "
+            "cheaper than another find_helpful_skills call. Returns names, descriptions and sources; "
+            "use read_skill_document or find_helpful_skills for the full content."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "skill_name": {
+                    "type": "string",
+                    "description": "Name of the skill (as returned by find_helpful_skills)",
+                },
+                "k": {
+                    "type": "integer",
+                    "description": "Number of related skills to return (default: 5)",
+                    "default": 5,
+                    "minimum": 1,
+                    "maximum": 20,
+                },
+            },
+            "required": ["skill_name"],
+        },
+    ),
     Tool(
         name="list_skills",
         title="List available skills",